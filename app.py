@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
 import time
-from datetime import datetime, timedelta
 from src.data_manager import DataManager
 from src.ai_analyst import AIAnalyst
 from src.scheduler import get_scheduler
 from src.ai_debate_engine import AIDebateEngine
+from src.debate_jobs import get_debate_job_manager
+from src import market_calendar
+from src.source_polling import get_source_poller
+from src.source_health import get_source_health
 
 # Page Config
 st.set_page_config(
@@ -24,6 +27,13 @@ def init_scheduler():
 
 scheduler = init_scheduler()
 
+# Initialize Debate Job Manager (process-wide worker pool, shared by all sessions)
+@st.cache_resource
+def init_debate_jobs():
+    return get_debate_job_manager()
+
+debate_jobs = init_debate_jobs()
+
 # Initialize Managers
 # Removed cache to ensure secrets are re-read if added later
 def get_managers():
@@ -62,34 +72,101 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-import json
-import os
-import re
+from src.entry_store import get_debate_store, get_report_store
+from src.view_model import get_sector_trend, get_view_model
+from src import live_feed
 
-# Helper: Load Latest Debate (without API key requirement for viewing)
-def load_latest_debate():
-    try:
-        data_dir = os.path.join(os.path.dirname(__file__), 'data')
-        debates_file = os.path.join(data_dir, 'debates.json')
-        if os.path.exists(debates_file):
-            with open(debates_file, 'r', encoding='utf-8') as f:
-                debates = json.load(f)
-                if debates:
-                    return debates[0]
-    except Exception as e:
-        print(f"Error loading debate: {e}")
-    return None
-
-# Helper: Extract Chart Data (Standalone)
-def extract_chart_data_text(text):
-    try:
-        match = re.search(r'```json\s*([\s\S]*?)\s*```', text)
-        if match:
-            json_str = match.group(1)
-            return json.loads(json_str)
-    except:
-        pass
-    return []
+# 실시간 뉴스 패널에 보여줄 최대 기사 수 / 확인 간격 (초)
+LIVE_NEWS_LIMIT = 30
+LIVE_REFRESH_SEC = 10
+
+@st.fragment(run_every=LIVE_REFRESH_SEC)
+def live_news_panel():
+    """실시간 뉴스 (이 영역만 주기적으로 다시 실행되며, 세션 커서 이후의 새 이벤트만 읽음)"""
+    state = st.session_state.setdefault('live_feed', {"cursor": None, "items": [], "started": False, "new_report": None})
+    events, state['cursor'], reset = live_feed.read_since(state['cursor'])
+    if reset:
+        state['items'] = []
+    
+    for event in events:
+        if event['type'] == live_feed.NEWS:
+            known = {item['link'] for item in state['items']}
+            fresh = [item for item in event['payload'] if item['link'] not in known]
+            state['items'] = (fresh + state['items'])[:LIVE_NEWS_LIMIT]
+        elif event['type'] == live_feed.REPORT and state['started']:
+            # 페이지를 연 뒤 새로 저장된 분석만 알림
+            state['new_report'] = event['payload']
+            label = "AI 토론" if event['payload']['kind'] == "debate" else "AI 리포트"
+            st.toast(f"새 {label} 결과가 저장되었습니다.", icon="📊")
+    state['started'] = True
+    
+    if state['new_report']:
+        if st.button("📊 새 분석 결과 보기", key="live_new_report"):
+            state['new_report'] = None
+            st.rerun(scope="app")
+    
+    if not state['items']:
+        st.caption("새로 수집된 뉴스가 없습니다.")
+        return
+    for item in state['items'][:10]:
+        fetched = (item.get('fetched_at') or '')[11:16]
+        st.markdown(f"- `{fetched}` [{item['title']}]({item['link']}) · {item['source']}")
+
+# 섹터 추세 기간 선택지: (라벨, 일수)
+TREND_PERIODS = {"7일": 7, "30일": 30, "90일": 90}
+
+def sector_trend_panel():
+    """섹터 점수 추세 (리포트/토론 저장 시 쌓이는 섹터 시계열 기반)"""
+    summary = get_sector_trend()['summary']
+    if not summary:
+        st.info("아직 쌓인 섹터 기록이 없습니다. 리포트나 토론이 저장되면 추세가 표시됩니다.")
+        return
+    
+    col_sectors, col_period = st.columns([3, 1])
+    with col_sectors:
+        sectors = st.multiselect(
+            "섹터", [row['sector'] for row in summary],
+            default=[row['sector'] for row in summary[:5]], key="trend_sectors"
+        )
+    with col_period:
+        period = st.radio("기간", list(TREND_PERIODS), index=1, horizontal=True, key="trend_period")
+    
+    trend = get_sector_trend(TREND_PERIODS[period], sectors)
+    if trend['figure'] is not None:
+        st.plotly_chart(trend['figure'], use_container_width=True)
+    else:
+        st.caption("선택한 기간에 기록이 없습니다.")
+    
+    rows = [row for row in summary if not sectors or row['sector'] in sectors]
+    st.dataframe(pd.DataFrame([{
+        "섹터": row['sector'],
+        "최근": f"{row['latest']['sentiment']} {row['latest']['score']}" if row.get('latest') else "-",
+        "7일 평균": row['mean_short'],
+        "28일 평균": row['mean_long'],
+        "추세 (점/일, 14일)": row['slope'],
+        "변동성 (28일)": row['volatility'],
+        "관측 수": row['observations'],
+    } for row in rows]), hide_index=True, use_container_width=True)
+    st.caption("7일 평균 점수 추이 (1~10, 점선 위는 맑음). 추세는 최근 14일 일평균의 기울기입니다.")
+
+# 종목별 뉴스 최대 표시 개수
+TICKER_NEWS_LIMIT = 20
+
+def ticker_news_panel(ticker_news):
+    """종목별 뉴스 (수집 시 태깅된 종목 기준)"""
+    if not ticker_news:
+        st.info("종목이 태깅된 뉴스가 없습니다.")
+        return
+    
+    entry = st.selectbox(
+        "종목", ticker_news, key="ticker_news_select",
+        format_func=lambda e: f"{e['name']} ({e['code']}) · {len(e['news'])}건"
+    )
+    for item in entry['news'][:TICKER_NEWS_LIMIT]:
+        fetched = (item.get('fetched_at') or '')[5:16].replace('T', ' ')
+        st.markdown(f"- `{fetched}` [{item['title']}]({item['link']}) · {item['source']}")
+    if len(entry['news']) > TICKER_NEWS_LIMIT:
+        st.caption(f"최근 {TICKER_NEWS_LIMIT}건만 표시 (전체 {len(entry['news'])}건)")
 
 # Main Dashboard Function
 def main_dashboard():
@@ -103,28 +180,19 @@ def main_dashboard():
     st.title("📈 AI 주식 투자 가이드")
     st.caption(f"총 방문자 수: {stats.get('visitors', 0):,}명")
     
+    with st.expander("🔴 실시간 뉴스", expanded=False):
+        live_news_panel()
+    
     # 0. Manual Debate Execution (Admin) - Moved to Top
     with st.expander("🎬 AI 토론 실행 (관리자)", expanded=True):
         st.info("""
         **AI 토론 시스템**: 3개의 AI(🐂 Bull, 🐻 Bear, 📊 Analyst)가 오늘의 뉴스를 바탕으로 토론하고,
-        🎯 Moderator AI가 최종 종합 리포트를 생성합니다. (약 3분 소요)
+        🎯 Moderator AI가 최종 종합 리포트를 생성합니다. (약 1분 소요)
         """)
         
-        # 금일 뉴스 필터링
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        news_items_all = dm.load_news()
-        today_news = []
-        
-        if news_items_all:
-            for item in news_items_all:
-                try:
-                    fetched_at = item.get('fetched_at', '')
-                    if fetched_at:
-                        news_time = datetime.fromisoformat(fetched_at.replace('Z', '+00:00').split('+')[0])
-                        if news_time >= today_start:
-                            today_news.append(item)
-                except:
-                    continue
+        # 금일 뉴스 (데이터가 바뀔 때만 다시 계산, 모든 세션이 공유)
+        view_model = get_view_model()
+        today_news = view_model['today_news']
         
         st.write(f"📅 **금일 수집된 뉴스**: {len(today_news)}개")
 
@@ -146,6 +214,7 @@ def main_dashboard():
                     password = st.text_input("관리자 암호", type="password", label_visibility="collapsed", placeholder="관리자 암호 입력")
                 with col_btn:
                     submit = st.form_submit_button("🚀 토론 시작", use_container_width=True)
+                deep_dive = st.checkbox("🔍 섹터별 심층 토론 포함 (상위 3개 섹터)", value=False)
                 
                 if submit:
                     correct_password = ""
@@ -155,71 +224,24 @@ def main_dashboard():
                         correct_password = "admin"
                     
                     if password == correct_password:
-                        st.success("인증 성공! 토론을 시작합니다...")
-                        run_ai_debate(api_key_check, today_news)
+                        run_ai_debate(api_key_check, [dict(item) for item in today_news], sector_deep_dive_k=3 if deep_dive else 0)
                     else:
                         st.error("암호가 틀렸습니다.")
 
+        # 진행 중인 토론 작업 (모든 세션에서 조회 가능)
+        debate_job_panel()
+
     st.divider()
     
-    # Load Data
-    latest_debate = load_latest_debate()
-    chart_data = []
-    
-    if latest_debate:
-        chart_data = extract_chart_data_text(latest_debate.get('final_report', ''))
+    # Load Data (cached view model: debate, chart frame/figure, related news)
+    latest_debate = view_model['latest_debate']
+    chart_data = view_model['chart_data']
 
     # 1. Sector Chart (Based on Debate)
     st.header("📊 섹터별 기상도 (AI 토론 기반)")
     
     if chart_data:
-        import plotly.express as px
-        
-        # Prepare data for plotting
-        df = pd.DataFrame(chart_data)
-        
-        # Map sentiment to color
-        color_map = {"맑음": "#ff4b4b", "흐림": "#4b7bff"} # Red for Bullish, Blue for Bearish
-        
-        # Handle empty tickers for display
-        df['tickers_display'] = df['tickers'].apply(lambda x: ", ".join(x) if isinstance(x, list) else str(x))
-        df['size_display'] = df['score'] * 5 # Scale bubble size
-        
-        fig = px.scatter(
-            df, 
-            x="sector", 
-            y="score", 
-            size="size_display", 
-            color="sentiment",
-            color_discrete_map=color_map,
-            hover_name="sector",
-            hover_data={"reason": True, "tickers_display": True, "size_display": False, "score": False, "sector": False},
-            text="sector",
-            size_max=60,
-            height=450
-        )
-        
-        fig.update_traces(
-            textposition='top center',
-            hovertemplate="<b>%{hovertext}</b><br><br>상태: %{marker.color}<br>이유: %{customdata[0]}<br>관련주: %{customdata[1]}"
-        )
-        
-        fig.update_layout(
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            xaxis={'visible': False}, 
-            yaxis={'title': '영향력', 'visible': False}, 
-            plot_bgcolor='rgba(0,0,0,0)',
-            margin=dict(l=10, r=10, t=30, b=10)
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(view_model['figure'], use_container_width=True)
         st.caption(f"분석 기준: {latest_debate.get('timestamp', '')[:16].replace('T', ' ')}")
         
         # 2. AI Debate Result (Placed directly below Chart)
@@ -227,28 +249,17 @@ def main_dashboard():
         st.subheader("🤖 AI 토론 상세 결과")
         display_debate_result(latest_debate)
         
+        # 2-1. Sector Deep-Dive (optional)
+        if latest_debate.get('sector_debates'):
+            st.divider()
+            st.subheader("🔍 섹터별 심층 토론")
+            display_sector_debates(latest_debate['sector_debates'])
+        
         # 3. Related News (Filtered by Keywords)
         st.divider()
         st.subheader("📰 관련 뉴스 (섹터 이슈)")
         
-        # Extract keywords from chart data
-        keywords = set()
-        for item in chart_data:
-            keywords.add(item['sector'])
-            if 'tickers' in item:
-                keywords.update(item['tickers'])
-        
-        # Filter news
-        news_items = dm.load_news()
-        related_news = []
-        if news_items:
-            for n in news_items:
-                # Basic keyword matching
-                text = (n['title'] + " " + n.get('summary', '')).lower()
-                for k in keywords:
-                    if k.lower() in text:
-                        related_news.append(n)
-                        break
+        related_news = view_model['related_news']
         
         if related_news:
             # CSS for News Links
@@ -274,7 +285,7 @@ def main_dashboard():
             """, unsafe_allow_html=True)
             
             # Display titles only with link
-            for item in related_news[:20]:
+            for item in related_news:
                 st.markdown(f'''
                 <a href="{item['link']}" target="_blank" class="news-link">
                     📄 {item['title']} <span class="news-source">[{item['source']}]</span>
@@ -285,26 +296,71 @@ def main_dashboard():
             
     else:
         st.info("아직 생성된 AI 토론 결과가 없습니다. 상단에서 토론을 실행해주세요.")
+    
+    # 4. Sector Trend (history of all saved reports/debates)
+    st.divider()
+    st.subheader("📈 섹터 추세")
+    sector_trend_panel()
+    
+    # 5. News by Ticker (tagged at ingest, looked up from the inverted index)
+    st.divider()
+    st.subheader("🏷 종목별 뉴스")
+    ticker_news_panel(view_model['ticker_news'])
 
 # Admin Dashboard Function
 def admin_dashboard():
     st.title("🛠 관리자 대시보드")
     
     st.subheader("1. 시스템 상태")
-    col_status, col_lastrun, col_nextrun = st.columns(3)
+    shared = scheduler.shared_status()
+    col_role, col_leader, col_updated = st.columns(3)
     
-    with col_status:
-        st.metric("백그라운드 작업", scheduler.status)
-        
-    with col_lastrun:
-        last = scheduler.last_run.strftime('%H:%M:%S') if scheduler.last_run else "없음"
-        st.metric("최근 실행", last)
-        
-    with col_nextrun:
-        next_r = scheduler.next_run.strftime('%H:%M:%S') if scheduler.next_run else "대기 중"
-        st.metric("다음 실행 예정", next_r)
+    with col_role:
+        st.metric("이 프로세스", "리더" if scheduler.is_leader else "대기(팔로워)")
+    
+    with col_leader:
+        leader = shared['leader'].rsplit(':', 1)[0] if shared else "없음"
+        st.metric("현재 리더", leader if shared and shared['lease_alive'] else "없음 (인계 대기)")
+    
+    with col_updated:
+        st.metric("상태 갱신", shared['updated_at'][11:19] if shared else "-")
+    
+    state_labels = {"idle": "✅ 대기", "running": "⏳ 실행 중", "timeout": "⚠️ 시간 초과", "error": "❌ 오류"}
+    
+    def fmt_time(value):
+        return value[11:19] if value else "-"
+    
+    st.dataframe(pd.DataFrame([{
+        "작업": job['label'],
+        "상태": state_labels.get(job['state'], job['state']),
+        "최근 실행": fmt_time(job['last_run']),
+        "소요 시간": f"{job['last_duration']:.1f}초" if job['last_duration'] is not None else "-",
+        "다음 실행": fmt_time(job['next_run']),
+        "주기": job.get('cadence') or f"{job['interval'] // 60}분",
+        "결과": job['last_error'] or job['last_result'] or "-",
+        "실행/실패/중복": f"{job['runs']}/{job['failures']}/{job['overlaps']}",
+    } for job in (shared['jobs'] if shared else scheduler.job_states())]), use_container_width=True, hide_index=True)
 
-    st.info("뉴스 수집 및 AI 리포트 생성은 백그라운드에서 10분 주기로 자동 실행됩니다.")
+    trigger = shared.get('trigger') if shared else None
+    if trigger:
+        last_fired = trigger.get('last_fired')
+        last_text = f"최근 실행 사유: {last_fired['reason']} ({last_fired['items']}건)" if last_fired else "아직 실행 안 됨"
+        st.caption(f"📡 분석 트리거 — 대기 중인 새 기사 {trigger['pending']}건"
+                   f"{' · 조건 충족: ' + trigger['armed_reason'] if trigger.get('armed_reason') else ''} · {last_text}")
+    
+    with st.expander("📅 KRX 시장 달력 기반 적용 일정", expanded=False):
+        session = shared.get('session') if shared else scheduler.session_info()
+        st.write(f"**현재 세션**: {session['label']} ({session['until'][11:16]}까지) · "
+                 f"수집 주기 {session['crawl_interval'] // 60}분 · "
+                 f"분석 {market_calendar.ANALYSIS_LABELS[session['analysis']]}")
+        today = market_calendar.now_kst().date()
+        st.dataframe(pd.DataFrame(market_calendar.describe_schedule(today)), use_container_width=True, hide_index=True)
+        if not market_calendar.is_trading_day(today):
+            st.caption(f"다음 거래일: {market_calendar.next_trading_day(today).isoformat()}")
+    
+    st.info("뉴스 수집(거래 시간대에는 짧게, 야간·휴장일에는 드물게), 다이제스트 준비, 보관 정리, 지표 기록은 각각 독립된 주기로 실행되고, "
+            "AI 리포트 분석은 새 토픽·속보 폭주·중요 기사·최대 지연(30분) 조건을 만족할 때만 실행됩니다 (휴장일에는 속보 폭주·중요 기사만). "
+            "여러 서버 프로세스가 실행 중이면 리더 한 곳에서만 실행되고, 리더가 멈추면 다른 프로세스가 약 30초 안에 넘겨받습니다.")
     
     if st.button("새로고침 (상태 확인)"):
         st.rerun()
@@ -323,6 +379,40 @@ def admin_dashboard():
     RSS 피드 대신 직접 크롤링 방식을 사용하여 더 안정적으로 뉴스를 수집합니다.
     """)
     
+    # 소스별 적응형 수집 주기
+    base_interval = market_calendar.crawl_interval()
+    st.write(f"**소스별 수집 주기** (현재 세션 기본 주기 {base_interval // 60}분 기준, 최근 새 기사 수율로 자동 조정)")
+    poll_rows = get_source_poller().states(base_interval)
+    health = get_source_health().states([row['source_id'] for row in poll_rows])
+    circuit_labels = {"closed": "✅ 정상", "open": "🔴 차단", "half_open": "🟡 시험 수집"}
+    
+    def circuit_text(state):
+        text = circuit_labels.get(state['state'], state['state'])
+        if state['state'] == "open":
+            text += f" (재시도 {state['open_until'][11:16]})"
+        elif state.get('failures'):
+            text += f" (연속 실패 {state['failures']})"
+        return text
+    
+    st.dataframe(pd.DataFrame([{
+        "소스": row['label'],
+        "상태": circuit_text(health[row['source_id']]),
+        "최근 오류": health[row['source_id']].get('last_error') or "-",
+        "현재 주기": f"{row['interval'] // 60}분 {row['interval'] % 60}초" if row['interval'] % 60 else f"{row['interval'] // 60}분",
+        "평활 수율": f"{row['ema_rate'] * 60:.1f}건/시간" if row['ema_rate'] is not None else "-",
+        "최근 수집": row['last_polled'][11:19] if row['last_polled'] else "-",
+        "최근 새 기사": row['last_new'] if row['last_new'] is not None else "-",
+        "수집/폭주": f"{row['polls']}/{row['bursts']}" + (" ⚡" if row['burst'] else ""),
+    } for row in poll_rows]), use_container_width=True, hide_index=True)
+    
+    pipeline = shared.get('crawl_pipeline') if shared else None
+    if pipeline and pipeline['last']:
+        last = pipeline['last']
+        rate = f"{last['parse_items_per_sec']}건/초" if last['parse_items_per_sec'] is not None else "-"
+        st.caption(f"⚙️ 수집 파이프라인 — 요청 스레드 {pipeline['fetch_workers']}개 · 파싱 프로세스 {pipeline['parse_workers']}개 · "
+                   f"최근 파싱 {last['items']}건 ({rate}, 큐 대기 {last['blocked']}회) · "
+                   f"누적 {pipeline['totals']['items']}건 / {pipeline['totals']['runs']}회")
+    
     # 수집된 뉴스 통계
     news_items = dm.load_news()
     if news_items:
@@ -352,31 +442,94 @@ def admin_dashboard():
         for source, count in sorted(source_counts.items(), key=lambda x: x[1], reverse=True):
             st.write(f"- {source}: {count}개")
 
+    st.divider()
+    
+    st.subheader("3. 분석 기록")
+    history_page()
 
-def run_ai_debate(api_key, news_items):
-    """수동으로 AI 토론 실행"""
-    debate_engine = AIDebateEngine(api_key=api_key)
+
+HISTORY_PAGE_SIZE = 10
+
+def history_page():
+    """토론/리포트 기록 목록 (목록 파일만 페이지 단위로 읽고, 선택한 기록만 본문을 읽음)"""
+    kind = st.radio("기록 종류", ["토론", "리포트"], horizontal=True, key="history_kind")
+    store = get_debate_store() if kind == "토론" else get_report_store()
     
-    # 진행 상황 표시용 placeholder
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    total = store.count()
+    if total == 0:
+        st.info("저장된 기록이 없습니다.")
+        return
     
-    def progress_callback(message, progress):
-        status_text.write(message)
-        progress_bar.progress(progress)
+    pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+    page = st.number_input(f"페이지 (총 {total}건, 보관 한도 {store.retention}건)", min_value=1, max_value=pages, value=1)
+    rows = store.list(offset=(page - 1) * HISTORY_PAGE_SIZE, limit=HISTORY_PAGE_SIZE)
     
-    with st.spinner("🤖 AI들이 토론 중입니다... (약 2~3분 소요)"):
-        debate_result = debate_engine.run_debate(news_items, progress_callback)
+    def summarize(row):
+        sunny = [s['sector'] for s in row['sectors'] if s['sentiment'] == "맑음"]
+        cloudy = [s['sector'] for s in row['sectors'] if s['sentiment'] == "흐림"]
+        return f"☀️ {', '.join(sunny) or '-'} / ☔ {', '.join(cloudy) or '-'}"
     
-    # 결과 저장
-    if "error" not in debate_result:
-        debate_engine.save_debate_log(debate_result)
-        st.success("✅ 토론 완료! 결과가 저장되었습니다.")
-        
-        # 결과 표시
-        display_debate_result(debate_result)
+    st.dataframe(pd.DataFrame([{
+        "시각": row['timestamp'][:16].replace('T', ' '),
+        "유형": row.get('mode', ''),
+        "섹터 요약": summarize(row),
+        "뉴스 지문": row['news_fingerprint'],
+    } for row in rows]), use_container_width=True, hide_index=True)
+    
+    labels = {row['id']: f"{row['timestamp'][:16].replace('T', ' ')} ({row['id']})" for row in rows}
+    selected = st.selectbox("상세 보기", [None] + list(labels), format_func=lambda x: "선택 안 함" if x is None else labels[x])
+    if selected:
+        entry = store.get(selected)
+        if entry is None:
+            st.warning("기록을 찾을 수 없습니다. (보관 기간 만료)")
+        elif kind == "토론":
+            display_debate_result(entry)
+        else:
+            st.markdown(entry.get('content', ''))
+
+
+def run_ai_debate(api_key, news_items, sector_deep_dive_k=0):
+    """AI 토론을 백그라운드 작업으로 등록 (세션과 무관하게 실행됨)"""
+    job_id, attached = debate_jobs.submit(api_key, news_items, sector_deep_dive_k)
+    st.session_state.setdefault('watched_debate_jobs', set()).add(job_id)
+    if attached:
+        st.info("같은 뉴스로 진행 중이거나 방금 완료된 토론이 있어 해당 결과를 공유합니다.")
     else:
-        st.error(f"❌ 토론 실패: {debate_result['error']}")
+        st.success("인증 성공! 토론 작업이 등록되었습니다. 아래에서 진행 상황을 확인할 수 있습니다.")
+
+
+@st.fragment(run_every=2)
+def debate_job_panel():
+    """진행 중인 토론 작업의 진행률을 주기적으로 조회하여 표시"""
+    watched = st.session_state.setdefault('watched_debate_jobs', set())
+    active_jobs = debate_jobs.list_jobs(active_only=True)
+    
+    for job in active_jobs:
+        watched.add(job['job_id'])
+        submitted = job.get('submitted_at', '')[11:19]
+        st.write(f"🤖 **토론 진행 중** (등록 {submitted}, 뉴스 {job.get('news_count', 0)}개)")
+        st.progress(job.get('progress', 0.0), text=job.get('message', ''))
+    
+    # 지켜보던 작업이 끝나면 결과를 표시하고 대시보드를 새로 그림
+    active_ids = {job['job_id'] for job in active_jobs}
+    for job_id in list(watched - active_ids):
+        job = debate_jobs.get_job(job_id)
+        watched.discard(job_id)
+        if job is None:
+            continue
+        if job.get('status') == 'done':
+            st.session_state['debate_job_notice'] = ("success", "✅ 토론 완료! 결과가 저장되었습니다.")
+        else:
+            st.session_state['debate_job_notice'] = ("error", f"❌ 토론 실패: {job.get('error', '알 수 없는 오류')}")
+        st.rerun(scope="app")
+    
+    notice = st.session_state.pop('debate_job_notice', None)
+    if notice:
+        level, message = notice
+        if level == "success":
+            st.success(message)
+        else:
+            st.error(message)
 
 
 def show_latest_debate(api_key):
@@ -396,8 +549,18 @@ def display_debate_result(debate_result):
     
     # Round 1: 개별 분석
     if debate_result.get('rounds'):
-        round1 = debate_result['rounds'][0] if len(debate_result['rounds']) > 0 else None
-        round2 = debate_result['rounds'][1] if len(debate_result['rounds']) > 1 else None
+        rounds = {r.get('round'): r for r in debate_result['rounds']}
+        round1 = rounds.get(1)
+        round2 = rounds.get(2)
+        round3 = rounds.get(3)
+        convergence = debate_result.get('convergence')
+        
+        if convergence:
+            verdict_labels = {"converged": "🤝 의견 수렴", "mixed": "↔️ 일부 엇갈림", "divergent": "⚡ 의견 대립"}
+            caption = f"{verdict_labels.get(convergence['verdict'], convergence['verdict'])} (일치도 {convergence.get('agreement', 0):.0%})"
+            if convergence.get('contested'):
+                caption += f" · 쟁점 섹터: {', '.join(convergence['contested'])}"
+            st.caption(caption)
         
         with st.expander("🎬 Round 1: 개별 분석", expanded=False):
             if round1:
@@ -415,6 +578,9 @@ def display_debate_result(debate_result):
                     st.markdown("### 📊 Analyst AI")
                     st.markdown(round1['opinions'].get('analyst', '내용 없음'))
         
+        if round2 is None and convergence and convergence.get('verdict') == "converged":
+            st.info("Round 1 의견이 수렴하여 상호 반박 라운드를 생략하고 바로 종합했습니다.")
+        
         with st.expander("⚔️ Round 2: 상호 반박", expanded=False):
             if round2:
                 st.markdown("#### 🐂 Bull의 반박")
@@ -429,6 +595,16 @@ def display_debate_result(debate_result):
                 
                 st.markdown("#### 📊 Analyst의 검증")
                 st.markdown(round2['opinions'].get('analyst_verdict', '내용 없음'))
+        
+        if round3:
+            with st.expander("🔥 Round 3: 쟁점 재반박", expanded=False):
+                st.markdown("#### 🐂 Bull의 재반박")
+                st.markdown(round3['opinions'].get('bull_final', '내용 없음'))
+                
+                st.divider()
+                
+                st.markdown("#### 🐻 Bear의 재반박")
+                st.markdown(round3['opinions'].get('bear_final', '내용 없음'))
     
     # 최종 리포트
     if debate_result.get('final_report'):
@@ -436,6 +612,31 @@ def display_debate_result(debate_result):
         st.markdown("## 🎯 최종 토론 결과 리포트")
         st.markdown(debate_result['final_report'])
 
+def display_sector_debates(sector_debates):
+    """섹터별 심층 토론 결과 (드릴다운)"""
+    for entry in sector_debates:
+        icon = "☀️" if entry.get('sentiment') == "맑음" else "☔"
+        label = f"{icon} {entry['sector']} ({entry.get('score', '-')}/10, 관련 뉴스 {entry.get('news_count', 0)}건)"
+        with st.expander(label, expanded=False):
+            if entry.get('error'):
+                st.warning(f"일부 단계가 실패했습니다: {entry['error']}")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("#### 🐂 Bull")
+                st.markdown(entry.get('bull', '내용 없음'))
+            with col2:
+                st.markdown("#### 🐻 Bear")
+                st.markdown(entry.get('bear', '내용 없음'))
+            
+            st.markdown("#### 📊 Analyst 판정")
+            st.markdown(entry.get('verdict', '내용 없음'))
+            
+            if entry.get('news'):
+                st.markdown("#### 📰 관련 뉴스")
+                for item in entry['news']:
+                    st.markdown(f"- [{item['title']}]({item['link']}) `{item['source']}`")
+
 # Sidebar & Routing
 def sidebar():
     st.sidebar.title("메뉴")
@@ -0,0 +1,68 @@
+"""
+과거 뉴스 백필 명령
+
+네이버 금융 목록 페이지를 날짜 범위에 걸쳐 순회하여 과거 뉴스를 data/news.json에 채웁니다.
+진행 상황은 data/backfill_checkpoint.json에 기록되므로, 중단 후 같은 명령을 다시 실행하면 이어서 수집합니다.
+보관 개수는 앱(스케줄러)과 같은 .streamlit/secrets.toml의 NEWS_RETENTION(기본값 1000)을 따릅니다.
+이 값을 넘는 오래된 뉴스는 저장 시 잘리고, 이후 스케줄러의 수집에서도 같은 기준으로 잘리므로
+백필할 범위에 맞게 NEWS_RETENTION을 먼저 늘린 뒤 (앱도 다시 시작) 실행하세요.
+
+사용법:
+    python backfill_news.py --start 2026-09-01 [--end 2026-09-30] [--sources naver_market,naver_stock]
+                            [--concurrency 3] [--parse-workers 4] [--interval 0.5] [--reset]
+"""
+
+import argparse
+from datetime import date
+
+from src.data_manager import DataManager
+from src.news_backfill import (
+    DEFAULT_PARSE_WORKERS, MAX_CONCURRENCY, MAX_PAGES_PER_DAY, REQUEST_INTERVAL,
+    NewsBackfill, backfill_sources,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 금융 과거 뉴스 백필")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="끝 날짜 (기본값: 오늘)")
+    parser.add_argument("--sources", default=",".join(backfill_sources()),
+                        help=f"소스 ID 목록 (쉼표 구분, 기본값: {','.join(backfill_sources())})")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY, help="동시에 처리할 (소스, 날짜) 수")
+    parser.add_argument("--parse-workers", type=int, default=DEFAULT_PARSE_WORKERS,
+                        help="파싱 프로세스 수 (0이면 프로세스 풀 사용 안 함)")
+    parser.add_argument("--interval", type=float, default=REQUEST_INTERVAL, help="요청 사이 최소 간격 (초)")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES_PER_DAY, help="날짜당 최대 페이지 수")
+    parser.add_argument("--reset", action="store_true", help="진행 상황을 지우고 처음부터 실행")
+    args = parser.parse_args()
+
+    # 스케줄러와 같은 보관 개수를 써야 백필한 뉴스가 다음 수집에서 잘리지 않음
+    data_manager = DataManager()
+    print(f"보관 개수(NEWS_RETENTION): {data_manager.retention}건")
+
+    backfill = NewsBackfill(
+        args.start, args.end,
+        source_ids=[sid.strip() for sid in args.sources.split(",") if sid.strip()],
+        concurrency=args.concurrency,
+        parse_workers=args.parse_workers,
+        request_interval=args.interval,
+        max_pages=args.max_pages,
+        data_manager=data_manager,
+    )
+    if args.reset:
+        backfill.reset()
+
+    summary = backfill.run()
+    print(f"\n완료 {summary['completed']}/{summary['units']}개 (실패 {summary['failed']}개), "
+          f"{summary['pages']}페이지 / 기사 {summary['fetched']}건 중 새 뉴스 {summary['new']}건, "
+          f"{summary['elapsed_sec']}초 ({summary['pages_per_sec']} 페이지/초)")
+    if summary["failed"]:
+        print("실패한 작업은 같은 명령을 다시 실행하면 이어서 수집합니다.")
+    if len(data_manager.load_news()) >= data_manager.retention:
+        print(f"\n경고: 저장된 뉴스가 보관 개수({data_manager.retention}건)에 도달하여 오래된 뉴스가 잘렸을 수 있습니다. "
+              ".streamlit/secrets.toml의 NEWS_RETENTION을 늘리고 앱을 다시 시작한 뒤 --reset으로 다시 실행하세요.")
+
+
+# 파싱 프로세스 풀이 이 파일을 다시 import해도 백필이 반복 실행되지 않도록 함
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+페르소나 생성 방식 벤치마크
+
+AIAnalyst.analyze_news의 "separate"(전문가별 3회 + 종합 1회) 방식과
+"combined"(구조화 단일 호출 1회 + 종합 1회) 방식을 같은 뉴스로 실행하여
+지연 시간, 토큰 사용량, 호출 수(쿼터 사용량)를 비교합니다.
+매 실행 전에 클러스터 요약 캐시를 비우고 실행 순서를 번갈아 바꾸므로,
+두 방식 모두 뉴스 요약(Map 단계) 비용을 같은 조건으로 포함합니다.
+사용량은 실행마다 따로 집계됩니다. (AIAnalyst.analyze_news의 metrics)
+
+사용법:
+    python benchmark_persona_modes.py [반복 횟수]
+API 키는 환경 변수 GOOGLE_API_KEY 또는 .streamlit/secrets.toml에서 읽습니다.
+"""
+
+import json
+import os
+import sys
+
+import streamlit as st
+
+from src.ai_analyst import AIAnalyst, PERSONA_MODES
+from src.news_digest import clear_summary_cache
+
+
+def load_api_key():
+    if os.environ.get("GOOGLE_API_KEY"):
+        return os.environ["GOOGLE_API_KEY"]
+    # 앱과 같은 방식으로 .streamlit/secrets.toml을 읽음
+    try:
+        return st.secrets.get("GOOGLE_API_KEY")
+    except Exception:
+        return None
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    with open('data/news.json', 'r', encoding='utf-8') as f:
+        news = json.load(f)
+
+    ai = AIAnalyst(api_key=load_api_key())
+    print(f"Benchmarking {len(news)} news items, {runs} run(s) per mode...")
+
+    results = {mode: [] for mode in PERSONA_MODES}
+    for run in range(runs):
+        # 먼저 실행한 방식이 유리하지 않도록 순서를 번갈아 실행
+        modes = PERSONA_MODES if run % 2 == 0 else tuple(reversed(PERSONA_MODES))
+        for mode in modes:
+            clear_summary_cache()
+            report = ai.analyze_news(news, verbose=False, persona_mode=mode)
+            if "error" in report:
+                print(f"  - {mode}: {report['error']}")
+                continue
+            results[mode].append(report["metrics"])
+
+    print(f"\n{'mode':<10}{'latency(s)':>12}{'calls':>8}{'prompt tok':>12}{'output tok':>12}")
+    for mode, metrics in results.items():
+        if not metrics:
+            continue
+        avg = {key: sum(m[key] for m in metrics) / len(metrics)
+               for key in ("latency_sec", "calls", "prompt_tokens", "output_tokens")}
+        print(f"{mode:<10}{avg['latency_sec']:>12.1f}{avg['calls']:>8.1f}"
+              f"{avg['prompt_tokens']:>12.0f}{avg['output_tokens']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
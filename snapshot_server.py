@@ -0,0 +1,214 @@
+"""
+JSON 스냅샷 API 서버
+
+스케줄러가 미리 만들어 둔 data/snapshots/의 JSON을 그대로 전송하는 읽기 전용 HTTP 서버입니다.
+휴대폰 등 가벼운 클라이언트는 Streamlit 앱 대신 이 API로 최신 결과를 조회할 수 있습니다.
+- GET /api                  : 스냅샷 목록 (ETag, 갱신 시각, 크기)
+- GET /api/latest_debate    : 최신 토론 요약
+- GET /api/sectors          : 섹터 기상도
+- GET /api/today_news       : 금일 뉴스
+- GET /api/status           : 스케줄러 상태
+- GET /api/stream           : 새 뉴스/리포트 알림 실시간 스트림 (server-sent events)
+응답에는 강한 ETag가 붙고, If-None-Match가 일치하면 304를 반환합니다.
+Accept-Encoding에 gzip이 있으면 미리 압축해 둔 파일을 전송합니다.
+스트림의 이벤트 id는 피드 커서이므로, 재연결할 때 Last-Event-ID 헤더(또는 ?cursor=)로
+마지막 id를 보내면 그 이후 이벤트만 받습니다.
+
+사용법:
+    python snapshot_server.py [--host 127.0.0.1] [--port 8502]
+앱(streamlit run app.py)이 실행 중이어야 스냅샷이 갱신됩니다.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src import live_feed
+from src.snapshots import SNAPSHOT_NAMES, load_manifest, snapshot_paths
+
+
+# 파일 내용 캐시: 경로 -> ((수정 시각, 크기), 바이트, ETag)
+_file_cache = {}
+_cache_lock = threading.Lock()
+
+# 스트림: 피드 확인 간격 / 연결 유지용 주석 전송 간격 (초)
+STREAM_POLL_INTERVAL = 1
+STREAM_KEEPALIVE = 15
+
+
+def read_representation(path):
+    """
+    파일 바이트와 ETag (파일이 바뀌지 않았으면 메모리에서 반환, 없으면 None)
+
+    ETag는 실제로 전송하는 바이트의 해시이므로 원본과 압축본의 ETag가 서로 다릅니다.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _file_cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1], cached[2]
+    try:
+        with open(path, 'rb') as f:
+            body = f.read()
+    except OSError:
+        return None
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    with _cache_lock:
+        _file_cache[path] = (key, body, etag)
+    return body, etag
+
+
+def accepts_gzip(header):
+    """Accept-Encoding에 gzip이 허용되어 있는지 (q=0이면 거부로 봄)"""
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            q = params.strip().lower()
+            try:
+                return not (q.startswith("q=") and float(q[2:]) == 0)
+            except ValueError:
+                return True
+    return False
+
+
+def etag_matches(header, etag):
+    """If-None-Match 비교 (목록 또는 *)"""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+class SnapshotHandler(BaseHTTPRequestHandler):
+    server_version = "SnapshotAPI/1.0"
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/api/stream" and send_body:
+            self._stream()
+            return
+        if path in ("", "/api"):
+            body = json.dumps(load_manifest(), ensure_ascii=False, sort_keys=True).encode('utf-8')
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            self._respond(body, etag, None, send_body)
+            return
+
+        name = path[len("/api/"):] if path.startswith("/api/") else None
+        if name and name.endswith(".json"):
+            name = name[:-len(".json")]
+        if name not in SNAPSHOT_NAMES:
+            self._error(404, "not found", send_body)
+            return
+
+        json_path, gzip_path = snapshot_paths(name)
+        use_gzip = accepts_gzip(self.headers.get("Accept-Encoding"))
+        representation = read_representation(gzip_path) if use_gzip else None
+        if representation is None:
+            use_gzip = False
+            representation = read_representation(json_path)
+        if representation is None:
+            self._error(404, "snapshot not generated yet", send_body)
+            return
+
+        body, etag = representation
+        self._respond(body, etag, "gzip" if use_gzip else None, send_body)
+
+    def _respond(self, body, etag, encoding, send_body):
+        not_modified = etag_matches(self.headers.get("If-None-Match"), etag)
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Expose-Headers", "ETag")
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _stream(self):
+        """새 피드 이벤트를 server-sent events로 계속 전송합니다."""
+        query = parse_qs(urlparse(self.path).query)
+        cursor = self.headers.get("Last-Event-ID") or (query.get("cursor") or [None])[0]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        last_write = time.monotonic()
+        try:
+            while True:
+                events, cursor, reset = live_feed.read_since(cursor)
+                chunks = []
+                if reset:
+                    # 커서가 무효(파일 교체)여서 최근 이벤트부터 다시 보냄
+                    chunks.append("event: reset\ndata: {}\n\n")
+                for event in events:
+                    data = json.dumps({"at": event["at"], "payload": event["payload"]}, ensure_ascii=False)
+                    chunks.append(f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n")
+                if not chunks and time.monotonic() - last_write >= STREAM_KEEPALIVE:
+                    chunks.append(": keepalive\n\n")
+                if chunks:
+                    self.wfile.write("".join(chunks).encode('utf-8'))
+                    self.wfile.flush()
+                    last_write = time.monotonic()
+                time.sleep(STREAM_POLL_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트 연결 종료
+
+    def _error(self, code, message, send_body):
+        body = json.dumps({"error": message}).encode('utf-8')
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 304가 대부분이므로 요청마다 출력하지 않음
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 스냅샷 API 서버 (읽기 전용)")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8502, help="포트 (기본값: 8502)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), SnapshotHandler)
+    server.daemon_threads = True  # 열려 있는 스트림이 종료를 막지 않도록
+    print(f"Snapshot API: http://{args.host}:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
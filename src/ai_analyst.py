@@ -1,17 +1,79 @@
-import os
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from google import genai
 from google.genai import types
 import streamlit as st
 import time
+from src.sector_data import STRUCTURED_OUTPUT_GUIDE, report_generation_config, parse_structured_report
+from src.data_manager import news_fingerprint
+from src.entry_store import get_report_store
+from src.sector_history import get_sector_history
+from src.static_export import export_site
+from src import live_feed
+from src.llm_limiter import UsageMeter, get_llm_limiter
+from src.news_digest import DIRECT_LIMIT, build_news_digest, format_headlines
+
+
+class DummyStatus:
+    """Status placeholder used when running without a Streamlit session (verbose=False)"""
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc_val, exc_tb): pass
+    def write(self, text): print(text)
+    def update(self, label, state, expanded): pass
+
+
+def _status_context(label, verbose):
+    # Context manager for status updates depending on verbose mode
+    return st.status(label, expanded=True) if verbose else DummyStatus()
+
+
+# Persona definitions: (section key, role, analysis guidelines, status message)
+PERSONAS = [
+    ("macro", "거시경제 분석가", """
+            - 환율, 금리, 유가, 전쟁, 외교 분쟁 등 거시 경제 이슈에 집중하세요.
+            - 이러한 이슈가 한국 금융 시장 전반에 미칠 영향을 예측하세요.
+            - 단기적인 시장 분위기(Bull/Bear)를 진단하세요.
+            """, "🌍 거시경제 전문가가 시장 흐름을 읽고 있습니다..."),
+    ("sector", "산업/섹터 전문 애널리스트", """
+            - 뉴스에서 언급된 특정 산업(반도체, 2차전지, 자동차, 방산 등)을 식별하세요.
+            - 각 이슈에 따른 수혜 업종과 악재 업종을 명확히 구분하세요.
+            - 구체적인 종목명(Ticker)이 있다면 포함하세요.
+            """, "🏭 산업 분석가가 수혜/피해 업종을 선별 중입니다..."),
+    ("risk", "리스크 관리자", """
+            - 투자자가 간과하기 쉬운 위험 요소나 악재를 비판적으로 분석하세요.
+            - '묻지마 투자'를 경계할 수 있도록 구체적인 리스크 시나리오를 제시하세요.
+            - 현재 시장에서 '관망'이 필요한 섹터가 있다면 경고하세요.
+            """, "⚠️ 리스크 관리자가 위험 요소를 점검 중입니다..."),
+]
+
+PERSONA_MODES = ("separate", "combined")
+
+
+def persona_sections_config():
+    """Structured output config for the single-call (combined) persona mode"""
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=types.Schema(
+            type=types.Type.OBJECT,
+            properties={
+                key: types.Schema(type=types.Type.STRING, description=persona_role)
+                for key, persona_role, _, _ in PERSONAS
+            },
+            required=[key for key, _, _, _ in PERSONAS],
+        ),
+    )
+
 
 class AIAnalyst:
     def __init__(self, api_key):
         self.client = genai.Client(api_key=api_key)
         self.model = "gemini-2.0-flash" 
 
-    def _generate_persona_analysis(self, persona_role, persona_prompt, news_text, verbose=True):
+        # Delta (incremental) analysis policy
+        self.delta_max_items = 30  # more new items than this -> full rebuild
+        self.full_rebuild_interval = timedelta(hours=3)  # force a full rebuild periodically
+
+    def _generate_persona_analysis(self, persona_role, persona_prompt, news_text, verbose=True, usage=None):
         """Helper to generate analysis from a specific persona perspective with retry logic"""
         
         current_date_str = datetime.now().strftime('%Y-%m-%d')
@@ -31,15 +93,69 @@ class AIAnalyst:
         핵심 내용을 불렛 포인트로 간결하게 정리해주세요.
         """
         
+        try:
+            return self._generate(full_prompt, verbose=verbose, usage=usage)
+        except Exception as e:
+            return f"Error ({persona_role}): {str(e)}"
+
+    def _generate_combined_analysis(self, news_text, verbose=True, usage=None):
+        """All three persona sections from a single structured request"""
+        current_date_str = datetime.now().strftime('%Y-%m-%d')
+        sections = ""
+        for key, persona_role, persona_prompt, _ in PERSONAS:
+            sections += f"""
+        **"{key}" - {persona_role}:**
+        {persona_prompt}
+        """
+
+        full_prompt = f"""
+        현재 날짜는 **{current_date_str}**입니다.
+        당신은 거시경제 분석가, 산업/섹터 전문 애널리스트, 리스크 관리자로 구성된 분석팀입니다.
+        아래 뉴스 데이터를 바탕으로 세 전문가가 각자의 전문 분야에 집중하여 독립적인 분석 리포트를 작성해주세요.
+
+        **뉴스 데이터:**
+        {news_text}
+
+        **전문가별 분석 지침:**
+        {sections}
+
+        **출력:**
+        JSON 객체 하나로 응답하세요. "macro", "sector", "risk" 필드에 각 전문가의 리포트를
+        핵심 내용 위주의 불렛 포인트(Markdown)로 간결하게 작성하세요.
+        """
+
+        try:
+            response_text = self._generate(full_prompt, persona_sections_config(), verbose, usage)
+            payload = json.loads(response_text)
+            if not isinstance(payload, dict):
+                raise ValueError("structured response is not a JSON object")
+        except Exception as e:
+            return {key: f"Error ({persona_role}): {str(e)}" for key, persona_role, _, _ in PERSONAS}
+
+        return {
+            key: str(payload.get(key) or f"Error ({persona_role}): 응답에 해당 섹션이 없습니다.")
+            for key, persona_role, _, _ in PERSONAS
+        }
+
+    def _generate(self, prompt, config=None, verbose=False, usage=None):
+        """
+        Single model call under the shared LLM limiter, retrying on rate limits (raises on failure).
+        Each successful call is also recorded on `usage` (the caller's per-run UsageMeter) if given.
+        """
         max_retries = 3
         base_delay = 2 # seconds
         
         for attempt in range(max_retries):
             try:
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=full_prompt
-                )
+                with get_llm_limiter().slot():
+                    response = self.client.models.generate_content(
+                        model=self.model,
+                        contents=prompt,
+                        config=config
+                    )
+                get_llm_limiter().usage.record(response)
+                if usage is not None:
+                    usage.record(response)
                 return response.text
             except Exception as e:
                 error_msg = str(e)
@@ -52,61 +168,56 @@ class AIAnalyst:
                             print(f"⏳ 사용량이 많아 대기 중입니다... ({sleep_time}초)")
                         time.sleep(sleep_time)
                         continue
-                return f"Error ({persona_role}): {error_msg}"
-        return f"Error ({persona_role}): Rate limit exceeded after retries."
+                raise
+
+    def analyze_news(self, news_items, verbose=True, persona_mode="separate"):
+        """
+        Full analysis of the news window.
 
-    def analyze_news(self, news_items, verbose=True):
+        persona_mode:
+          - "separate": one call per persona (macro, sector, risk) + CIO synthesis
+          - "combined": a single structured call returning all three sections + CIO synthesis
+        """
         if not news_items:
-            return "분석할 뉴스가 없습니다."
-
-        # 1. Prepare Data
-        # Sort by latest first and take top 50
-        sorted_news = sorted(news_items, key=lambda x: x.get('fetched_at', ''), reverse=True)[:50]
-        news_text = ""
-        for i, item in enumerate(sorted_news):
-            news_text += f"{i+1}. [{item['source']}] {item['title']}\n"
-
-        # 2. Multi-Persona Analysis Phase
-        # Helper to handle status updates depending on verbose mode
-        class DummyStatus:
-            def __enter__(self): return self
-            def __exit__(self, exc_type, exc_val, exc_tb): pass
-            def write(self, text): 
-                if verbose: st.write(text)
-                else: print(text)
-            def update(self, label, state, expanded): pass
-
-        # Context manager for status
-        status_ctx = st.status("🕵️ AI 전문가들이 분석 중입니다...", expanded=True) if verbose else DummyStatus()
-
-        with status_ctx as status:
-            
-            # Persona A: Macro Economist
-            status.write("🌍 거시경제 전문가가 시장 흐름을 읽고 있습니다...")
-            macro_prompt = """
-            - 환율, 금리, 유가, 전쟁, 외교 분쟁 등 거시 경제 이슈에 집중하세요.
-            - 이러한 이슈가 한국 금융 시장 전반에 미칠 영향을 예측하세요.
-            - 단기적인 시장 분위기(Bull/Bear)를 진단하세요.
-            """
-            macro_analysis = self._generate_persona_analysis("거시경제 분석가", macro_prompt, news_text, verbose)
-            
-            # Persona B: Sector Specialist
-            status.write("🏭 산업 분석가가 수혜/피해 업종을 선별 중입니다...")
-            sector_prompt = """
-            - 뉴스에서 언급된 특정 산업(반도체, 2차전지, 자동차, 방산 등)을 식별하세요.
-            - 각 이슈에 따른 수혜 업종과 악재 업종을 명확히 구분하세요.
-            - 구체적인 종목명(Ticker)이 있다면 포함하세요.
-            """
-            sector_analysis = self._generate_persona_analysis("산업/섹터 전문 애널리스트", sector_prompt, news_text, verbose)
+            return {"error": "분석할 뉴스가 없습니다."}
+        if persona_mode not in PERSONA_MODES:
+            return {"error": f"Unknown persona_mode: {persona_mode}"}
 
-            # Persona C: Risk Manager
-            status.write("⚠️ 리스크 관리자가 위험 요소를 점검 중입니다...")
-            risk_prompt = """
-            - 투자자가 간과하기 쉬운 위험 요소나 악재를 비판적으로 분석하세요.
-            - '묻지마 투자'를 경계할 수 있도록 구체적인 리스크 시나리오를 제시하세요.
-            - 현재 시장에서 '관망'이 필요한 섹터가 있다면 경고하세요.
+        started = time.time()
+        # Metered per run so concurrent analyses on this instance do not mix their counts
+        usage = UsageMeter()
+
+        with _status_context("🕵️ AI 전문가들이 분석 중입니다...", verbose) as status:
+
+            # 1. Prepare Data
+            # Up to 50 items are listed as headlines; larger windows are clustered
+            # into topics and summarized in parallel (map-reduce) to a fixed-size digest.
+            if len(news_items) > DIRECT_LIMIT:
+                status.write(f"🗂️ 뉴스 {len(news_items)}건을 토픽별로 요약 중입니다...")
+            news_text, digest_stats = build_news_digest(
+                news_items, lambda prompt: self._generate(prompt, usage=usage)
+            )
+            digest_section = ""
+            if digest_stats["mode"] == "clustered":
+                digest_section = f"""
+            **[뉴스 토픽 요약: 총 {digest_stats['items']}건]**
+            {news_text}
             """
-            risk_analysis = self._generate_persona_analysis("리스크 관리자", risk_prompt, news_text, verbose)
+
+            # 2. Multi-Persona Analysis Phase
+            if persona_mode == "combined":
+                # One structured request returns all three sections (news sent once)
+                status.write("🧑‍💼 세 전문가(거시경제/섹터/리스크)가 함께 분석 중입니다...")
+                analyses = self._generate_combined_analysis(news_text, verbose, usage)
+            else:
+                # One request per persona
+                analyses = {}
+                for key, persona_role, persona_prompt, message in PERSONAS:
+                    status.write(message)
+                    analyses[key] = self._generate_persona_analysis(persona_role, persona_prompt, news_text, verbose, usage)
+            macro_analysis = analyses["macro"]
+            sector_analysis = analyses["sector"]
+            risk_analysis = analyses["risk"]
 
             # 3. Synthesis Phase
             status.write("📝 수석 전략가가 최종 리포트를 작성 중입니다...")
@@ -123,6 +234,7 @@ class AIAnalyst:
 
             **[전문가 보고서 3: 리스크 관리]**
             {risk_analysis}
+            {digest_section}
             ---
 
             **작성 요구사항:**
@@ -130,6 +242,36 @@ class AIAnalyst:
             2. 서로 상충되는 의견이 있다면, 더 보수적이고 안전한 관점을 채택하거나 양측의 근거를 비교하세요.
             3. 최종 출력은 아래 Markdown 형식을 엄격히 따르세요.
 
+            {self._report_format()}
+            {STRUCTURED_OUTPUT_GUIDE}
+            """
+
+            try:
+                response_text = self._generate(final_prompt, report_generation_config(), verbose, usage)
+                content, sectors = parse_structured_report(response_text)
+                if verbose:
+                    status.update(label="✅ 분석 완료!", state="complete", expanded=False)
+                now = datetime.now().isoformat()
+                return {
+                    "content": content,
+                    "sectors": sectors,
+                    "digest": digest_stats,
+                    "metrics": {
+                        "persona_mode": persona_mode,
+                        "latency_sec": round(time.time() - started, 2),
+                        **usage.snapshot()
+                    },
+                    "mode": "full",
+                    "last_full_at": now,
+                    "news_until": _latest_fetched_at(news_items),
+                    "news_fingerprint": news_fingerprint(news_items)
+                }
+            except Exception as e:
+                return {"error": f"Final Synthesis Error: {str(e)}"}
+
+    def _report_format(self):
+        """Markdown layout shared by full and delta reports"""
+        return f"""
             **최종 리포트 형식 (Markdown):**
             # 📈 AI 주식 투자 가이드 ({datetime.now().strftime('%Y-%m-%d')})
 
@@ -151,92 +293,133 @@ class AIAnalyst:
 
             ## 💡 수석 전략가의 투자 제언
             * (매수/매도/관망 등 구체적 포지션 제안)
+            """
+
+    def plan_analysis(self, news_items, previous_report):
+        """
+        Decide how to analyse the current news window.
+
+        Returns (mode, items):
+          - ("full", news_items) when there is no usable previous report, the delta is
+            too large, or the last full rebuild is older than full_rebuild_interval
+          - ("delta", new_items) with only the items that arrived since the previous report
+          - ("skip", []) when nothing new arrived
+        """
+        if not previous_report or not previous_report.get('content'):
+            return "full", news_items
+
+        since = previous_report.get('news_until') or previous_report.get('timestamp', '')
+        new_items = [item for item in news_items if item.get('fetched_at', '') > since]
+
+        try:
+            last_full = datetime.fromisoformat(
+                previous_report.get('last_full_at') or previous_report.get('timestamp', '')
+            )
+        except ValueError:
+            return "full", news_items
+
+        if datetime.now() - last_full >= self.full_rebuild_interval:
+            return "full", news_items
+        if len(new_items) > self.delta_max_items:
+            return "full", news_items
+        if not new_items:
+            return "skip", []
+        return "delta", new_items
+
+    def analyze_news_delta(self, new_items, previous_report, verbose=True):
+        """
+        Incremental analysis: update the previous report with only the news that
+        arrived since it was written. One call whose size scales with len(new_items).
+        """
+        if not new_items:
+            return {"error": "분석할 새 뉴스가 없습니다."}
+
+        sorted_news = sorted(new_items, key=lambda x: x.get('fetched_at', ''), reverse=True)
+        news_text = format_headlines(sorted_news)
+
+        previous_sectors = json.dumps(previous_report.get('sectors', []), ensure_ascii=False)
+        started = time.time()
+        usage = UsageMeter()
+
+        with _status_context("🔄 새 뉴스를 반영해 리포트를 갱신 중입니다...", verbose) as status:
+            status.write(f"📰 새 뉴스 {len(new_items)}건을 이전 리포트에 반영합니다...")
+            delta_prompt = f"""
+            당신은 투자 자문 회사의 **수석 투자 전략가(Chief Investment Officer)**입니다.
+            아래는 {previous_report.get('timestamp', '')[:16].replace('T', ' ')}에 작성된 기존 리포트와,
+            그 이후 새로 수집된 뉴스입니다. 새 뉴스를 반영하여 리포트를 **갱신**하세요.
 
             ---
-            **[중요: 시각화를 위한 JSON 데이터]**
-            **리포트의 맨 마지막**에 아래 형식의 JSON 데이터를 포함해주세요. 이 데이터는 차트 생성에 사용됩니다.
-            반드시 Markdown 코드 블록(\`\`\`json ... \`\`\`) 안에 작성하세요.
-            
-            ```json
-            [
-              {{
-                "sector": "반도체",
-                "sentiment": "맑음",  // "맑음" 또는 "흐림"
-                "score": 8,           // 맑음이면 6~10, 흐림이면 1~5 (영향력 크기)
-                "reason": "AI 수요 증가",
-                "tickers": ["삼성전자", "SK하이닉스"] // 뉴스에 언급된 실제 종목명
-              }},
-              {{
-                "sector": "2차전지",
-                "sentiment": "흐림",
-                "score": 3,
-                "reason": "전기차 수요 둔화",
-                "tickers": ["LG에너지솔루션", "에코프로"]
-              }}
-            ]
-            ```
+            **[기존 리포트]**
+            {previous_report['content']}
+
+            **[기존 섹터 데이터]**
+            {previous_sectors}
+
+            **[새로 수집된 뉴스]**
+            {news_text}
+            ---
+
+            **작성 요구사항:**
+            1. 새 뉴스가 기존 판단을 바꾸는 부분만 수정하고, 여전히 유효한 내용은 유지하세요.
+            2. 새 뉴스로 인해 등장하거나 사라진 섹터 이슈를 섹터별 기상도에 반영하세요.
+            3. 최종 출력은 아래 Markdown 형식을 엄격히 따르세요.
+
+            {self._report_format()}
+
+            {STRUCTURED_OUTPUT_GUIDE}
             """
 
             try:
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=final_prompt
-                )
-                final_report = response.text
+                response_text = self._generate(delta_prompt, report_generation_config(), verbose, usage=usage)
+                content, sectors = parse_structured_report(response_text)
                 if verbose:
-                    status.update(label="✅ 분석 완료!", state="complete", expanded=False)
-                return final_report
+                    status.update(label="✅ 리포트 갱신 완료!", state="complete", expanded=False)
+                return {
+                    "content": content,
+                    "sectors": sectors,
+                    "metrics": {
+                        "latency_sec": round(time.time() - started, 2),
+                        **usage.snapshot()
+                    },
+                    "mode": "delta",
+                    "delta_count": len(new_items),
+                    "last_full_at": previous_report.get('last_full_at') or previous_report.get('timestamp'),
+                    "news_until": max(_latest_fetched_at(new_items), previous_report.get('news_until', '')),
+                    "news_fingerprint": news_fingerprint(new_items)
+                }
             except Exception as e:
-                return f"Final Synthesis Error: {str(e)}"
+                return {"error": f"Delta Update Error: {str(e)}"}
 
-    def extract_chart_data(self, report_text):
-        """Extracts JSON block from the report text for visualization"""
-        import re
-        try:
-            match = re.search(r'```json\s*([\s\S]*?)\s*```', report_text)
-            if match:
-                json_str = match.group(1)
-                return json.loads(json_str)
-        except Exception:
-            pass
-        return []
-
-    def save_report(self, report_content):
-        # Save to reports.json with timestamp
-        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-        reports_file = os.path.join(data_dir, 'reports.json')
-        
+    def save_report(self, report):
+        # Save as a new entry in the report store (retention: REPORT_RETENTION)
         new_report = {
             "date": datetime.now().strftime('%Y-%m-%d'),
             "timestamp": datetime.now().isoformat(),
-            "content": report_content
+            "content": report["content"],
+            "sectors": report.get("sectors", [])
         }
+        for key in ("mode", "delta_count", "last_full_at", "news_until", "news_fingerprint", "metrics"):
+            if key in report:
+                new_report[key] = report[key]
 
         try:
-            if os.path.exists(reports_file):
-                with open(reports_file, 'r', encoding='utf-8') as f:
-                    reports = json.load(f)
-            else:
-                reports = []
-            
-            # Prepend new report
-            reports.insert(0, new_report)
-            # Keep last 30 reports
-            reports = reports[:30]
-
-            with open(reports_file, 'w', encoding='utf-8') as f:
-                json.dump(reports, f, indent=4, ensure_ascii=False)
-            return True
+            entry_id = get_report_store().save(new_report)
         except Exception as e:
             print(f"Error saving report: {e}")
             return False
+        # Append sector scores to the time series, re-render the static HTML bundle
+        # under data/site/ and notify live dashboards
+        get_sector_history().record("report", new_report, entry_id)
+        export_site()
+        live_feed.publish_report("report", new_report)
+        return True
 
     def get_latest_report(self):
-        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-        reports_file = os.path.join(data_dir, 'reports.json')
-        if os.path.exists(reports_file):
-            with open(reports_file, 'r', encoding='utf-8') as f:
-                reports = json.load(f)
-                if reports:
-                    return reports[0]
-        return None
+        return get_report_store().latest()
+
+    def list_reports(self, offset=0, limit=10):
+        # Report summaries (timestamp, news fingerprint, sectors) without loading the content
+        return get_report_store().list(offset, limit)
+
+def _latest_fetched_at(news_items):
+    return max((item.get('fetched_at', '') for item in news_items), default='')
@@ -5,11 +5,34 @@ AI 토론 엔진 모듈
 Moderator가 최종 종합하는 멀티 턴 토론 시스템
 """
 
-import json
-import os
 from datetime import datetime, timedelta
 from google import genai
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from src.sector_data import (
+    STRUCTURED_OUTPUT_GUIDE, report_generation_config, parse_structured_report, select_sector_news
+)
+from src.llm_limiter import get_llm_limiter
+from src.news_digest import build_news_digest, format_headlines
+from src.data_manager import news_fingerprint
+from src.debate_checkpoint import DebateCheckpoint, prune_checkpoints
+from src.debate_convergence import assess_convergence
+from src.entry_store import get_debate_store
+from src.sector_history import get_sector_history
+from src.static_export import export_site
+from src import live_feed
+
+
+ROUND1_KEYS = ("bull", "bear", "analyst")
+ROUND2_KEYS = ("bull_rebuttal", "bear_rebuttal", "analyst_verdict")
+ROUND3_KEYS = ("bull_final", "bear_final")
+
+CONVERGENCE_MESSAGES = {
+    "converged": "🤝 Round 1 의견이 수렴하여 반박 라운드를 생략합니다...",
+    "mixed": "⚔️ Round 2: AI들이 서로의 의견에 반박 중...",
+    "divergent": "🔥 의견이 크게 엇갈려 쟁점 섹터 재반박 라운드를 추가합니다...",
+}
 
 
 class AIDebateEngine:
@@ -66,16 +89,21 @@ class AIDebateEngine:
             }
         }
     
-    def _call_ai(self, prompt, max_retries=3):
-        """AI 호출 (재시도 로직 포함)"""
+    def _call_ai(self, prompt, max_retries=3, config=None):
+        """AI 호출 (재시도 로직 포함, 재시도 후에도 실패하면 예외 발생)"""
         base_delay = 2
         
         for attempt in range(max_retries):
             try:
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
-                )
+                with get_llm_limiter().slot():
+                    response = self.client.models.generate_content(
+                        model=self.model,
+                        contents=prompt,
+                        config=config
+                    )
+                get_llm_limiter().usage.record(response)
+                if not response.text:
+                    raise ValueError("빈 응답")
                 return response.text
             except Exception as e:
                 error_msg = str(e)
@@ -85,44 +113,364 @@ class AIDebateEngine:
                         print(f"⏳ API 한도 초과, {sleep_time}초 대기 중...")
                         time.sleep(sleep_time)
                         continue
-                return f"Error: {error_msg}"
-        return "Error: API 호출 실패"
+                raise
     
-    def run_debate(self, news_items, progress_callback=None):
+    def run_debate(self, news_items, progress_callback=None, debate_id=None, sector_deep_dive_k=0,
+                   adaptive_rounds=True):
         """
         토론 실행
         
+        토론 단계(LLM 호출)를 의존성 그래프로 정의하고, 선행 단계가 끝난 단계부터
+        공유 LLM 제한기 한도 안에서 최대한 병렬로 실행합니다.
+        (Round 1의 세 의견은 동시에, Round 2의 Bull/Bear 반박은 Round 1 직후 동시에)
+        
+        각 단계 결과와 뉴스 다이제스트는 토론 ID별 체크포인트에 즉시 저장되며, 실패한 토론을
+        다시 실행하면 완료된 단계는 재사용하고 누락/실패한 단계부터 이어서 실행합니다.
+        성공한 토론의 체크포인트는 삭제하므로 같은 뉴스 윈도우로 다시 실행하면 처음부터 토론합니다.
+        
         Args:
             news_items: 뉴스 항목 리스트
             progress_callback: 진행 상황 콜백 함수 (message, progress)
+            debate_id: 토론 ID (기본값: 뉴스 윈도우 지문)
+            sector_deep_dive_k: 0보다 크면 메인 토론 후 상위 K개 섹터의 심층 토론을 병렬 실행
+            adaptive_rounds: Round 1 의견이 수렴하면 반박 라운드를 생략하고,
+                             크게 엇갈리면 쟁점 섹터 재반박 라운드를 추가
             
         Returns:
-            토론 결과 딕셔너리
+            토론 결과 딕셔너리 (실패 시 error, debate_id, failed_steps 포함)
         """
         if not news_items:
             return {"error": "토론할 뉴스 데이터가 없습니다."}
         
+        debate_id = debate_id or news_fingerprint(news_items)
+        checkpoint = DebateCheckpoint(debate_id)
+        
         # 뉴스 텍스트 준비
-        news_text = self._prepare_news_text(news_items)
+        if progress_callback:
+            progress_callback("📰 뉴스 데이터를 준비 중...", 0.05)
+        news_text = checkpoint.news_text()
+        if news_text is None:
+            news_text = self._prepare_news_text(news_items)
+            checkpoint.save_news_text(news_text)
         current_date = datetime.now().strftime('%Y-%m-%d %H:%M')
         
         debate_log = {
+            "debate_id": debate_id,
             "timestamp": datetime.now().isoformat(),
             "news_count": len(news_items),
             "rounds": []
         }
         
-        # ========== Round 1: 개별 분석 ==========
+        steps = {step["id"]: step for step in self._debate_steps(news_text, current_date)}
+        main_end = 0.8 if sector_deep_dive_k else 0.95
+        
+        if adaptive_rounds:
+            # Round 1을 먼저 실행하고, 의견 수렴도에 따라 이후 라운드를 결정
+            round1_steps = [steps[key] for key in ROUND1_KEYS]
+            results, failed = self._execute_steps(
+                round1_steps, progress_callback, progress_range=(0.1, 0.4), checkpoint=checkpoint
+            )
+            if failed or len(results) < len(round1_steps):
+                return self._failure_result(debate_id, round1_steps, results, failed)
+            
+            convergence = assess_convergence({key: results[key] for key in ROUND1_KEYS})
+            later_steps = self._plan_later_rounds(steps, convergence)
+            planned = round1_steps + later_steps
+            debate_log["convergence"] = {
+                "verdict": convergence["verdict"],
+                "agreement": convergence["agreement"],
+                "main_sectors": convergence["main_sectors"],
+                "contested": convergence["contested"],
+                # 기본 토론(Round 1~2 + 종합) 대비 생략/추가된 LLM 호출 수
+                "calls_baseline": len(steps),
+                "calls_planned": len(planned),
+                "calls_saved": max(0, len(steps) - len(planned)),
+                "calls_added": max(0, len(planned) - len(steps))
+            }
+            if progress_callback:
+                progress_callback(CONVERGENCE_MESSAGES[convergence["verdict"]], 0.4)
+            
+            later_results, failed = self._execute_steps(
+                later_steps, progress_callback, progress_range=(0.4, main_end),
+                checkpoint=checkpoint, results=results
+            )
+            results.update(later_results)
+        else:
+            planned = list(steps.values())
+            results, failed = self._execute_steps(
+                planned, progress_callback, progress_range=(0.1, main_end), checkpoint=checkpoint
+            )
+        
+        if failed or len(results) < len(planned):
+            return self._failure_result(debate_id, planned, results, failed)
+        
+        debate_log["rounds"].append({"round": 1, "title": "개별 분석", "opinions": {
+            key: results[key] for key in ROUND1_KEYS
+        }})
+        if all(key in results for key in ROUND2_KEYS):
+            debate_log["rounds"].append({"round": 2, "title": "상호 반박", "opinions": {
+                key: results[key] for key in ROUND2_KEYS
+            }})
+        if all(key in results for key in ROUND3_KEYS):
+            debate_log["rounds"].append({"round": 3, "title": "쟁점 재반박", "opinions": {
+                key: results[key] for key in ROUND3_KEYS
+            }})
+        
+        final_report, sectors = parse_structured_report(results["moderator"])
+        debate_log["final_report"] = final_report
+        debate_log["sectors"] = sectors
+        
+        # ========== Sector Deep-Dive: 섹터별 심층 토론 (선택) ==========
+        if sector_deep_dive_k and sectors:
+            debate_log["sector_debates"] = self._run_sector_debates(
+                sectors, news_items, sector_deep_dive_k, progress_callback, checkpoint
+            )
+        checkpoint.discard()
+        prune_checkpoints()
+        
         if progress_callback:
-            progress_callback("🎬 Round 1: 각 AI가 개별 분석 중...", 0.1)
+            progress_callback("✅ 토론 완료!", 1.0)
+        
+        return debate_log
+    
+    def _failure_result(self, debate_id, planned, results, failed):
+        """실패한 단계와 그로 인해 실행되지 못한 단계를 담은 오류 결과"""
+        blocked = [step["id"] for step in planned if step["id"] not in results and step["id"] not in failed]
+        return {
+            "error": f"{len(failed)}개 단계 실패 ({', '.join(failed)}). 다시 실행하면 실패한 단계부터 이어서 진행합니다.",
+            "debate_id": debate_id,
+            "failed_steps": failed,
+            "blocked_steps": blocked
+        }
+    
+    def _plan_later_rounds(self, steps, convergence):
+        """
+        Round 1 이후 실행할 단계 결정
+        
+        - converged: 반박 라운드 생략, 바로 Moderator 종합
+        - mixed: 기본 Round 2 (상호 반박 + 검증)
+        - divergent: Round 2 + 쟁점 섹터에 대한 Round 3 재반박
+        """
+        later = []
+        if convergence["verdict"] != "converged":
+            later.extend(steps[key] for key in ROUND2_KEYS)
+        if convergence["verdict"] == "divergent":
+            later.extend(self._targeted_rebuttal_steps(convergence["contested"]))
+        
+        moderator = dict(steps["moderator"])
+        moderator["deps"] = list(ROUND1_KEYS) + [step["id"] for step in later]
+        return later + [moderator]
+    
+    def _targeted_rebuttal_steps(self, contested):
+        """Round 3: 의견이 엇갈린 섹터에 한정한 Bull/Bear 재반박"""
+        focus = ", ".join(contested) or "주요 섹터"
+        
+        def bull_final_prompt(r):
+            return f"""당신은 낙관적 투자 전문가입니다.
+의견이 크게 엇갈린 섹터({focus})에 대해 Analyst가 다음과 같이 검증했습니다:
+
+**Analyst의 검증:**
+{r['analyst_verdict']}
+
+**Bear의 반박:**
+{r['bear_rebuttal']}
+
+위 섹터에 한정하여, 인정할 부분과 끝까지 유지할 주장을 구분해 최종 입장을 밝혀주세요."""
+        
+        def bear_final_prompt(r):
+            return f"""당신은 보수적 투자 전문가입니다.
+의견이 크게 엇갈린 섹터({focus})에 대해 Analyst가 다음과 같이 검증했습니다:
+
+**Analyst의 검증:**
+{r['analyst_verdict']}
+
+**Bull의 반박:**
+{r['bull_rebuttal']}
+
+위 섹터에 한정하여, 인정할 부분과 끝까지 유지할 주장을 구분해 최종 입장을 밝혀주세요."""
+        
+        return [
+            {"id": "bull_final", "deps": ["analyst_verdict", "bear_rebuttal"], "build_prompt": bull_final_prompt,
+             "message": f"🐂 Bull AI가 쟁점 섹터({focus})에 재반박 중...", "done_message": "🐂 Bull의 재반박 완료"},
+            {"id": "bear_final", "deps": ["analyst_verdict", "bull_rebuttal"], "build_prompt": bear_final_prompt,
+             "message": f"🐻 Bear AI가 쟁점 섹터({focus})에 재반박 중...", "done_message": "🐻 Bear의 재반박 완료"},
+        ]
+    
+    def _execute_steps(self, steps, progress_callback=None, progress_range=(0.0, 1.0), checkpoint=None, results=None):
+        """
+        의존성 그래프 실행기
+        
+        Args:
+            steps: 단계 리스트 [{id, deps, message, done_message, build_prompt, config}, ...]
+                   build_prompt(results)는 선행 단계 결과로 프롬프트를 만듭니다.
+            progress_callback: 진행 상황 콜백 (호출한 스레드에서만 호출됨)
+            progress_range: 진행률 시작/끝 값
+            checkpoint: DebateCheckpoint (완료 단계 재사용 및 단계별 저장)
+            results: 이전 단계에서 이미 얻은 결과 (이번 그래프 밖의 선행 단계)
+            
+        Returns:
+            ({단계 id: 응답 텍스트}, {실패한 단계 id: 오류 메시지}) - 이번 steps에 대한 결과만
+            실패한 단계에 의존하는 단계는 실행되지 않고 두 결과 모두에서 빠집니다.
+        """
+        step_ids = [step["id"] for step in steps]
+        known = dict(results or {})
+        if checkpoint:
+            known.update({
+                step_id: output for step_id, output in checkpoint.completed_steps().items()
+                if step_id in step_ids
+            })
+        failed = {}
+        pending = {step["id"]: step for step in steps if step["id"] not in known}
+        running = {}
+        start, end = progress_range
+        
+        def completed():
+            return sum(1 for step_id in step_ids if step_id in known)
+        
+        def report(message):
+            if progress_callback:
+                progress_callback(message, start + (end - start) * completed() / len(steps))
+        
+        if completed():
+            report(f"♻️ 저장된 {completed()}개 단계를 재사용합니다 ({completed()}/{len(steps)})")
+        
+        with ThreadPoolExecutor(max_workers=get_llm_limiter().max_concurrent) as executor:
+            while pending or running:
+                # 선행 단계가 모두 끝난 단계를 제출
+                for step_id, step in list(pending.items()):
+                    if all(dep in known for dep in step["deps"]):
+                        del pending[step_id]
+                        report(step["message"])
+                        future = executor.submit(
+                            self._call_ai, step["build_prompt"](known), config=step.get("config")
+                        )
+                        running[future] = step
+                
+                # 남은 단계는 실패한 단계에 막혀 실행할 수 없음
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        known[step["id"]] = future.result()
+                    except Exception as e:
+                        failed[step["id"]] = str(e)
+                        if checkpoint:
+                            checkpoint.mark_failed(step["id"], str(e))
+                        report(f"❌ {step['done_message']} 실패: {e}")
+                        continue
+                    if checkpoint:
+                        checkpoint.mark_done(step["id"], known[step["id"]])
+                    report(f"{step['done_message']} ({completed()}/{len(steps)})")
+        
+        return {step_id: known[step_id] for step_id in step_ids if step_id in known}, failed
+    
+    def _run_sector_debates(self, sectors, news_items, k, progress_callback=None, checkpoint=None):
+        """
+        상위 K개 섹터에 대해 섹터 한정 Bull/Bear 공방과 Analyst 판정을 병렬 실행
+        
+        모든 섹터의 단계가 하나의 그래프로 실행되므로 전체 지연 시간은
+        섹터 토론 한 건(2회 순차 호출)과 비슷합니다.
         
-        round1 = {"round": 1, "title": "개별 분석", "opinions": {}}
+        Returns:
+            섹터별 결과 리스트 [{sector, sentiment, score, news_count, news, bull, bear, verdict}, ...]
+            실패한 섹터는 error 필드로 표시됩니다.
+        """
+        # 영향력(중립 5.5에서 먼 정도)이 큰 섹터 우선
+        top_sectors = sorted(sectors, key=lambda x: abs(x["score"] - 5.5), reverse=True)[:k]
+        
+        steps = []
+        sector_news = {}
+        for record in top_sectors:
+            related = select_sector_news(news_items, record)
+            sector_news[record["sector"]] = related
+            steps.extend(self._sector_steps(record, format_headlines(related)))
         
-        # Bull AI 분석
         if progress_callback:
-            progress_callback("🐂 Bull AI가 기회 요인을 분석 중...", 0.15)
+            progress_callback(f"🔍 상위 {len(top_sectors)}개 섹터 심층 토론 중...", 0.8)
+        results, failed = self._execute_steps(
+            steps, progress_callback, progress_range=(0.8, 0.95), checkpoint=checkpoint
+        )
+        
+        sector_debates = []
+        for record in top_sectors:
+            prefix = f"sector:{record['sector']}"
+            entry = {
+                "sector": record["sector"],
+                "sentiment": record["sentiment"],
+                "score": record["score"],
+                "news_count": len(sector_news[record["sector"]]),
+                "news": [
+                    {"title": item.get("title", ""), "link": item.get("link", ""), "source": item.get("source", "")}
+                    for item in sector_news[record["sector"]]
+                ],
+            }
+            missing = [role for role in ("bull", "bear", "verdict") if f"{prefix}:{role}" not in results]
+            if missing:
+                errors = [failed[f"{prefix}:{role}"] for role in missing if f"{prefix}:{role}" in failed]
+                entry["error"] = "; ".join(errors) or "선행 단계 실패"
+            for role in ("bull", "bear", "verdict"):
+                if f"{prefix}:{role}" in results:
+                    entry[role] = results[f"{prefix}:{role}"]
+            sector_debates.append(entry)
+        return sector_debates
+    
+    def _sector_steps(self, record, news_text):
+        """섹터 한정 심층 토론 단계 (Bull/Bear 동시 실행 후 Analyst 판정)"""
+        sector = record["sector"]
+        prefix = f"sector:{sector}"
+        context = f"""**메인 토론 결론:** {sector} - {record['sentiment']} ({record['score']}/10), {record.get('reason', '')}
+관련 종목: {', '.join(record.get('tickers', [])) or '없음'}
+
+**{sector} 관련 뉴스:**
+{news_text or '(관련 뉴스 없음)'}"""
+        
+        def bull_prompt(r):
+            return f"""{self.personas['bull']['system_prompt']}
+
+'{sector}' 섹터에 한정하여 토론합니다.
+{context}
+
+이 섹터의 상승 논거를 3~5개의 불렛 포인트로 간결하게 제시하세요."""
+        
+        def bear_prompt(r):
+            return f"""{self.personas['bear']['system_prompt']}
+
+'{sector}' 섹터에 한정하여 토론합니다.
+{context}
+
+이 섹터의 하락 위험 요인을 3~5개의 불렛 포인트로 간결하게 제시하세요."""
         
-        bull_prompt = f"""현재 시간: {current_date}
+        def verdict_prompt(r):
+            return f"""{self.personas['analyst']['system_prompt']}
+
+'{sector}' 섹터에 대한 Bull과 Bear의 의견입니다.
+
+**Bull AI:**
+{r[f'{prefix}:bull']}
+
+**Bear AI:**
+{r[f'{prefix}:bear']}
+
+단기 전망(맑음/흐림), 더 설득력 있는 쪽과 그 근거, 앞으로 확인할 지표를 5줄 이내로 정리하세요."""
+        
+        return [
+            {"id": f"{prefix}:bull", "deps": [], "build_prompt": bull_prompt,
+             "message": f"🐂 [{sector}] 상승 논거 분석 중...", "done_message": f"🐂 [{sector}] Bull 완료"},
+            {"id": f"{prefix}:bear", "deps": [], "build_prompt": bear_prompt,
+             "message": f"🐻 [{sector}] 위험 요인 분석 중...", "done_message": f"🐻 [{sector}] Bear 완료"},
+            {"id": f"{prefix}:verdict", "deps": [f"{prefix}:bull", f"{prefix}:bear"], "build_prompt": verdict_prompt,
+             "message": f"📊 [{sector}] 판정 중...", "done_message": f"📊 [{sector}] 판정 완료"},
+        ]
+    
+    def _debate_steps(self, news_text, current_date):
+        """토론 단계 정의 (의존성 그래프)"""
+        
+        # ========== Round 1: 개별 분석 ==========
+        def bull_prompt(r):
+            return f"""현재 시간: {current_date}
 {self.personas['bull']['system_prompt']}
 
 **오늘의 뉴스 데이터:**
@@ -130,14 +478,8 @@ class AIDebateEngine:
 
 위 뉴스를 바탕으로 투자 기회를 분석해주세요."""
         
-        round1["opinions"]["bull"] = self._call_ai(bull_prompt)
-        time.sleep(1)  # API 호출 간격
-        
-        # Bear AI 분석
-        if progress_callback:
-            progress_callback("🐻 Bear AI가 리스크를 분석 중...", 0.25)
-        
-        bear_prompt = f"""현재 시간: {current_date}
+        def bear_prompt(r):
+            return f"""현재 시간: {current_date}
 {self.personas['bear']['system_prompt']}
 
 **오늘의 뉴스 데이터:**
@@ -145,14 +487,8 @@ class AIDebateEngine:
 
 위 뉴스를 바탕으로 리스크와 주의사항을 분석해주세요."""
         
-        round1["opinions"]["bear"] = self._call_ai(bear_prompt)
-        time.sleep(1)
-        
-        # Analyst AI 분석
-        if progress_callback:
-            progress_callback("📊 Analyst AI가 중립 분석 중...", 0.35)
-        
-        analyst_prompt = f"""현재 시간: {current_date}
+        def analyst_prompt(r):
+            return f"""현재 시간: {current_date}
 {self.personas['analyst']['system_prompt']}
 
 **오늘의 뉴스 데이터:**
@@ -160,81 +496,74 @@ class AIDebateEngine:
 
 위 뉴스를 바탕으로 객관적인 시장 분석을 해주세요."""
         
-        round1["opinions"]["analyst"] = self._call_ai(analyst_prompt)
-        
-        debate_log["rounds"].append(round1)
-        
         # ========== Round 2: 상호 반박 ==========
-        if progress_callback:
-            progress_callback("⚔️ Round 2: AI들이 서로의 의견에 반박 중...", 0.45)
-        
-        round2 = {"round": 2, "title": "상호 반박", "opinions": {}}
-        time.sleep(1)
-        
-        # Bull이 Bear 의견에 반박
-        if progress_callback:
-            progress_callback("🐂 Bull AI가 Bear의 의견에 반론 중...", 0.5)
-        
-        bull_rebuttal_prompt = f"""당신은 낙관적 투자 전문가입니다.
+        def bull_rebuttal_prompt(r):
+            return f"""당신은 낙관적 투자 전문가입니다.
 Bear AI가 다음과 같은 리스크를 제시했습니다:
 
 **Bear AI 의견:**
-{round1['opinions']['bear']}
+{r['bear']}
 
 이 의견의 과장되거나 잘못된 부분을 지적하고, 왜 시장이 여전히 기회가 있는지 반박해주세요.
 단, 근거 없는 반박은 금지. 논리적으로 설명하세요."""
         
-        round2["opinions"]["bull_rebuttal"] = self._call_ai(bull_rebuttal_prompt)
-        time.sleep(1)
-        
-        # Bear가 Bull 의견에 반박
-        if progress_callback:
-            progress_callback("🐻 Bear AI가 Bull의 의견에 반론 중...", 0.6)
-        
-        bear_rebuttal_prompt = f"""당신은 보수적 투자 전문가입니다.
+        def bear_rebuttal_prompt(r):
+            return f"""당신은 보수적 투자 전문가입니다.
 Bull AI가 다음과 같은 기회를 제시했습니다:
 
 **Bull AI 의견:**
-{round1['opinions']['bull']}
+{r['bull']}
 
 이 의견의 낙관적인 부분의 위험성을 지적하고, 왜 주의가 필요한지 반박해주세요.
 단, 근거 없는 비관은 금지. 논리적으로 설명하세요."""
         
-        round2["opinions"]["bear_rebuttal"] = self._call_ai(bear_rebuttal_prompt)
-        time.sleep(1)
-        
-        # Analyst가 양측 검증
-        if progress_callback:
-            progress_callback("📊 Analyst AI가 양측 의견을 검증 중...", 0.7)
-        
-        analyst_verify_prompt = f"""당신은 중립적 시장 분석가입니다.
+        def analyst_verify_prompt(r):
+            return f"""당신은 중립적 시장 분석가입니다.
 Bull과 Bear의 논쟁을 검토해주세요.
 
 **Bull AI 원래 의견:**
-{round1['opinions']['bull']}
+{r['bull']}
 
 **Bear AI 원래 의견:**
-{round1['opinions']['bear']}
+{r['bear']}
 
 **Bull의 반박:**
-{round2['opinions']['bull_rebuttal']}
+{r['bull_rebuttal']}
 
 **Bear의 반박:**
-{round2['opinions']['bear_rebuttal']}
+{r['bear_rebuttal']}
 
 객관적으로 누구의 주장이 더 설득력 있는지, 양측이 합의할 수 있는 부분은 무엇인지 분석해주세요."""
         
-        round2["opinions"]["analyst_verdict"] = self._call_ai(analyst_verify_prompt)
-        
-        debate_log["rounds"].append(round2)
-        
         # ========== Final: Moderator 종합 ==========
-        if progress_callback:
-            progress_callback("🎯 Moderator AI가 최종 리포트 작성 중...", 0.85)
-        
-        time.sleep(1)
+        def later_rounds_text(r):
+            if 'bull_rebuttal' not in r:
+                return "(Round 1에서 주요 섹터에 대한 의견이 수렴하여 반박 라운드는 생략되었습니다.)\n"
+            text = f"""**[Round 2: 상호 반박]**
+
+🐂 Bull의 반박:
+{r['bull_rebuttal']}
+
+🐻 Bear의 반박:
+{r['bear_rebuttal']}
+
+📊 Analyst의 검증:
+{r['analyst_verdict']}
+"""
+            if 'bull_final' in r:
+                text += f"""
+**[Round 3: 쟁점 재반박]**
+
+🐂 Bull의 최종 입장:
+{r['bull_final']}
+
+🐻 Bear의 최종 입장:
+{r['bear_final']}
+"""
+            return text
         
-        final_prompt = f"""당신은 투자 자문사의 **수석 투자 전략가(CIO)**입니다.
+        def final_prompt(r):
+            return f"""당신은 투자 자문사의 **수석 투자 전략가(CIO)**입니다.
 오늘 진행된 AI 토론 내용을 종합하여 최종 투자 가이드를 작성하세요.
 
 === 토론 기록 ===
@@ -242,25 +571,15 @@ Bull과 Bear의 논쟁을 검토해주세요.
 **[Round 1: 개별 분석]**
 
 🐂 Bull AI:
-{round1['opinions']['bull']}
+{r['bull']}
 
 🐻 Bear AI:
-{round1['opinions']['bear']}
+{r['bear']}
 
 📊 Analyst AI:
-{round1['opinions']['analyst']}
-
-**[Round 2: 상호 반박]**
-
-🐂 Bull의 반박:
-{round2['opinions']['bull_rebuttal']}
-
-🐻 Bear의 반박:
-{round2['opinions']['bear_rebuttal']}
-
-📊 Analyst의 검증:
-{round2['opinions']['analyst_verdict']}
+{r['analyst']}
 
+{later_rounds_text(r)}
 === 작성 요구사항 ===
 1. 토론 내용을 논리적으로 통합하세요
 2. 합의된 사항과 논쟁 사항을 구분하세요
@@ -289,70 +608,56 @@ Bull과 Bear의 논쟁을 검토해주세요.
 ## 🎯 최종 투자 제언
 * (구체적인 매수/매도/관망 제안)
 * **신뢰도 점수: X/10** (근거 설명)
-
----
-**[시각화용 JSON 데이터]**
-```json
-[
-  {{"sector": "반도체", "sentiment": "맑음", "score": 8, "reason": "이유", "tickers": ["삼성전자"]}},
-  {{"sector": "2차전지", "sentiment": "흐림", "score": 4, "reason": "이유", "tickers": ["LG에너지솔루션"]}}
-]
-```
-"""
-
-        final_report = self._call_ai(final_prompt)
-        debate_log["final_report"] = final_report
-        
-        if progress_callback:
-            progress_callback("✅ 토론 완료!", 1.0)
-        
-        return debate_log
+{STRUCTURED_OUTPUT_GUIDE}"""
+        
+        return [
+            {"id": "bull", "deps": [], "build_prompt": bull_prompt,
+             "message": "🐂 Bull AI가 기회 요인을 분석 중...", "done_message": "🐂 Bull AI 분석 완료"},
+            {"id": "bear", "deps": [], "build_prompt": bear_prompt,
+             "message": "🐻 Bear AI가 리스크를 분석 중...", "done_message": "🐻 Bear AI 분석 완료"},
+            {"id": "analyst", "deps": [], "build_prompt": analyst_prompt,
+             "message": "📊 Analyst AI가 중립 분석 중...", "done_message": "📊 Analyst AI 분석 완료"},
+            {"id": "bull_rebuttal", "deps": ["bear"], "build_prompt": bull_rebuttal_prompt,
+             "message": "🐂 Bull AI가 Bear의 의견에 반론 중...", "done_message": "🐂 Bull의 반박 완료"},
+            {"id": "bear_rebuttal", "deps": ["bull"], "build_prompt": bear_rebuttal_prompt,
+             "message": "🐻 Bear AI가 Bull의 의견에 반론 중...", "done_message": "🐻 Bear의 반박 완료"},
+            {"id": "analyst_verdict", "deps": ["bull", "bear", "bull_rebuttal", "bear_rebuttal"],
+             "build_prompt": analyst_verify_prompt,
+             "message": "📊 Analyst AI가 양측 의견을 검증 중...", "done_message": "📊 Analyst의 검증 완료"},
+            {"id": "moderator", "deps": ["bull", "bear", "analyst", "bull_rebuttal", "bear_rebuttal", "analyst_verdict"],
+             "build_prompt": final_prompt, "config": report_generation_config(),
+             "message": "🎯 Moderator AI가 최종 리포트 작성 중...", "done_message": "🎯 최종 리포트 작성 완료"},
+        ]
     
     def _prepare_news_text(self, news_items):
-        """뉴스 항목을 텍스트로 변환"""
-        sorted_news = sorted(news_items, key=lambda x: x.get('fetched_at', ''), reverse=True)[:50]
-        
-        text = ""
-        for i, item in enumerate(sorted_news, 1):
-            text += f"{i}. [{item.get('source', '출처없음')}] {item.get('title', '제목없음')}\n"
+        """
+        뉴스 항목을 텍스트로 변환
         
+        50건 이하는 헤드라인 목록, 그 이상은 토픽 클러스터 요약(map-reduce) 다이제스트
+        """
+        text, _ = build_news_digest(news_items, self._call_ai)
         return text
     
     def save_debate_log(self, debate_log):
-        """토론 기록 저장"""
-        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-        debates_file = os.path.join(data_dir, 'debates.json')
-        
+        """토론 기록 저장 (보관 개수: DEBATE_RETENTION)"""
         try:
-            if os.path.exists(debates_file):
-                with open(debates_file, 'r', encoding='utf-8') as f:
-                    debates = json.load(f)
-            else:
-                debates = []
-            
-            debates.insert(0, debate_log)
-            debates = debates[:10]  # 최근 10개만 유지
-            
-            with open(debates_file, 'w', encoding='utf-8') as f:
-                json.dump(debates, f, indent=4, ensure_ascii=False)
-            
-            return True
+            entry_id = get_debate_store().save(debate_log)
         except Exception as e:
             print(f"Error saving debate log: {e}")
             return False
+        # 섹터 점수 시계열 기록, 정적 HTML 페이지(data/site/) 갱신 및 연결된 대시보드에 알림
+        get_sector_history().record("debate", debate_log, entry_id)
+        export_site()
+        live_feed.publish_report("debate", debate_log)
+        return True
     
     def get_latest_debate(self):
         """최근 토론 기록 가져오기"""
-        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-        debates_file = os.path.join(data_dir, 'debates.json')
-        
-        if os.path.exists(debates_file):
-            with open(debates_file, 'r', encoding='utf-8') as f:
-                debates = json.load(f)
-                if debates:
-                    return debates[0]
-        return None
-
+        return get_debate_store().latest()
+    
+    def list_debates(self, offset=0, limit=10):
+        """토론 기록 요약 목록 (본문 없이 시각/뉴스 지문/섹터 요약만)"""
+        return get_debate_store().list(offset, limit)
 
 # 테스트용 코드
 if __name__ == "__main__":
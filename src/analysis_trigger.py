@@ -0,0 +1,196 @@
+"""
+분석 트리거 모듈
+
+고정 주기로 재분석하는 대신, 뉴스 수집 이벤트(news_events.NEW_ITEMS)를 모아
+다음 조건 중 하나를 만족할 때만 분석을 실행합니다.
+- 새 토픽 클러스터가 NEW_CLUSTER_THRESHOLD개 이상
+- 최근 BURST_WINDOW초 동안 BURST_COUNT건 이상 (속보 폭주)
+  수집 한 번에 들어온 기사는 직전 수집 이후의 폴링 간격에 고르게 도착한 것으로 보고 셉니다.
+  (휴장일처럼 30분마다 수집하면 한 번에 15건이 와도 5분간은 약 2.5건)
+- 공시/속보 등 중요 출처 기사 도착
+- 대기 중인 기사가 MAX_STALENESS초 이상 분석되지 않음 (최대 지연 한도)
+
+조건을 만족해도 DEBOUNCE초 동안 새 기사가 없을 때까지 기다려 한 번에 분석하며,
+MAX_DEBOUNCE초가 지나면 기사가 계속 들어와도 분석합니다.
+새 기사가 없으면 분석하지 않으므로 조용한 시간에는 LLM 비용이 들지 않습니다.
+"""
+
+import queue
+import threading
+import time
+
+from src.news_clustering import cluster_news
+from src.news_events import NEW_ITEMS, get_event_bus
+
+
+# 트리거 조건
+NEW_CLUSTER_THRESHOLD = 3
+BURST_WINDOW = 300
+BURST_COUNT = 15
+HIGH_WEIGHT_CATEGORIES = ("공시",)
+BREAKING_MARKERS = ("속보", "[단독]", "긴급")
+MAX_STALENESS = 1800
+
+# 조건 충족 후 마지막 기사 이후 대기 시간 / 최대 대기 시간 (초)
+DEBOUNCE = 60
+MAX_DEBOUNCE = 300
+
+
+class AnalysisTrigger:
+    """새 기사 이벤트를 모아 분석 실행 여부를 판단합니다."""
+
+    def __init__(self, bus=None, interval_fn=None):
+        """
+        Args:
+            bus: 이벤트 버스 (기본값: 프로세스 전역 버스)
+            interval_fn: 현재 수집 주기(초)를 돌려주는 함수 (없으면 직전 이벤트 이후 간격만 사용)
+        """
+        self._queue = (bus or get_event_bus()).subscribe(NEW_ITEMS)
+        self._interval_fn = interval_fn
+        self._lock = threading.Lock()
+        self.pending = []         # 아직 분석되지 않은 기사
+        self.arrivals = []        # (도착 시각, 기사 수, 폴링 간격) - 폭주 감지용
+        self.first_pending_at = None
+        self.last_event_at = None
+        self.armed_at = None
+        self.armed_reason = None
+        self.last_fired = None    # {"reason", "items", "at"}
+
+    def _drain(self):
+        """이벤트 큐의 새 기사를 대기 목록으로 옮김 (호출 전 _lock 필요)"""
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            items = event["payload"]
+            if not items:
+                continue
+            at = event["published_at"]
+            self.pending.extend(items)
+            self.arrivals.append((at, len(items), self._poll_span(at)))
+            self.last_event_at = at
+            if self.first_pending_at is None:
+                self.first_pending_at = at
+
+    def _poll_span(self, at):
+        """
+        이번 수집 묶음이 도착한 기간 (초, 호출 전 _lock 필요)
+
+        직전 이벤트 이후 간격과 현재 수집 주기 중 짧은 쪽 (새 기사가 없던 수집은 이벤트가 없으므로
+        수집 주기로 상한을 둠). 둘 다 모르면 0 (한 시점에 도착한 것으로 봄)
+        """
+        spans = []
+        if self.last_event_at is not None:
+            spans.append(at - self.last_event_at)
+        if self._interval_fn is not None:
+            spans.append(self._interval_fn())
+        return max(0, min(spans)) if spans else 0
+
+    def _burst_count(self, now):
+        """최근 BURST_WINDOW초 동안 도착한 기사 수 (묶음은 폴링 간격에 고르게 나눠 셈, 호출 전 _lock 필요)"""
+        window_start = now - BURST_WINDOW
+        self.arrivals = [(at, n, span) for at, n, span in self.arrivals if at > window_start]
+        burst = 0.0
+        for at, n, span in self.arrivals:
+            if span <= 0:
+                burst += n
+            else:
+                burst += n * (at - max(at - span, window_start)) / span
+        return burst
+
+    def _threshold_reason(self, now, burst_only=False):
+        """
+        트리거 조건 판정 (호출 전 _lock 필요). 조건이 없으면 None
+
+        burst_only이면 중요 기사/속보 폭주만 봅니다. (휴장일)
+        """
+        if not self.pending:
+            return None
+
+        for item in self.pending:
+            if item.get('category') in HIGH_WEIGHT_CATEGORIES or \
+                    any(marker in item.get('title', '') for marker in BREAKING_MARKERS):
+                return f"중요 기사: {item.get('title', '')[:30]}"
+
+        burst = self._burst_count(now)
+        if burst >= BURST_COUNT:
+            return f"속보 폭주: {BURST_WINDOW // 60}분간 {burst:.0f}건"
+        if burst_only:
+            return None
+
+        clusters = len(cluster_news(self.pending))
+        if clusters >= NEW_CLUSTER_THRESHOLD:
+            return f"새 토픽 {clusters}개"
+
+        if now - self.first_pending_at >= MAX_STALENESS:
+            return f"최대 지연 {MAX_STALENESS // 60}분 초과"
+        return None
+
+    def should_fire(self, now=None, burst_only=False):
+        """
+        지금 분석을 실행해야 하는지 판단합니다.
+
+        Args:
+            now: 판단 시각 (기본값: 현재)
+            burst_only: 중요 기사/속보 폭주일 때만 실행 (휴장일)
+
+        Returns:
+            실행 사유 문자열 (실행하지 않으면 None)
+        """
+        now = now or time.time()
+        with self._lock:
+            self._drain()
+            if self.armed_at is None:
+                reason = self._threshold_reason(now, burst_only)
+                if reason is None:
+                    return None
+                self.armed_at, self.armed_reason = now, reason
+
+            quiet = now - self.last_event_at >= DEBOUNCE
+            if quiet or now - self.armed_at >= MAX_DEBOUNCE:
+                return self.armed_reason
+            return None
+
+    def take(self, reason):
+        """분석 실행 직전에 대기 중인 기사를 넘겨받고 상태를 초기화합니다."""
+        with self._lock:
+            self._drain()
+            items = self.pending
+            self.last_fired = {
+                "reason": reason, "items": len(items), "at": time.time(),
+                "pending_since": self.first_pending_at,
+            }
+            self.pending = []
+            self.first_pending_at = None
+            self.armed_at = self.armed_reason = None
+            return items
+
+    def seed(self, items):
+        """이벤트 없이 대기 목록을 채웁니다. (리더 시작 시 마지막 리포트 이후 기사)"""
+        if not items:
+            return
+        with self._lock:
+            now = time.time()
+            self.pending.extend(items)
+            self.first_pending_at = self.first_pending_at or now
+            self.last_event_at = self.last_event_at or now
+
+    def requeue(self, items):
+        """분석이 실패하면 기사를 다시 대기 목록에 넣습니다."""
+        if not items:
+            return
+        with self._lock:
+            self.pending = items + self.pending
+            since = self.last_fired.get("pending_since") or self.last_fired["at"]
+            self.first_pending_at = min(self.first_pending_at or since, since)
+            self.last_event_at = self.last_event_at or since
+
+    def status(self):
+        with self._lock:
+            self._drain()
+            return {
+                "pending": len(self.pending),
+                "armed_reason": self.armed_reason,
+                "last_fired": self.last_fired,
+            }
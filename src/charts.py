@@ -0,0 +1,97 @@
+"""
+차트 생성 모듈
+
+대시보드와 정적 내보내기 등 여러 화면에서 같은 차트를 쓰도록 그림 생성 코드를 모아 둡니다.
+"""
+
+import pandas as pd
+
+
+# 섹터 기상도 색상 (맑음: 강세 빨강, 흐림: 약세 파랑)
+SECTOR_COLOR_MAP = {"맑음": "#ff4b4b", "흐림": "#4b7bff"}
+
+
+def sector_dataframe(chart_data):
+    """
+    섹터 기상도용 데이터프레임
+
+    Args:
+        chart_data: 토론 결과의 sectors 리스트 [{sector, sentiment, score, reason, tickers}, ...]
+    """
+    df = pd.DataFrame(chart_data)
+
+    # Handle empty tickers for display
+    df['tickers_display'] = df['tickers'].apply(lambda x: ", ".join(x) if isinstance(x, list) else str(x))
+    df['size_display'] = df['score'] * 5  # Scale bubble size
+    return df
+
+
+def build_sector_figure(df):
+    """섹터 기상도 버블 차트 (plotly Figure)"""
+    import plotly.express as px
+
+    fig = px.scatter(
+        df,
+        x="sector",
+        y="score",
+        size="size_display",
+        color="sentiment",
+        color_discrete_map=SECTOR_COLOR_MAP,
+        hover_name="sector",
+        hover_data={"reason": True, "tickers_display": True, "size_display": False, "score": False, "sector": False},
+        text="sector",
+        size_max=60,
+        height=450
+    )
+
+    fig.update_traces(
+        textposition='top center',
+        hovertemplate="<b>%{hovertext}</b><br><br>상태: %{marker.color}<br>이유: %{customdata[0]}<br>관련주: %{customdata[1]}"
+    )
+
+    fig.update_layout(
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        xaxis={'visible': False},
+        yaxis={'title': '영향력', 'visible': False},
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=10, r=10, t=30, b=10)
+    )
+    return fig
+
+
+def build_sector_trend_figure(trend_df):
+    """
+    섹터 점수 추세 라인 차트 (plotly Figure)
+
+    Args:
+        trend_df: SectorHistory.trend_frame() 결과 [date, sector, daily_mean, mean_short, mean_long]
+    """
+    import plotly.express as px
+
+    fig = px.line(
+        trend_df,
+        x="date",
+        y="mean_short",
+        color="sector",
+        hover_data={"daily_mean": ":.1f", "mean_long": ":.1f", "mean_short": ":.1f", "date": False},
+        labels={"mean_short": "7일 평균", "daily_mean": "일평균", "mean_long": "28일 평균", "sector": "섹터"},
+        height=400
+    )
+    fig.update_traces(connectgaps=True)
+    # 5점 이하 흐림 / 6점 이상 맑음 경계선
+    fig.add_hline(y=5.5, line_dash="dot", line_color="#aaaaaa")
+    fig.update_layout(
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title=None),
+        xaxis={'title': None},
+        yaxis={'title': '점수 (1~10)', 'range': [0.5, 10.5]},
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=10, r=10, t=30, b=10)
+    )
+    return fig
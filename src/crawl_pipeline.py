@@ -0,0 +1,244 @@
+"""
+수집 파이프라인 모듈
+
+네트워크 I/O와 HTML 파싱을 두 단계로 나눕니다.
+- fetch 단계: 스레드 풀에서 여러 소스를 동시에 요청하고, 원본 바이트와 인코딩만 넘깁니다.
+  같은 호스트에 대한 요청은 HOST_INTERVAL초 이상 간격을 둡니다. (서버 부하 방지)
+- parse 단계: 프로세스 풀에서 디코딩/파싱합니다. (BeautifulSoup 파싱이 GIL에 묶이지 않도록)
+두 단계는 크기가 제한된 큐(QUEUE_SIZE)로 연결됩니다. 파싱이 밀려 큐가 가득 차면
+fetch 스레드는 큐에 자리가 날 때까지 기다립니다. (backpressure)
+파싱 처리량(items/sec)은 실행마다 기록되어 스케줄러 상태와 관리자 화면에 표시됩니다.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse
+
+import streamlit as st
+
+
+# fetch 스레드 수 / fetch -> parse 큐 크기
+FETCH_WORKERS = 4
+QUEUE_SIZE = 4
+# 파싱 프로세스 수 (st.secrets의 CRAWL_PARSE_WORKERS로 변경 가능, 0이면 프로세스 풀 없이 파싱)
+DEFAULT_PARSE_WORKERS = 2
+# 같은 호스트 요청 사이 최소 간격 (초)
+HOST_INTERVAL = 1
+
+_DONE = object()
+
+
+class RequestPacer:
+    """여러 스레드의 요청 시작 시각을 최소 간격 이상으로 벌립니다."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+def _timed_call(func, args):
+    """파싱 프로세스에서 실행: (결과, 소요 시간)"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def _configured_parse_workers():
+    try:
+        return int(st.secrets.get("CRAWL_PARSE_WORKERS", DEFAULT_PARSE_WORKERS))
+    except Exception:
+        return DEFAULT_PARSE_WORKERS
+
+
+class CrawlPipeline:
+    """fetch 스레드 풀 -> 제한된 큐 -> parse 프로세스 풀 (싱글톤)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(CrawlPipeline, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.fetch_workers = FETCH_WORKERS
+        self.queue_size = QUEUE_SIZE
+        self.parse_workers = max(0, _configured_parse_workers())
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._pacers = {}
+        self._pacers_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.last_stats = None
+        self.totals = {"runs": 0, "pages": 0, "items": 0, "errors": 0, "parse_sec": 0.0}
+
+    def _get_pool(self):
+        """파싱 프로세스 풀 (처음 사용할 때 생성하여 계속 재사용)"""
+        if self.parse_workers == 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                # 스레드가 많은 서버 프로세스를 fork하지 않도록 spawn으로 작업 프로세스를 만듦
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers, mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _discard_pool(self):
+        """작업 프로세스가 죽은 풀은 버리고 다음 실행에서 새로 만듦"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def pace(self, url):
+        """같은 호스트 요청 간격을 맞춥니다. (fetch 함수에서 요청 직전에 호출)"""
+        host = urlparse(url).netloc
+        with self._pacers_lock:
+            pacer = self._pacers.setdefault(host, RequestPacer(HOST_INTERVAL))
+        pacer.wait()
+
+    def run(self, keys, fetch, parse):
+        """
+        키마다 fetch 후 parse를 실행합니다.
+
+        Args:
+            keys: 작업 키 리스트 (예: 소스 ID)
+            fetch: fetch(key) -> parse 인자 튜플 (스레드에서 실행, 실패 시 예외)
+            parse: parse(*인자) -> 항목 리스트 (프로세스 풀에서 실행되므로 모듈 수준 함수여야 함)
+
+        Returns:
+            ({키: 항목 리스트}, {키: 예외})
+        """
+        results, errors = {}, {}
+        run_lock = threading.Lock()
+        stats = {"pages": 0, "items": 0, "parse_sec": 0.0, "blocked": 0}
+        started = time.time()
+        parse_queue = queue.Queue(maxsize=self.queue_size)
+
+        def fetch_one(key):
+            try:
+                payload = fetch(key)
+            except Exception as e:
+                with run_lock:
+                    errors[key] = e
+                return
+            try:
+                parse_queue.put_nowait((key, payload))
+            except queue.Full:
+                # 파싱이 밀려 있으면 자리가 날 때까지 대기 (backpressure)
+                with run_lock:
+                    stats["blocked"] += 1
+                parse_queue.put((key, payload))
+
+        def record(key, future_result):
+            items, parse_sec = future_result
+            with run_lock:
+                results[key] = items
+                stats["pages"] += 1
+                stats["items"] += len(items)
+                stats["parse_sec"] += parse_sec
+
+        fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="crawl-fetch")
+        fetch_futures = [fetch_pool.submit(fetch_one, key) for key in keys]
+
+        def close_queue():
+            wait(fetch_futures)
+            parse_queue.put(_DONE)
+
+        threading.Thread(target=close_queue, daemon=True).start()
+
+        # 파싱 중인 작업은 프로세스 수까지만 두고, 나머지는 큐에서 대기시킴
+        pool = self._get_pool()
+        slots = threading.Semaphore(max(1, self.parse_workers))
+        parse_futures = {}
+        parse_started = None
+        while True:
+            slots.acquire()
+            entry = parse_queue.get()
+            if entry is _DONE:
+                slots.release()
+                break
+            key, payload = entry
+            parse_started = parse_started or time.time()
+            if pool is None:
+                try:
+                    record(key, _timed_call(parse, payload))
+                except Exception as e:
+                    errors[key] = e
+                slots.release()
+                continue
+            try:
+                future = pool.submit(_timed_call, parse, payload)
+            except BrokenProcessPool as e:
+                errors[key] = e
+                slots.release()
+                continue
+            future.add_done_callback(lambda _: slots.release())
+            parse_futures[future] = key
+
+        broken = False
+        for future, key in parse_futures.items():
+            try:
+                record(key, future.result())
+            except BrokenProcessPool as e:
+                broken = True
+                errors[key] = e
+            except Exception as e:
+                errors[key] = e
+        fetch_pool.shutdown()
+        if broken:
+            self._discard_pool()
+
+        parse_elapsed = time.time() - parse_started if parse_started else 0
+        stats.update(
+            errors=len(errors),
+            elapsed_sec=round(time.time() - started, 2),
+            parse_items_per_sec=round(stats["items"] / parse_elapsed, 1) if parse_elapsed > 0 else None,
+            at=time.time(),
+        )
+        stats["parse_sec"] = round(stats["parse_sec"], 3)
+        with self._stats_lock:
+            self.last_stats = stats
+            self.totals["runs"] += 1
+            for field in ("pages", "items", "errors", "parse_sec"):
+                self.totals[field] += stats[field]
+        return results, errors
+
+    def stats(self):
+        """상태/지표 기록용 (최근 실행 + 누적)"""
+        with self._stats_lock:
+            totals = dict(self.totals)
+            totals["parse_sec"] = round(totals["parse_sec"], 3)
+            return {
+                "parse_workers": self.parse_workers,
+                "fetch_workers": self.fetch_workers,
+                "queue_size": self.queue_size,
+                "last": dict(self.last_stats) if self.last_stats else None,
+                "totals": totals,
+            }
+
+
+def get_crawl_pipeline():
+    return CrawlPipeline()
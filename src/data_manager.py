@@ -1,20 +1,62 @@
+import hashlib
 import json
 import os
 import pandas as pd
+import streamlit as st
 from datetime import datetime
 import time
 
 # 크롤링 모듈 import (RSS 피드 대신 직접 크롤링 사용)
-from src.news_crawler import NewsCrawler
+from src.news_crawler import NewsCrawler, canonical_link
+from src.news_events import NEW_ITEMS, get_event_bus
+from src import live_feed
+from src.file_lock import MUTEX_STALE, file_lock
+from src.ticker_tagger import build_ticker_index, get_ticker_tagger, save_ticker_index
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 FEEDS_FILE = os.path.join(DATA_DIR, 'feeds.json')
 NEWS_FILE = os.path.join(DATA_DIR, 'news.json')
 STATS_FILE = os.path.join(DATA_DIR, 'stats.json')
+# news.json 읽기-병합-쓰기 잠금 (스케줄러 리더와 백필 명령이 함께 씀)
+NEWS_LOCK_FILE = f"{NEWS_FILE}.lock"
+NEWS_LOCK_WAIT = MUTEX_STALE + 5
+
+# 보관할 최대 뉴스 개수 (st.secrets의 NEWS_RETENTION으로 변경 가능 - 과거 뉴스 백필 시 늘려서 사용)
+DEFAULT_NEWS_RETENTION = 1000
+
+
+def news_fingerprint(news_items):
+    """뉴스 구성(링크 집합) 기준 지문. 같은 뉴스 윈도우면 같은 값을 반환합니다."""
+    links = sorted(item.get('link', '') for item in news_items)
+    return hashlib.sha1('\n'.join(links).encode('utf-8')).hexdigest()[:16]
+
+
+def filter_today_news(news_items, today=None):
+    """오늘 수집된 뉴스 (fetched_at 기준)"""
+    today_start = datetime.combine(today or datetime.now().date(), datetime.min.time())
+    today_news = []
+    for item in news_items:
+        try:
+            fetched_at = item.get('fetched_at', '')
+            if fetched_at:
+                news_time = datetime.fromisoformat(fetched_at.replace('Z', '+00:00').split('+')[0])
+                if news_time >= today_start:
+                    today_news.append(item)
+        except ValueError:
+            continue
+    return today_news
+
+
+def _configured_news_retention():
+    try:
+        return int(st.secrets.get("NEWS_RETENTION", DEFAULT_NEWS_RETENTION))
+    except Exception:
+        return DEFAULT_NEWS_RETENTION
 
 
 class DataManager:
-    def __init__(self):
+    def __init__(self, retention=None):
+        self.retention = retention or _configured_news_retention()
         self._ensure_files()
 
     def _ensure_files(self):
@@ -54,19 +96,89 @@ class DataManager:
         크롤링을 통해 뉴스를 수집하고 업데이트합니다.
         기존 RSS 피드 방식 대신 직접 웹페이지 크롤링을 사용합니다.
         """
-        existing_news = self.load_news()
-        existing_links = {item['link'] for item in existing_news}
-        
+        yields = self.fetch_and_update_sources()
+        return sum(result["new"] for result in yields.values())
+
+    def fetch_and_update_sources(self, source_ids=None):
+        """
+        지정한 소스만 크롤링하여 뉴스를 업데이트합니다.
+
+        Args:
+            source_ids: 수집할 소스 ID 리스트 (기본값: 활성화된 전체 소스)
+
+        Returns:
+            {소스 ID: {"fetched": 수집 수, "new": 새 뉴스 수}}
+        """
         # 크롤러를 사용하여 뉴스 수집
         crawler = NewsCrawler()
-        crawled_news = crawler.fetch_all_news(max_per_source=30)
+        crawled = crawler.fetch_sources(source_ids)
+
+        all_crawled = []
+        for items in crawled.values():
+            all_crawled.extend(items)
+        new_links = {item['link'] for item in self.ingest_news(all_crawled)}
+
+        # 소스별 새 뉴스 수 (여러 소스에 같은 기사가 있으면 먼저 수집한 소스에만 계산)
+        yields = {}
+        for source_id, items in crawled.items():
+            new_count = 0
+            for item in items:
+                if item['link'] in new_links:
+                    new_links.discard(item['link'])
+                    new_count += 1
+            yields[source_id] = {"fetched": len(items), "new": new_count}
+        return yields
+
+    def ingest_news(self, crawled_news, publish=True):
+        """
+        수집한 뉴스 중 기존에 없는 항목을 저장하고 새 기사 이벤트를 발행합니다.
+
+        Args:
+            crawled_news: 수집한 뉴스 항목 리스트
+            publish: 새 기사 이벤트/실시간 피드 발행 여부 (과거 뉴스 백필은 발행하지 않음)
+
+        Returns:
+            새로 추가된 뉴스 항목 리스트
+        """
+        # 스케줄러와 백필 명령이 동시에 저장해도 한쪽의 새 뉴스가 덮어써지지 않도록
+        # 읽기-병합-쓰기와 종목 역색인 갱신을 프로세스 간 잠금 안에서 함
+        with file_lock(NEWS_LOCK_FILE, wait=NEWS_LOCK_WAIT) as acquired:
+            if not acquired:
+                raise RuntimeError("news.json 잠금을 얻지 못해 뉴스를 저장하지 않았습니다.")
+            new_items = self._merge_news(crawled_news)
+
+        if not new_items:
+            print("뉴스 업데이트 완료: 새로운 뉴스 없음")
+            return new_items
+
+        if publish:
+            # 새 기사 이벤트 발행 (분석 트리거 등 구독자에게 전달) + 연결된 대시보드로 전송
+            get_event_bus().publish(NEW_ITEMS, new_items)
+            live_feed.publish_news(new_items)
         
-        # 기존에 없는 새 뉴스만 필터링
+        print(f"뉴스 업데이트 완료: 새로운 뉴스 {len(new_items)}개 추가됨")
+        return new_items
+
+    def _merge_news(self, crawled_news):
+        """새 뉴스를 태깅/병합하여 저장하고 새 항목을 반환 (호출 전 뉴스 잠금 필요)"""
+        existing_news = self.load_news()
+        existing_links = {canonical_link(item['link']) for item in existing_news}
+        
+        # 기존에 없는 새 뉴스만 필터링 (같은 기사의 다른 목록 링크도 중복으로 봄)
         new_items = []
         for item in crawled_news:
-            if item['link'] not in existing_links:
+            key = canonical_link(item['link'])
+            if key not in existing_links:
                 new_items.append(item)
-                existing_links.add(item['link'])
+                existing_links.add(key)
+        
+        if not new_items:
+            return new_items
+        
+        # 새 뉴스의 제목/요약에서 종목 태깅 (태깅 전에 저장된 기존 뉴스도 한 번만 태깅)
+        tagger = get_ticker_tagger()
+        tagger.tag_items(new_items)
+        tagger.tag_items([item for item in existing_news if 'tickers' not in item])
         
         # 새 뉴스와 기존 뉴스 합치기
         all_news = new_items + existing_news
@@ -77,14 +189,17 @@ class DataManager:
         except:
             pass  # 정렬 실패시 그대로 유지
         
-        # 최대 1000개 뉴스만 유지
-        all_news = all_news[:1000]
+        # 최대 보관 개수만 유지
+        all_news = all_news[:self.retention]
         
-        with open(NEWS_FILE, 'w', encoding='utf-8') as f:
+        # 백필 명령과 스케줄러가 함께 쓸 수 있으므로 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{NEWS_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(all_news, f, indent=4, ensure_ascii=False)
-        
-        print(f"뉴스 업데이트 완료: 새로운 뉴스 {len(new_items)}개 추가됨")
-        return len(new_items)
+        os.replace(tmp_path, NEWS_FILE)
+        # 종목별 뉴스 역색인 (저장된 태깅 결과로 다시 만들므로 보관 개수를 넘어 삭제된 기사는 빠짐)
+        save_ticker_index(build_ticker_index(all_news))
+        return new_items
 
     def load_news(self):
         try:
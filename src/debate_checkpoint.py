@@ -0,0 +1,121 @@
+"""
+토론 체크포인트 모듈
+
+토론의 각 단계(LLM 호출) 결과를 완료 즉시 토론 ID별 파일로 저장합니다.
+같은 토론을 다시 실행하면 완료된 단계는 저장된 결과를 재사용하고,
+누락되었거나 실패한 단계부터 이어서 실행합니다.
+뉴스 다이제스트(클러스터 요약)도 함께 저장해 이어서 실행할 때 다시 요약하지 않으며,
+토론이 성공하면 체크포인트를 삭제하므로 실패한 토론만 이어서 실행됩니다.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'debate_checkpoints')
+# 보관할 최대 체크포인트 수 (오래된 것부터 삭제)
+MAX_CHECKPOINTS = 20
+
+
+class DebateCheckpoint:
+    """토론 한 건의 단계별 진행 상태"""
+
+    def __init__(self, debate_id, directory=CHECKPOINT_DIR):
+        self.debate_id = debate_id
+        self.directory = directory
+        self.path = os.path.join(directory, f"{debate_id}.json")
+        self._lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {
+                "debate_id": self.debate_id,
+                "created_at": datetime.now().isoformat(),
+                "steps": {}
+            }
+
+    def _save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def news_text(self):
+        """저장된 뉴스 다이제스트 (없으면 None)"""
+        return self.data.get("news_text")
+
+    def save_news_text(self, text):
+        with self._lock:
+            self.data["news_text"] = text
+            self._save()
+
+    def discard(self):
+        """토론이 성공하면 체크포인트 삭제 (다음 실행은 처음부터)"""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def completed_steps(self):
+        """{단계 id: 결과} (성공한 단계만)"""
+        return {
+            step_id: step["output"]
+            for step_id, step in self.data["steps"].items()
+            if step.get("status") == "done"
+        }
+
+    def failed_steps(self):
+        """{단계 id: 오류 메시지}"""
+        return {
+            step_id: step.get("error", "")
+            for step_id, step in self.data["steps"].items()
+            if step.get("status") == "failed"
+        }
+
+    def mark_done(self, step_id, output):
+        with self._lock:
+            self.data["steps"][step_id] = {
+                "status": "done",
+                "output": output,
+                "completed_at": datetime.now().isoformat()
+            }
+            self._save()
+
+    def mark_failed(self, step_id, error):
+        with self._lock:
+            previous = self.data["steps"].get(step_id, {})
+            self.data["steps"][step_id] = {
+                "status": "failed",
+                "error": error,
+                "failures": previous.get("failures", 0) + 1,
+                "failed_at": datetime.now().isoformat()
+            }
+            self._save()
+
+
+def prune_checkpoints(directory=CHECKPOINT_DIR, keep=MAX_CHECKPOINTS):
+    """최근 keep개만 남기고 오래된 체크포인트를 삭제합니다."""
+    if not os.path.isdir(directory):
+        return 0
+
+    paths = [
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.json')
+    ]
+    paths.sort(key=os.path.getmtime, reverse=True)
+
+    removed = 0
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
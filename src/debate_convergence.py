@@ -0,0 +1,182 @@
+"""
+토론 수렴도 판정 모듈
+
+Round 1의 Bull/Bear/Analyst 의견을 LLM 호출 없이 감성 어휘 사전으로 채점하여
+주요 섹터별 방향(긍정/부정)이 일치하는지 판정합니다.
+- 섹터 언급: 표현 앞에 한글이 붙지 않고, 뒤에 붙는 한글은 조사나 업종 접미어(주, 업, 업종...)일 때만
+  인정합니다. ("조선비즈"는 조선 섹터가 아님, "조선주가"/"반도체업종은"은 인정)
+- 섹터 일치: Bull과 Bear가 모두 방향을 밝혔고(0이 아님) 부호가 같으며, Analyst가 반대 방향이 아닐 때만
+  (한쪽이 언급하지 않았거나 중립(0)이면 판단 불가로 보고 쟁점 섹터에 포함)
+- converged: 주요 섹터 방향이 대부분 일치 → 반박 라운드를 생략하고 바로 종합
+- mixed: 일부 엇갈림 → 기본 반박 라운드 진행
+- divergent: 크게 엇갈림 → 쟁점 섹터에 대한 추가 재반박 라운드 진행
+"""
+
+import re
+from collections import defaultdict
+
+from src.ticker_tagger import PARTICLES
+
+
+# 섹터 이름 -> 본문에서 찾을 표현
+SECTOR_LEXICON = {
+    "반도체": ["반도체", "hbm", "메모리", "파운드리"],
+    "2차전지": ["2차전지", "이차전지", "배터리", "양극재"],
+    "자동차": ["자동차", "완성차", "전기차"],
+    "방산": ["방산", "방위산업", "항공우주"],
+    "조선": ["조선", "선박"],
+    "바이오": ["바이오", "제약", "헬스케어"],
+    "금융": ["은행", "금융주", "보험", "증권"],
+    "건설": ["건설", "부동산"],
+    "화학": ["화학", "정유"],
+    "철강": ["철강", "소재"],
+    "에너지": ["에너지", "원전", "태양광", "유가"],
+    "플랫폼": ["플랫폼", "인터넷", "네이버", "카카오"],
+    "게임/엔터": ["게임", "엔터", "콘텐츠"],
+    "유통/소비재": ["유통", "소비재", "화장품", "면세"],
+    "가상자산": ["가상자산", "비트코인", "코인"],
+}
+
+# 섹터 표현 바로 뒤에 붙어도 같은 섹터로 보는 접미어 (뒤에 조사가 더 붙어도 됨)
+SECTOR_SUFFIXES = ("주", "株", "사", "업", "업종", "업체", "업계", "산업", "섹터", "기업", "관련주", "대장주", "권")
+
+POSITIVE_WORDS = [
+    "상승", "호재", "수혜", "강세", "매수", "기회", "성장", "개선", "반등", "확대",
+    "긍정", "낙관", "유망", "견조", "증가", "회복", "주목", "맑음", "최대", "돌파",
+]
+NEGATIVE_WORDS = [
+    "하락", "악재", "피해", "약세", "매도", "위험", "리스크", "둔화", "우려", "감소",
+    "부정", "비관", "경고", "관망", "주의", "부진", "불확실", "흐림", "과열", "손실",
+]
+
+# 판정 기준: 주요 섹터 중 방향이 일치하는 비율
+CONVERGED_AGREEMENT = 0.8
+DIVERGENT_AGREEMENT = 0.4
+# 최소 이 개수의 주요 섹터가 있어야 수렴으로 판정
+MIN_MAIN_SECTORS = 2
+# 서로 반대 입장에서 의견을 내는 페르소나 (둘 다 같은 방향이어야 일치)
+OPPOSING_PERSONAS = ("bull", "bear")
+
+_SENTENCE_SPLIT = re.compile(r'[\n.!?]+')
+_HANGUL_RUN = re.compile(r'[가-힣]+')
+
+
+def _is_hangul(ch):
+    return '가' <= ch <= '힣'
+
+
+def _allowed_suffix(run):
+    """섹터 표현 뒤에 붙은 한글이 조사/업종 접미어(+들, +조사)인지"""
+    if run in PARTICLES:
+        return True
+    for suffix in SECTOR_SUFFIXES:
+        if not run.startswith(suffix):
+            continue
+        rest = run[len(suffix):]
+        rest = rest[1:] if rest.startswith("들") else rest
+        if not rest or rest in PARTICLES:
+            return True
+    return False
+
+
+def mentions(sentence, alias):
+    """문장에 섹터 표현이 독립된 단어로 나오는지 (다른 단어의 일부는 제외)"""
+    start = sentence.find(alias)
+    while start != -1:
+        end = start + len(alias)
+        before = sentence[start - 1] if start else ''
+        after = sentence[end] if end < len(sentence) else ''
+        if alias[0].isascii():
+            left_ok = not (before.isascii() and before.isalpha())
+        else:
+            left_ok = not _is_hangul(before)
+        right_ok = not (alias[-1].isascii() and after.isascii() and after.isalpha())
+        following = _HANGUL_RUN.match(sentence, end)
+        if left_ok and right_ok and (following is None or _allowed_suffix(following.group())):
+            return True
+        start = sentence.find(alias, start + 1)
+    return False
+
+
+def sentence_score(sentence):
+    """긍정 어휘 수 - 부정 어휘 수"""
+    return sum(sentence.count(w) for w in POSITIVE_WORDS) - sum(sentence.count(w) for w in NEGATIVE_WORDS)
+
+
+def sector_stances(text):
+    """
+    의견 텍스트의 섹터별 방향 점수
+
+    Returns:
+        {섹터: 점수 합계} (언급된 섹터만, 양수=긍정, 음수=부정)
+    """
+    stances = defaultdict(int)
+    for sentence in _SENTENCE_SPLIT.split((text or '').lower()):
+        if not sentence.strip():
+            continue
+        mentioned = [
+            sector for sector, aliases in SECTOR_LEXICON.items()
+            if any(mentions(sentence, alias) for alias in aliases)
+        ]
+        if not mentioned:
+            continue
+        score = sentence_score(sentence)
+        for sector in mentioned:
+            stances[sector] += score
+    return dict(stances)
+
+
+def assess_convergence(opinions):
+    """
+    Round 1 의견들의 수렴도를 판정합니다.
+
+    Args:
+        opinions: {페르소나: 의견 텍스트}
+
+    Returns:
+        {verdict, agreement, main_sectors, contested, undecided, stances}
+        (contested에는 방향이 엇갈린 섹터와 판단 불가(undecided) 섹터가 모두 포함)
+    """
+    stances = {persona: sector_stances(text) for persona, text in opinions.items()}
+
+    # 두 명 이상이 언급한 섹터를 주요 섹터로 봄
+    mention_count = defaultdict(int)
+    for persona_stances in stances.values():
+        for sector in persona_stances:
+            mention_count[sector] += 1
+    main_sectors = sorted(s for s, count in mention_count.items() if count >= 2)
+
+    def direction(persona, sector):
+        score = stances.get(persona, {}).get(sector, 0)
+        return (score > 0) - (score < 0)
+
+    agreed, contested, undecided = [], [], []
+    for sector in main_sectors:
+        sides = {direction(persona, sector) for persona in OPPOSING_PERSONAS}
+        others = {
+            direction(persona, sector) for persona in stances if persona not in OPPOSING_PERSONAS
+        } - {0}
+        if 0 in sides:
+            undecided.append(sector)
+            contested.append(sector)
+        elif len(sides | others) > 1:
+            contested.append(sector)
+        else:
+            agreed.append(sector)
+
+    agreement = len(agreed) / len(main_sectors) if main_sectors else 0.0
+    if len(main_sectors) >= MIN_MAIN_SECTORS and agreement >= CONVERGED_AGREEMENT:
+        verdict = "converged"
+    elif main_sectors and agreement <= DIVERGENT_AGREEMENT:
+        verdict = "divergent"
+    else:
+        verdict = "mixed"
+
+    return {
+        "verdict": verdict,
+        "agreement": round(agreement, 2),
+        "main_sectors": main_sectors,
+        "contested": contested,
+        "undecided": undecided,
+        "stances": stances,
+    }
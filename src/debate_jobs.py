@@ -0,0 +1,243 @@
+"""
+토론 작업 큐 모듈
+
+AI 토론을 Streamlit 세션이 아닌 프로세스 소유의 워커 풀에서 실행합니다.
+작업 상태와 진행률은 작업별 파일(data/debate_jobs/)에 기록되므로
+브라우저를 새로고침하거나 다른 관리자가 접속해도 같은 작업을 조회할 수 있습니다.
+실행 중인 작업에는 프로세스 부팅 토큰과 하트비트 시각을 기록해, 재시작으로 PID가 재사용되어도
+토큰이 다르거나 하트비트가 끊긴 작업은 중단된 것으로 판단합니다.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.ai_debate_engine import AIDebateEngine
+from src.data_manager import news_fingerprint
+from src.single_flight import get_single_flight
+from src.snapshots import refresh_snapshots
+from src.view_model import invalidate_view_model
+
+
+JOBS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'debate_jobs')
+# 동시에 실행할 토론 수 (토론 내부 단계는 별도로 병렬 실행됨)
+MAX_WORKERS = 1
+# 보관할 최대 작업 기록 수
+MAX_JOB_FILES = 50
+
+# 실행/대기 중인 작업의 하트비트 갱신 주기 (초)
+HEARTBEAT_INTERVAL = 30
+# 하트비트가 이보다 오래되면 소유 프로세스가 종료된 것으로 판단 (초)
+HEARTBEAT_STALE = HEARTBEAT_INTERVAL * 4
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# 프로세스마다 새로 만드는 부팅 토큰 (컨테이너 재시작 후 같은 PID가 재사용되어도 구분됨)
+BOOT_TOKEN = uuid.uuid4().hex
+
+
+class DebateJobManager:
+    """프로세스 전역 토론 작업 관리자 (싱글톤)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(DebateJobManager, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="debate-job")
+        self._write_lock = threading.RLock()
+        self._active = {}  # 이 프로세스가 소유한 대기/실행 중 작업 {job_id: job}
+        os.makedirs(JOBS_DIR, exist_ok=True)
+        self._recover_orphans()
+        threading.Thread(target=self._heartbeat_loop, name="debate-job-heartbeat", daemon=True).start()
+
+    def _job_path(self, job_id):
+        return os.path.join(JOBS_DIR, f"{job_id}.json")
+
+    def _write(self, job):
+        with self._write_lock:
+            path = self._job_path(job["job_id"])
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(job, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+    def _update(self, job, **fields):
+        with self._write_lock:
+            job.update(fields)
+            job["updated_at"] = datetime.now().isoformat()
+            job["heartbeat_at"] = time.time()
+            self._write(job)
+
+    def _heartbeat_loop(self):
+        """소유한 작업의 하트비트를 갱신하고, 다른 프로세스가 남긴 중단 작업을 정리"""
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            try:
+                with self._write_lock:
+                    for job in list(self._active.values()):
+                        job["heartbeat_at"] = time.time()
+                        self._write(job)
+                self._recover_orphans()
+            except Exception as e:
+                print(f"Debate job heartbeat error: {e}")
+
+    def _recover_orphans(self):
+        """소유 프로세스가 사라진 미완료 작업은 중단된 것으로 표시 (재실행 시 체크포인트에서 이어짐)"""
+        for job in self.list_jobs(limit=MAX_JOB_FILES, active_only=True):
+            if _is_orphaned(job):
+                self._update(job, status="failed", error="서버 재시작으로 작업이 중단되었습니다. 다시 실행하면 이어서 진행합니다.")
+
+    def submit(self, api_key, news_items, sector_deep_dive_k=0):
+        """
+        토론 작업을 등록합니다.
+
+        같은 뉴스 윈도우의 토론이 이미 진행 중이거나 방금 끝났다면
+        새 작업을 만들지 않고 그 작업에 합류합니다 (single-flight).
+
+        Args:
+            api_key: Gemini API 키
+            news_items: 토론할 뉴스 항목 리스트
+            sector_deep_dive_k: 섹터별 심층 토론을 실행할 상위 섹터 수 (0이면 생략)
+
+        Returns:
+            (작업 ID, 기존 작업 합류 여부)
+        """
+        fingerprint = news_fingerprint(news_items)
+
+        def start():
+            job = {
+                "job_id": uuid.uuid4().hex[:12],
+                "status": "queued",
+                "progress": 0.0,
+                "message": "⏳ 대기 중...",
+                "news_count": len(news_items),
+                "news_fingerprint": fingerprint,
+                "sector_deep_dive_k": sector_deep_dive_k,
+                "owner": f"{socket.gethostname()}:{os.getpid()}",
+                "boot_token": BOOT_TOKEN,
+                "heartbeat_at": time.time(),
+                "submitted_at": datetime.now().isoformat(),
+                "updated_at": datetime.now().isoformat(),
+            }
+            with self._write_lock:
+                self._active[job["job_id"]] = job
+                self._write(job)
+            future = self.executor.submit(self._run, job, api_key, news_items, sector_deep_dive_k)
+            future.job_id = job["job_id"]
+            return future
+
+        future, attached = get_single_flight().submit((f"debate:k{sector_deep_dive_k}", fingerprint), start)
+        if not attached:
+            self._prune()
+        return future.job_id, attached
+
+    def _run(self, job, api_key, news_items, sector_deep_dive_k=0):
+        self._update(job, status="running", started_at=datetime.now().isoformat(), message="🎬 토론을 시작합니다...")
+
+        def progress_callback(message, progress):
+            self._update(job, message=message, progress=round(progress, 3))
+
+        try:
+            engine = AIDebateEngine(api_key=api_key)
+            result = engine.run_debate(news_items, progress_callback, sector_deep_dive_k=sector_deep_dive_k)
+            if "error" in result:
+                self._update(
+                    job, status="failed", error=result["error"],
+                    debate_id=result.get("debate_id"), finished_at=datetime.now().isoformat()
+                )
+                raise RuntimeError(result["error"])
+
+            engine.save_debate_log(result)
+            invalidate_view_model()  # 대시보드가 새 토론 결과를 바로 보여주도록
+            refresh_snapshots(["latest_debate", "sectors"])
+            self._update(
+                job, status="done", progress=1.0, message="✅ 토론 완료!",
+                debate_id=result.get("debate_id"), result_timestamp=result["timestamp"],
+                finished_at=datetime.now().isoformat()
+            )
+        except Exception as e:
+            # 실패한 작업은 single-flight 재사용 대상에서 제외되도록 예외로 끝냄
+            if job["status"] != "failed":
+                print(f"Debate job {job['job_id']} error: {e}")
+                self._update(job, status="failed", error=str(e), finished_at=datetime.now().isoformat())
+            raise
+        finally:
+            with self._write_lock:
+                self._active.pop(job["job_id"], None)
+
+    def get_job(self, job_id):
+        try:
+            with open(self._job_path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def list_jobs(self, limit=10, active_only=False):
+        """최근 작업 목록 (최신순)"""
+        jobs = []
+        if not os.path.isdir(JOBS_DIR):
+            return jobs
+        for name in os.listdir(JOBS_DIR):
+            if not name.endswith('.json'):
+                continue
+            job = self.get_job(name[:-len('.json')])
+            if job is None:
+                continue
+            if active_only and job.get("status") not in ACTIVE_STATUSES:
+                continue
+            jobs.append(job)
+        jobs.sort(key=lambda j: j.get("submitted_at", ""), reverse=True)
+        return jobs[:limit]
+
+    def _prune(self):
+        """오래된 완료 작업 기록 삭제"""
+        finished = [j for j in self.list_jobs(limit=10 ** 6) if j.get("status") not in ACTIVE_STATUSES]
+        for job in finished[MAX_JOB_FILES:]:
+            try:
+                os.remove(self._job_path(job["job_id"]))
+            except OSError:
+                pass
+
+
+def _is_orphaned(job):
+    """
+    작업의 소유 프로세스가 사라졌는지 확인
+
+    - 이 프로세스의 부팅 토큰이면 살아있음
+    - 같은 호스트:PID인데 토큰이 다르면 재시작으로 PID가 재사용된 것이므로 중단됨
+    - 그 밖에는 하트비트가 HEARTBEAT_STALE초 넘게 갱신되지 않았으면 중단됨
+      (하트비트가 없는 이전 형식의 작업은 updated_at 기준)
+    """
+    if job.get("boot_token") == BOOT_TOKEN:
+        return False
+    if job.get("owner") == f"{socket.gethostname()}:{os.getpid()}":
+        return True
+
+    heartbeat = job.get("heartbeat_at")
+    if heartbeat is None:
+        try:
+            heartbeat = datetime.fromisoformat(job.get("updated_at", "")).timestamp()
+        except ValueError:
+            return True
+    return time.time() - heartbeat > HEARTBEAT_STALE
+
+
+def get_debate_job_manager():
+    return DebateJobManager()
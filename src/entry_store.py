@@ -0,0 +1,292 @@
+"""
+기록 저장소 모듈
+
+토론/리포트 기록을 항목별 압축 파일(entries/<id>.json.gz)로 저장하고,
+작은 목록 파일(index.json)에 타임스탬프, 뉴스 지문, 섹터 요약만 기록합니다.
+- '최신' 조회는 목록 파일과 항목 하나만 읽습니다.
+- 기록 목록은 목록 파일만 페이지 단위로 읽습니다.
+- 보관 개수는 설정값(st.secrets)으로 조정할 수 있습니다.
+- 구버전 단일 배열 파일(debates.json, reports.json)은 처음 접근할 때 한 번 변환합니다.
+- 여러 프로세스(스케줄러 리더, 토론을 실행한 관리자 세션)가 함께 쓰므로 목록 파일의
+  읽기-수정-쓰기는 프로세스 간 잠금(index.json.lock) 안에서 하고, 정리(compact)는
+  목록에 없고 COMPACT_GRACE초보다 오래된 항목 파일만 삭제합니다.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+
+from src.file_lock import MUTEX_STALE, file_lock
+from src.sector_data import ensure_sectors
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+
+# 기본 보관 개수 (st.secrets의 DEBATE_RETENTION / REPORT_RETENTION으로 변경 가능)
+DEFAULT_DEBATE_RETENTION = 10
+DEFAULT_REPORT_RETENTION = 30
+
+# 목록 파일 잠금 최대 대기 시간 (초, 남은 잠금이 강제 해제될 때까지 기다림)
+LOCK_WAIT = MUTEX_STALE + 5
+# 목록에 없는 항목 파일도 이 시간(초) 안에 만들어졌으면 다른 프로세스가 저장 중일 수 있으므로 남김
+COMPACT_GRACE = 600
+
+
+class EntryStore:
+    """기록 종류(토론/리포트)별 색인 저장소"""
+
+    def __init__(self, name, text_key, retention, data_dir=DATA_DIR):
+        """
+        Args:
+            name: 저장소 이름 (data/<name>/ 디렉토리, 구버전 data/<name>.json)
+            text_key: 본문 필드 이름 (토론: final_report, 리포트: content)
+            retention: 보관할 최대 기록 수
+            data_dir: 데이터 디렉토리
+        """
+        self.name = name
+        self.text_key = text_key
+        self.retention = max(1, int(retention))
+        self.directory = os.path.join(data_dir, name)
+        self.entries_dir = os.path.join(self.directory, 'entries')
+        self.index_file = os.path.join(self.directory, 'index.json')
+        self.lock_file = f"{self.index_file}.lock"
+        self.legacy_file = os.path.join(data_dir, f"{name}.json")
+        self._lock = threading.Lock()
+
+    # --- 파일 입출력 ---
+
+    @contextmanager
+    def _index_lock(self):
+        """목록 파일 읽기-수정-쓰기 잠금 (스레드 + 프로세스 간, 획득 여부를 yield)"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with file_lock(self.lock_file, wait=LOCK_WAIT) as acquired:
+                yield acquired
+
+    def _entry_path(self, entry_id):
+        return os.path.join(self.entries_dir, f"{entry_id}.json.gz")
+
+    def _load_index(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def _write_index(self, index):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.index_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.index_file)
+
+    def _write_entry(self, entry_id, entry):
+        os.makedirs(self.entries_dir, exist_ok=True)
+        path = self._entry_path(entry_id)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _index_row(self, entry_id, entry):
+        """목록 파일에 기록할 요약 (본문 제외)"""
+        row = {
+            "id": entry_id,
+            "timestamp": entry.get("timestamp", ""),
+            "news_fingerprint": entry.get("news_fingerprint") or entry.get("debate_id", ""),
+            "sectors": [
+                {"sector": s["sector"], "sentiment": s["sentiment"], "score": s["score"]}
+                for s in entry.get("sectors", [])
+            ],
+        }
+        if "mode" in entry:
+            row["mode"] = entry["mode"]
+        return row
+
+    # --- 구버전 변환 ---
+
+    def _ensure_migrated(self):
+        if not os.path.exists(self.index_file) and os.path.exists(self.legacy_file):
+            with self._index_lock():
+                self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        """구버전 단일 배열 파일을 항목별 파일로 변환 (호출 전 _index_lock 필요)"""
+        if os.path.exists(self.index_file) or not os.path.exists(self.legacy_file):
+            return
+
+        try:
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading legacy {self.name} file: {e}")
+            return
+
+        index = []
+        for entry in legacy[:self.retention]:
+            ensure_sectors(entry, self.text_key)
+            entry_id = _new_entry_id(entry.get("timestamp"))
+            self._write_entry(entry_id, entry)
+            index.append(self._index_row(entry_id, entry))
+
+        self._write_index(index)
+        os.replace(self.legacy_file, f"{self.legacy_file}.migrated")
+        print(f"Migrated {len(index)} {self.name} entries to {self.directory}")
+
+    # --- 공개 API ---
+
+    def save(self, entry):
+        """
+        기록을 저장하고 보관 개수를 넘는 오래된 기록을 삭제합니다.
+        LOCK_WAIT초 안에 목록 파일 잠금을 얻지 못하면 RuntimeError를 냅니다.
+
+        Returns:
+            저장된 기록 ID
+        """
+        with self._index_lock() as acquired:
+            if not acquired:
+                # 잠금 없이 목록 파일을 고쳐 쓰면 다른 프로세스의 기록이 사라질 수 있으므로 저장하지 않음
+                raise RuntimeError(f"{self.name} index lock not acquired, entry not saved")
+            self._migrate_legacy()
+            entry_id = _new_entry_id(entry.get("timestamp"))
+            self._write_entry(entry_id, entry)
+
+            index = self._load_index()
+            index.insert(0, self._index_row(entry_id, entry))
+            expired = index[self.retention:]
+            self._write_index(index[:self.retention])
+
+        for row in expired:
+            try:
+                os.remove(self._entry_path(row["id"]))
+            except OSError:
+                pass
+        return entry_id
+
+    def get(self, entry_id):
+        """기록 하나를 읽습니다. (없으면 None)"""
+        try:
+            with gzip.open(self._entry_path(entry_id), 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, OSError, json.JSONDecodeError):
+            return None
+        if 'sectors' not in entry:
+            ensure_sectors(entry, self.text_key)
+            self._store_sectors(entry_id, entry)
+        return entry
+
+    def _store_sectors(self, entry_id, entry):
+        """본문에서 추출한 섹터 데이터를 항목 파일과 목록에 기록 (다음 조회부터 다시 추출하지 않음)"""
+        try:
+            with self._index_lock() as acquired:
+                if not acquired or not os.path.exists(self._entry_path(entry_id)):
+                    return
+                self._write_entry(entry_id, entry)
+                index = self._load_index()
+                for row in index:
+                    if row["id"] == entry_id:
+                        row["sectors"] = self._index_row(entry_id, entry)["sectors"]
+                        self._write_index(index)
+                        break
+        except OSError as e:
+            print(f"Error storing extracted sectors for {self.name} {entry_id}: {e}")
+
+    def latest(self):
+        """가장 최근 기록 (목록 파일과 항목 하나만 읽음)"""
+        for row in self.list(limit=3):
+            entry = self.get(row["id"])
+            if entry is not None:
+                return entry
+        return None
+
+    def list(self, offset=0, limit=10):
+        """
+        기록 요약 목록 (최신순, 본문 없이 목록 파일만 읽음)
+
+        Returns:
+            [{id, timestamp, news_fingerprint, sectors, (mode)}, ...]
+        """
+        self._ensure_migrated()
+        return self._load_index()[offset:offset + limit]
+
+    def count(self):
+        self._ensure_migrated()
+        return len(self._load_index())
+
+    def compact(self):
+        """
+        목록에 없는 항목 파일(중단된 저장, 보관 한도 초과분)과 남은 임시 파일을 삭제합니다.
+        COMPACT_GRACE초 안에 만들어진 파일은 다른 프로세스가 저장 중일 수 있으므로 남깁니다.
+
+        Returns:
+            삭제한 파일 수
+        """
+        if not os.path.isdir(self.entries_dir):
+            return 0
+
+        removed = 0
+        with self._index_lock() as acquired:
+            if not acquired:
+                print(f"{self.name} index lock not acquired, skipping compaction")
+                return 0
+
+            index = self._load_index()
+            if len(index) > self.retention:
+                self._write_index(index[:self.retention])
+            keep = {f"{row['id']}.json.gz" for row in index[:self.retention]}
+
+            cutoff = time.time() - COMPACT_GRACE
+            for name in os.listdir(self.entries_dir):
+                if name in keep:
+                    continue
+                path = os.path.join(self.entries_dir, name)
+                try:
+                    if os.path.getmtime(path) > cutoff:
+                        continue
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def _new_entry_id(timestamp=None):
+    """정렬 가능한 기록 ID (작성 시각 + 임의 접미사)"""
+    try:
+        moment = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
+    except ValueError:
+        moment = datetime.now()
+    return f"{moment.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _configured_retention(secret_key, default):
+    try:
+        return int(st.secrets.get(secret_key, default))
+    except Exception:
+        return default
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _get_store(name, text_key, secret_key, default_retention):
+    with _stores_lock:
+        if name not in _stores:
+            _stores[name] = EntryStore(name, text_key, _configured_retention(secret_key, default_retention))
+        return _stores[name]
+
+
+def get_debate_store():
+    return _get_store('debates', 'final_report', 'DEBATE_RETENTION', DEFAULT_DEBATE_RETENTION)
+
+
+def get_report_store():
+    return _get_store('reports', 'content', 'REPORT_RETENTION', DEFAULT_REPORT_RETENTION)
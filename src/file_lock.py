@@ -0,0 +1,72 @@
+"""
+프로세스 간 파일 잠금 모듈
+
+여러 Streamlit 서버 프로세스/레플리카가 같은 data/ 디렉토리의 파일을 읽고-수정하고-쓸 때
+O_EXCL로 만든 잠금 파일로 한 번에 한 프로세스만 갱신하도록 합니다.
+잠금 중 프로세스가 종료되어 남은 잠금 파일은 stale초가 지나면 강제로 해제합니다.
+잠금을 쥔 동안에는 잠금 파일의 수정 시각을 주기적으로 갱신하므로, stale초보다 오래 걸리는
+작업(느린 디스크에서의 정리 등)도 살아있는 동안에는 잠금을 빼앗기지 않습니다.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+# 잠금 파일이 이보다 오래되면 (잠금 중 프로세스 종료) 강제로 해제 (초)
+MUTEX_STALE = 10
+
+
+@contextmanager
+def file_lock(lock_path, wait=2.0, stale=MUTEX_STALE):
+    """
+    프로세스 간 잠금 (획득 여부를 yield)
+
+    Args:
+        lock_path: 잠금 파일 경로
+        wait: 최대 대기 시간 (초)
+        stale: 이보다 오래된 잠금 파일은 강제로 해제 (초)
+    """
+    deadline = time.monotonic() + wait
+    fd = None
+    while fd is None:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+
+    if fd is None:
+        yield False
+        return
+
+    released = threading.Event()
+
+    def refresh():
+        # stale의 1/3마다 수정 시각 갱신 (잠금 해제 전에 멈춤)
+        while not released.wait(stale / 3):
+            try:
+                os.utime(lock_path)
+            except OSError:
+                pass
+
+    refresher = threading.Thread(target=refresh, name="file-lock-refresh", daemon=True)
+    refresher.start()
+    try:
+        yield True
+    finally:
+        released.set()
+        refresher.join()
+        os.close(fd)
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
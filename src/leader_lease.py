@@ -0,0 +1,106 @@
+"""
+리더 임대(lease) 모듈
+
+여러 Streamlit 서버 프로세스/레플리카가 같은 data/ 디렉토리를 공유할 때
+한 프로세스만 스케줄러 작업(수집, 분석 등)을 실행하도록 리더를 선출합니다.
+- 리더는 임대 파일(data/scheduler_lease.json)에 주기적으로 heartbeat를 기록합니다.
+- heartbeat가 LEASE_TTL 동안 갱신되지 않으면 다른 프로세스가 리더를 넘겨받습니다.
+- 임대 파일의 읽기-수정-쓰기는 O_EXCL 잠금 파일로 보호합니다.
+"""
+
+import json
+import os
+import socket
+import time
+import uuid
+
+from src.file_lock import file_lock
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+LEASE_FILE = os.path.join(DATA_DIR, 'scheduler_lease.json')
+
+# heartbeat 기록 주기 (초)
+HEARTBEAT_INTERVAL = 10
+# 이 시간 동안 heartbeat가 없으면 리더가 죽은 것으로 보고 넘겨받음 (초)
+LEASE_TTL = 30
+
+
+class LeaderLease:
+    """임대 파일 기반 리더 선출"""
+
+    def __init__(self, path=LEASE_FILE, ttl=LEASE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.is_leader = False
+        self.last_heartbeat = 0.0
+
+    def _mutex(self, wait=2.0):
+        """임대 파일 갱신용 프로세스 간 잠금 (획득 여부를 yield)"""
+        return file_lock(f"{self.path}.lock", wait=wait)
+
+    def read(self):
+        """현재 임대 정보 (없으면 None)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, lease):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(lease, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def heartbeat(self):
+        """
+        임대를 획득하거나 갱신합니다.
+
+        다른 프로세스의 유효한 임대가 있으면 팔로워가 됩니다.
+
+        Returns:
+            리더 여부
+        """
+        with self._mutex() as locked:
+            if not locked:
+                # 잠금 경합: 상태를 바꾸지 않고 다음 heartbeat에서 재시도
+                return self.is_leader
+
+            now = time.time()
+            self.last_heartbeat = now
+            lease = self.read()
+            if lease and lease.get("owner") != self.owner and lease.get("expires_at", 0) > now:
+                if self.is_leader:
+                    print(f"Leader lease lost to {lease.get('owner')}")
+                self.is_leader = False
+                return False
+
+            acquired_at = lease.get("acquired_at", now) if lease and lease.get("owner") == self.owner else now
+            self._write({
+                "owner": self.owner,
+                "acquired_at": acquired_at,
+                "heartbeat_at": now,
+                "expires_at": now + self.ttl,
+            })
+            if not self.is_leader:
+                print(f"Leader lease acquired by {self.owner}")
+            self.is_leader = True
+            return True
+
+    def heartbeat_due(self):
+        """리더는 갱신, 팔로워는 인계 시도 시점인지"""
+        return time.time() - self.last_heartbeat >= HEARTBEAT_INTERVAL
+
+    def release(self):
+        """리더라면 임대를 반납하여 다른 프로세스가 즉시 넘겨받을 수 있게 합니다."""
+        with self._mutex() as locked:
+            lease = self.read()
+            if locked and lease and lease.get("owner") == self.owner:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+        self.is_leader = False
@@ -0,0 +1,183 @@
+"""
+실시간 뉴스 피드 모듈
+
+새로 저장된 뉴스와 새 리포트/토론 알림만 추가 전용 파일(data/live_feed.jsonl)에 한 줄씩 기록하고,
+연결된 클라이언트(대시보드 실시간 패널, snapshot_server.py의 SSE 스트림)는 커서 이후의 이벤트만 읽습니다.
+- 커서는 "<파일 세대>:<바이트 위치>" 문자열입니다. (세대는 파일 첫 줄의 임의 값)
+  재연결할 때 마지막 커서를 넘기면 그 이후 이벤트만 받으므로 전체 뉴스를 다시 읽지 않습니다.
+- 파일이 MAX_FEED_BYTES를 넘으면 최근 KEEP_EVENTS개만 남기고 새 파일로 교체합니다.
+  이전 파일의 커서는 무효가 되며, 이때는 최근 RESET_EVENTS개를 다시 보내고 reset으로 알립니다.
+파일로 기록하므로 스케줄러 리더가 다른 프로세스에 있어도 모든 프로세스에서 같은 피드를 볼 수 있습니다.
+"""
+
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+FEED_FILE = os.path.join(DATA_DIR, 'live_feed.jsonl')
+
+NEWS = "news"
+REPORT = "report"
+EPOCH = "epoch"  # 파일 첫 줄 (파일 세대 표시)
+
+# 파일 교체 기준 크기 / 교체 시 남길 이벤트 수
+MAX_FEED_BYTES = 2 * 1024 * 1024
+KEEP_EVENTS = 200
+# 커서가 없거나 무효일 때 보내는 최근 이벤트 수
+RESET_EVENTS = 20
+# 한 번에 읽을 최대 이벤트 수
+READ_LIMIT = 200
+# 뉴스 이벤트에 담는 필드
+NEWS_FIELDS = ("title", "link", "source", "category", "published", "fetched_at", "tickers")
+
+_write_lock = threading.Lock()
+
+
+def _format_cursor(epoch, offset):
+    return f"{epoch}:{offset}"
+
+
+def _parse_cursor(cursor):
+    try:
+        epoch, offset = cursor.split(":")
+        return epoch, int(offset)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _epoch_line():
+    return json.dumps({"type": EPOCH, "epoch": uuid.uuid4().hex[:12]}) + "\n"
+
+
+def _append(event_type, payload):
+    event = {"type": event_type, "at": datetime.now().isoformat(), "payload": payload}
+    line = json.dumps(event, ensure_ascii=False) + "\n"
+    with _write_lock:
+        try:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            with open(FEED_FILE, 'a', encoding='utf-8') as f:
+                if f.tell() == 0:
+                    f.write(_epoch_line())
+                f.write(line)
+            if os.path.getsize(FEED_FILE) > MAX_FEED_BYTES:
+                _rotate()
+        except OSError as e:
+            print(f"Live feed write error: {e}")
+
+
+def _rotate():
+    """최근 KEEP_EVENTS개만 남긴 새 세대 파일로 교체 (호출 전 _write_lock 필요)"""
+    with open(FEED_FILE, 'r', encoding='utf-8') as f:
+        lines = f.readlines()[1:][-KEEP_EVENTS:]
+    tmp_path = f"{FEED_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(_epoch_line())
+        f.writelines(lines)
+    os.replace(tmp_path, FEED_FILE)
+
+
+def publish_news(items):
+    """새로 저장된 뉴스 항목을 피드에 기록합니다."""
+    if items:
+        _append(NEWS, [{field: item.get(field) for field in NEWS_FIELDS} for item in items])
+
+
+def publish_report(kind, entry):
+    """
+    새 리포트/토론 알림을 피드에 기록합니다.
+
+    Args:
+        kind: "report" 또는 "debate"
+        entry: 저장한 리포트/토론 기록
+    """
+    _append(REPORT, {
+        "kind": kind,
+        "timestamp": entry.get("timestamp"),
+        "mode": entry.get("mode"),
+        "sectors": [
+            {"sector": s["sector"], "sentiment": s["sentiment"], "score": s["score"]}
+            for s in entry.get("sectors", [])
+        ],
+    })
+
+
+def _parse_lines(data, start_offset, epoch):
+    """완전한 줄만 이벤트로 변환. (이벤트 리스트, 마지막으로 읽은 위치)"""
+    events = []
+    offset = start_offset
+    for raw in data.splitlines(keepends=True):
+        if not raw.endswith(b"\n"):
+            break  # 쓰는 중인 줄은 다음에 읽음
+        offset += len(raw)
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            continue
+        if event.get("type") == EPOCH:
+            continue
+        event["id"] = _format_cursor(epoch, offset)
+        events.append(event)
+    return events, offset
+
+
+def _tail(f, size, epoch, count):
+    """파일 끝의 최근 이벤트 count개"""
+    start = max(0, size - 256 * 1024)
+    f.seek(start)
+    data = f.read(size - start)
+    if start > 0:
+        # 중간부터 읽었으면 첫 줄은 잘렸으므로 버림
+        cut = data.find(b"\n") + 1
+        data, start = data[cut:], start + cut
+    events, offset = _parse_lines(data, start, epoch)
+    return events[-count:], offset
+
+
+def read_since(cursor, limit=READ_LIMIT):
+    """
+    커서 이후의 이벤트를 읽습니다. 파일이 바뀌지 않았으면 stat 한 번으로 끝납니다.
+
+    Args:
+        cursor: 이전에 받은 커서 (None이면 최근 RESET_EVENTS개부터)
+        limit: 최대 이벤트 수
+
+    Returns:
+        (이벤트 리스트 [{id, type, at, payload}], 새 커서, reset 여부)
+    """
+    try:
+        size = os.path.getsize(FEED_FILE)
+    except OSError:
+        return [], cursor, False
+
+    position = _parse_cursor(cursor)
+    if position is not None and position[1] == size:
+        return [], cursor, False
+
+    try:
+        with open(FEED_FILE, 'rb') as f:
+            header = f.readline()
+            try:
+                epoch = json.loads(header)["epoch"]
+            except (ValueError, KeyError):
+                return [], cursor, False
+
+            if position is None or position[0] != epoch or position[1] > size:
+                # 처음 연결했거나 파일이 교체됨: 최근 이벤트부터 다시 시작
+                events, offset = _tail(f, size, epoch, RESET_EVENTS)
+                return events, _format_cursor(epoch, offset), cursor is not None
+
+            offset = position[1]
+            f.seek(offset)
+            data = f.read(size - offset)
+    except OSError:
+        return [], cursor, False
+
+    events, new_offset = _parse_lines(data, offset, epoch)
+    if len(events) > limit:
+        events = events[:limit]
+        new_offset = _parse_cursor(events[-1]["id"])[1]
+    return events, _format_cursor(epoch, new_offset), False
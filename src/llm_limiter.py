@@ -0,0 +1,97 @@
+"""
+LLM 호출 제한 모듈
+
+AIAnalyst, AIDebateEngine 등 프로세스 내 모든 Gemini 호출이 공유하는
+동시 실행 한도(세마포어)와 최소 호출 간격을 관리합니다.
+병렬로 실행되는 작업도 이 한도를 넘지 않도록 모든 호출은 `slot()` 안에서 수행하고,
+응답은 `usage.record()`로 사용량(호출 수/토큰)에 누적합니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+# 동시에 진행할 수 있는 최대 LLM 호출 수
+MAX_CONCURRENT_CALLS = 4
+# 연속된 호출 시작 사이의 최소 간격 (초)
+MIN_CALL_INTERVAL = 0.5
+
+
+class UsageMeter:
+    """LLM 호출 수와 토큰 사용량 누적 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+
+    def record(self, response):
+        """generate_content 응답의 usage_metadata를 누적합니다."""
+        usage = getattr(response, 'usage_metadata', None)
+        with self._lock:
+            self.calls += 1
+            if usage is not None:
+                self.prompt_tokens += usage.prompt_token_count or 0
+                self.output_tokens += usage.candidates_token_count or 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+            }
+
+    def since(self, before):
+        """snapshot() 이후 증가분"""
+        now = self.snapshot()
+        return {key: now[key] - before.get(key, 0) for key in now}
+
+
+class LLMRateLimiter:
+    """프로세스 전역 LLM 호출 제한기 (싱글톤)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(LLMRateLimiter, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.max_concurrent = MAX_CONCURRENT_CALLS
+        self.min_interval = MIN_CALL_INTERVAL
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrent)
+        self._pace_lock = threading.Lock()
+        self._next_start = 0.0
+        # 프로세스 전체 사용량
+        self.usage = UsageMeter()
+
+    @contextmanager
+    def slot(self):
+        """동시 실행 한도와 호출 간격을 지키며 LLM 호출 구간을 감쌉니다."""
+        self._semaphore.acquire()
+        try:
+            with self._pace_lock:
+                now = time.monotonic()
+                wait = self._next_start - now
+                self._next_start = max(now, self._next_start) + self.min_interval
+            if wait > 0:
+                time.sleep(wait)
+            yield
+        finally:
+            self._semaphore.release()
+
+
+def get_llm_limiter():
+    return LLMRateLimiter()
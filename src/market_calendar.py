@@ -0,0 +1,148 @@
+"""
+KRX 시장 달력 모듈
+
+로컬 휴장일 파일(data/krx_calendar.json)과 장 운영 시간대(세션)를 기준으로
+스케줄러의 수집 주기와 분석 허용 여부를 결정합니다. (모든 시각은 KST)
+- 거래일 07:00~16:00: 짧은 주기로 수집
+- 거래일 저녁/야간: 드문 주기로 수집
+- 휴장일(주말/공휴일): 드문 주기로 수집, 속보 폭주가 아니면 LLM 분석 안 함
+"""
+
+import json
+import os
+from datetime import datetime, time, timedelta, timezone
+
+
+KST = timezone(timedelta(hours=9))
+CALENDAR_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'krx_calendar.json')
+
+# 거래일 세션: (이름, 표시 이름, 시작, 끝 - None이면 자정)
+SESSIONS = [
+    ("overnight", "새벽", time(0, 0), time(7, 0)),
+    ("premarket", "장 시작 전", time(7, 0), time(9, 0)),
+    ("regular", "정규장", time(9, 0), time(15, 30)),
+    ("post_market", "장 마감 후", time(15, 30), time(16, 0)),
+    ("evening", "저녁", time(16, 0), time(22, 0)),
+    ("night", "야간", time(22, 0), None),
+]
+CLOSED_SESSION = "closed"
+
+# 세션별 정책: 수집 주기(초), 분석 방식 ("event": 트리거 조건 충족 시, "burst_only": 속보 폭주/중요 기사만)
+SESSION_POLICIES = {
+    "overnight": {"crawl_interval": 1800, "analysis": "event"},
+    "premarket": {"crawl_interval": 300, "analysis": "event"},
+    "regular": {"crawl_interval": 300, "analysis": "event"},
+    "post_market": {"crawl_interval": 300, "analysis": "event"},
+    "evening": {"crawl_interval": 900, "analysis": "event"},
+    "night": {"crawl_interval": 1800, "analysis": "event"},
+    CLOSED_SESSION: {"crawl_interval": 1800, "analysis": "burst_only"},
+}
+SESSION_LABELS = {name: label for name, label, _, _ in SESSIONS}
+SESSION_LABELS[CLOSED_SESSION] = "휴장일"
+ANALYSIS_LABELS = {"event": "이벤트 기반", "burst_only": "속보 폭주 시에만"}
+
+# 세션 경계에 맞춰 깨어나기 위한 최소 주기 (초)
+MIN_INTERVAL = 60
+
+_holidays = None
+
+
+def now_kst():
+    return datetime.now(KST)
+
+
+def load_holidays():
+    """{날짜 문자열: 휴장 사유} (파일이 없으면 주말만 휴장으로 봄)"""
+    global _holidays
+    if _holidays is None:
+        try:
+            with open(CALENDAR_FILE, 'r', encoding='utf-8') as f:
+                _holidays = json.load(f).get("holidays", {})
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"KRX calendar not loaded ({e}), treating only weekends as closed")
+            _holidays = {}
+    return _holidays
+
+
+def holiday_name(day):
+    """휴장 사유 (거래일이면 None)"""
+    if day.weekday() >= 5:
+        return "주말"
+    return load_holidays().get(day.isoformat())
+
+
+def is_trading_day(day):
+    return holiday_name(day) is None
+
+
+def next_trading_day(day):
+    day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def session_at(moment=None):
+    """
+    시각이 속한 세션
+
+    Returns:
+        (세션 이름, 세션 종료 시각 - 다음 세션 판정 시점)
+    """
+    moment = moment or now_kst()
+    day = moment.date()
+    midnight = datetime.combine(day + timedelta(days=1), time(0, 0), tzinfo=KST)
+
+    if not is_trading_day(day):
+        return CLOSED_SESSION, midnight
+
+    for name, _, start, end in SESSIONS:
+        if end is None:
+            return name, midnight
+        if start <= moment.time() < end:
+            return name, datetime.combine(day, end, tzinfo=KST)
+
+
+def crawl_interval(moment=None):
+    """현재 세션의 수집 주기 (다음 세션 경계를 넘지 않도록 줄임)"""
+    moment = moment or now_kst()
+    session, boundary = session_at(moment)
+    interval = SESSION_POLICIES[session]["crawl_interval"]
+    until_boundary = (boundary - moment).total_seconds()
+    return max(MIN_INTERVAL, min(interval, int(until_boundary) + 1))
+
+
+def analysis_policy(moment=None):
+    """현재 세션의 분석 방식 ("event" 또는 "burst_only")"""
+    session, _ = session_at(moment)
+    return SESSION_POLICIES[session]["analysis"]
+
+
+def describe_schedule(day=None):
+    """
+    관리자 화면용 하루 일정
+
+    Returns:
+        [{세션, 시간, 수집 주기, 분석}, ...]
+    """
+    day = day or now_kst().date()
+    if not is_trading_day(day):
+        policy = SESSION_POLICIES[CLOSED_SESSION]
+        return [{
+            "세션": f"휴장일 ({holiday_name(day)})",
+            "시간": "00:00~24:00",
+            "수집 주기": f"{policy['crawl_interval'] // 60}분",
+            "분석": ANALYSIS_LABELS[policy["analysis"]],
+        }]
+
+    rows = []
+    for name, label, start, end in SESSIONS:
+        policy = SESSION_POLICIES[name]
+        end_text = end.strftime('%H:%M') if end else "24:00"
+        rows.append({
+            "세션": label,
+            "시간": f"{start.strftime('%H:%M')}~{end_text}",
+            "수집 주기": f"{policy['crawl_interval'] // 60}분",
+            "분석": ANALYSIS_LABELS[policy["analysis"]],
+        })
+    return rows
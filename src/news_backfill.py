@@ -0,0 +1,257 @@
+"""
+과거 뉴스 백필 모듈
+
+스케줄러는 시작한 시점 이후의 뉴스만 수집하므로, 네이버 금융 목록 페이지의
+date/page 파라미터(SOURCES의 backfill_url)를 날짜 범위에 걸쳐 순회하여 과거 뉴스를 채웁니다.
+- 작업 단위는 (소스, 날짜)이며 최근 날짜부터 처리합니다.
+- 단위 작업은 최대 concurrency개까지 동시에 실행하고, 요청 간격은 전체 요청에 걸쳐
+  request_interval초 이상으로 유지합니다. (서버 부하 방지)
+- HTML 파싱은 프로세스 풀에서 실행하여 대량 백필이 GIL에 묶이지 않도록 합니다.
+- (소스, 날짜)의 페이지를 모두 모은 뒤 한 번에 일반 수집과 같은 경로(DataManager.ingest_news)로
+  중복 제거/저장하고 (과거 뉴스이므로 분석 트리거/실시간 피드 이벤트는 발행하지 않음),
+  진행 상황을 data/backfill_checkpoint.json에 기록하여 중단 후 이어서 실행할 수 있습니다.
+
+news.json 저장은 프로세스 간 잠금 안에서 하므로 스케줄러가 실행 중이어도 함께 실행할 수 있습니다.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import requests
+
+from src.crawl_pipeline import RequestPacer
+from src.data_manager import DataManager
+from src.news_crawler import SOURCES, NewsCrawler, SourceFetchError, canonical_link, parse_payload
+
+
+CHECKPOINT_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'backfill_checkpoint.json')
+
+# 동시에 처리할 (소스, 날짜) 단위 수
+MAX_CONCURRENCY = 3
+# 전체 요청 사이 최소 간격 (초)
+REQUEST_INTERVAL = 0.5
+# 하루에 최대 몇 페이지까지 볼지 (마지막 페이지 판정이 실패해도 멈추도록)
+MAX_PAGES_PER_DAY = 50
+# 페이지 요청 재시도 횟수 / 재시도 대기 시간 (초, 시도마다 두 배)
+MAX_RETRIES = 3
+RETRY_DELAY = 2
+# 목록 페이지 하나에서 파싱할 최대 기사 수
+PAGE_MAX_ITEMS = 100
+# 파싱 프로세스 수 (0이면 프로세스 풀 없이 현재 프로세스에서 파싱)
+DEFAULT_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def backfill_sources():
+    """과거 목록 URL(backfill_url)을 지원하는 소스 ID 목록"""
+    return [source_id for source_id, source in SOURCES.items() if source.get("backfill_url")]
+
+
+def _published_at(published, day):
+    """목록의 게시 시각을 fetched_at 값으로 변환 (정렬/보관 기준을 게시 시각에 맞춤)"""
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y.%m.%d %H:%M'):
+        try:
+            return datetime.strptime(published, fmt).isoformat()
+        except ValueError:
+            continue
+    return datetime.combine(day, datetime.min.time()).isoformat()
+
+
+def _page_signature(items):
+    """페이지 구성 지문 (범위를 넘는 page 요청에 마지막 페이지가 반복되는지 확인용)"""
+    return sorted(canonical_link(item['link']) for item in items)
+
+
+class NewsBackfill:
+    """날짜 범위의 과거 뉴스 목록을 순회하여 저장합니다."""
+
+    def __init__(self, start, end, source_ids=None, concurrency=MAX_CONCURRENCY,
+                 parse_workers=DEFAULT_PARSE_WORKERS, request_interval=REQUEST_INTERVAL,
+                 max_pages=MAX_PAGES_PER_DAY, data_manager=None, checkpoint_file=CHECKPOINT_FILE):
+        """
+        Args:
+            start: 시작 날짜 (date, 포함)
+            end: 끝 날짜 (date, 포함)
+            source_ids: 백필할 소스 ID 리스트 (기본값: backfill_url이 있는 전체 소스)
+            concurrency: 동시에 처리할 (소스, 날짜) 단위 수
+            parse_workers: 파싱 프로세스 수 (0이면 현재 프로세스에서 파싱)
+            request_interval: 전체 요청 사이 최소 간격 (초)
+            max_pages: 날짜당 최대 페이지 수
+            data_manager: 저장에 사용할 DataManager (기본값: 새 인스턴스)
+            checkpoint_file: 진행 상황 파일 경로
+        """
+        if start > end:
+            raise ValueError("start must not be after end")
+        unsupported = [sid for sid in source_ids or [] if sid not in backfill_sources()]
+        if unsupported:
+            raise ValueError(f"Backfill not supported for: {', '.join(unsupported)}")
+
+        self.start = start
+        self.end = end
+        self.source_ids = source_ids or backfill_sources()
+        self.concurrency = max(1, concurrency)
+        self.parse_workers = parse_workers
+        self.max_pages = max_pages
+        self.dm = data_manager or DataManager()
+        self.checkpoint_file = checkpoint_file
+        self.headers = NewsCrawler().headers
+        self._pacer = RequestPacer(request_interval)
+        self._checkpoint_lock = threading.Lock()
+        self.checkpoint = self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"units": {}}
+
+    def _save_checkpoint(self):
+        """진행 상황 저장 (호출 전 _checkpoint_lock 필요)"""
+        self.checkpoint["updated_at"] = datetime.now().isoformat()
+        tmp_path = f"{self.checkpoint_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_file)
+
+    def reset(self):
+        """진행 상황을 지우고 처음부터 다시 실행하도록 합니다."""
+        with self._checkpoint_lock:
+            self.checkpoint = {"units": {}}
+            self._save_checkpoint()
+
+    def units(self):
+        """처리할 (소스 ID, 날짜) 목록 (최근 날짜부터, 완료된 단위 제외)"""
+        pending = []
+        day = self.end
+        while day >= self.start:
+            for source_id in self.source_ids:
+                state = self.checkpoint["units"].get(f"{source_id}:{day.isoformat()}")
+                if not state or not state.get("done"):
+                    pending.append((source_id, day))
+            day -= timedelta(days=1)
+        return pending
+
+    def _update_unit(self, key, **changes):
+        with self._checkpoint_lock:
+            state = self.checkpoint["units"].setdefault(key, {
+                "page": 0, "done": False, "fetched": 0, "new": 0, "signature": None,
+            })
+            state.update(changes)
+            self._save_checkpoint()
+            return dict(state)
+
+    def _fetch_page(self, source_id, day, page):
+        """
+        목록 페이지 하나를 요청합니다. (재시도 후에도 실패하면 예외)
+
+        Returns:
+            (원본 바이트, 인코딩) - 디코딩은 파싱 프로세스에서 함
+        """
+        source = SOURCES[source_id]
+        url = source["backfill_url"].format(
+            date=day.isoformat(), compact_date=day.strftime('%Y%m%d'), page=page,
+        )
+        for attempt in range(MAX_RETRIES):
+            self._pacer.wait()
+            try:
+                response = requests.get(url, headers=self.headers, timeout=10)
+                if response.status_code != 200:
+                    raise SourceFetchError(f"HTTP {response.status_code}")
+                return response.content, source["encoding"] or response.encoding
+            except (requests.RequestException, SourceFetchError) as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise SourceFetchError(f"{url}: {e}") from e
+                time.sleep(RETRY_DELAY * 2 ** attempt)
+
+    def _parse(self, parse_pool, source, content, encoding):
+        args = (source["parser"], content, encoding, source, PAGE_MAX_ITEMS)
+        if parse_pool is None:
+            return parse_payload(*args)
+        return parse_pool.submit(parse_payload, *args).result()
+
+    def _run_unit(self, source_id, day, parse_pool):
+        """
+        (소스, 날짜) 하나의 페이지를 차례로 수집합니다.
+
+        빈 페이지가 나오거나 직전 페이지와 같은 구성이 반복되면(범위를 넘는 page 요청) 끝내고,
+        모은 기사를 한 번에 저장합니다. (저장 전에 중단되면 다음 실행에서 이 단위를 다시 수집)
+
+        Returns:
+            {"pages", "fetched", "new"} (이번 실행에서 처리한 양)
+        """
+        source = SOURCES[source_id]
+        key = f"{source_id}:{day.isoformat()}"
+        state = self._update_unit(key, error=None)
+        done = {"pages": 0, "fetched": 0, "new": 0}
+
+        page = state["page"] + 1
+        signature = state["signature"]
+        collected = []
+        while page <= self.max_pages:
+            content, encoding = self._fetch_page(source_id, day, page)
+            items = self._parse(parse_pool, source, content, encoding)
+            page_signature = _page_signature(items)
+            if not items or page_signature == signature:
+                break
+
+            for item in items:
+                item['fetched_at'] = _published_at(item.get('published', ''), day)
+            collected.extend(items)
+            signature = page_signature
+            done["pages"] += 1
+            page += 1
+
+        new_items = self.dm.ingest_news(collected, publish=False) if collected else []
+        done["fetched"] = len(collected)
+        done["new"] = len(new_items)
+        state = self._update_unit(
+            key, page=page - 1, signature=signature, done=True,
+            fetched=state["fetched"] + done["fetched"], new=state["new"] + done["new"],
+        )
+        print(f"[backfill] {source['label']} {day.isoformat()}: "
+              f"{state['page']}페이지, 새 뉴스 {state['new']}개")
+        return done
+
+    def run(self):
+        """
+        백필을 실행합니다. 실패한 단위는 체크포인트에 남아 다음 실행에서 이어서 처리됩니다.
+
+        Returns:
+            {"units", "completed", "failed", "pages", "fetched", "new", "elapsed_sec", "pages_per_sec"}
+        """
+        units = self.units()
+        summary = {"units": len(units), "completed": 0, "failed": 0, "pages": 0, "fetched": 0, "new": 0}
+        started = time.time()
+        print(f"[backfill] {self.start} ~ {self.end}, {len(self.source_ids)}개 소스: "
+              f"남은 작업 {len(units)}개 (동시 {self.concurrency}, 파싱 프로세스 {self.parse_workers})")
+
+        parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers) if self.parse_workers > 0 else None
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = {
+                    executor.submit(self._run_unit, source_id, day, parse_pool): (source_id, day)
+                    for source_id, day in units
+                }
+                for future in as_completed(futures):
+                    source_id, day = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        summary["failed"] += 1
+                        self._update_unit(f"{source_id}:{day.isoformat()}", error=str(e)[:200])
+                        print(f"[backfill] {source_id} {day.isoformat()} 실패: {e}")
+                        continue
+                    summary["completed"] += 1
+                    for field in ("pages", "fetched", "new"):
+                        summary[field] += result[field]
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown()
+
+        summary["elapsed_sec"] = round(time.time() - started, 1)
+        summary["pages_per_sec"] = round(summary["pages"] / max(summary["elapsed_sec"], 0.1), 2)
+        return summary
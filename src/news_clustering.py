@@ -0,0 +1,104 @@
+"""
+뉴스 토픽 클러스터링 모듈
+
+LLM 없이 로컬에서 뉴스 제목/요약을 주제별로 묶습니다.
+단어 단위 문자 바이그램(조사가 붙은 한국어 단어도 매칭되도록) 집합의 자카드 유사도를 쓰고,
+바이그램 역색인으로 후보 클러스터만 비교하므로 수천 건도 거의 선형 시간에 처리합니다.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+
+
+# 같은 주제로 볼 최소 자카드 유사도
+SIMILARITY_THRESHOLD = 0.3
+# 전체 기사 중 이 비율(및 최소 건수)을 넘게 등장하는 바이그램은 상투어로 보고 제외
+COMMON_GRAM_RATIO = 0.05
+COMMON_GRAM_MIN_COUNT = 10
+
+# 제목 앞의 [속보], (종합) 같은 말머리와 특수문자 제거용
+_TAG_PATTERN = re.compile(r'[\[\(【<][^\]\)】>]{0,10}[\]\)】>]')
+_NON_WORD_PATTERN = re.compile(r'[^0-9A-Za-z가-힣]+')
+
+
+def title_signature(text):
+    """제목 텍스트를 바이그램 집합으로 변환합니다."""
+    text = _TAG_PATTERN.sub(' ', text or '')
+    grams = set()
+    for word in _NON_WORD_PATTERN.split(text.lower()):
+        if len(word) < 2:
+            continue
+        for i in range(len(word) - 1):
+            grams.add(word[i:i + 2])
+    return grams
+
+
+def cluster_news(news_items, threshold=SIMILARITY_THRESHOLD):
+    """
+    뉴스를 주제별 클러스터로 묶습니다.
+
+    Args:
+        news_items: 뉴스 항목 리스트
+        threshold: 같은 클러스터로 묶을 최소 유사도
+
+    Returns:
+        클러스터 리스트 [{key, items, latest}, ...] (크기, 최신순 정렬)
+        각 클러스터의 items는 최신순이며 첫 항목이 대표 기사입니다.
+    """
+    sorted_news = sorted(news_items, key=lambda x: x.get('fetched_at', ''), reverse=True)
+    signatures = [title_signature(item.get('title', '')) for item in sorted_news]
+
+    # 너무 흔한 바이그램(언론사명 등 상투어)은 주제 구분에 도움이 안 되므로 제외
+    doc_freq = defaultdict(int)
+    for signature in signatures:
+        for gram in signature:
+            doc_freq[gram] += 1
+    max_freq = max(COMMON_GRAM_MIN_COUNT, len(sorted_news) * COMMON_GRAM_RATIO)
+    common = {gram for gram, count in doc_freq.items() if count > max_freq}
+
+    clusters = []          # [{signature, items}]
+    index = defaultdict(list)  # bigram -> cluster 번호
+
+    for item, signature in zip(sorted_news, signatures):
+        signature = signature - common
+        if not signature:
+            continue
+
+        # 바이그램을 공유하는 클러스터만 후보로 비교
+        overlap = defaultdict(int)
+        for gram in signature:
+            for cluster_no in index[gram]:
+                overlap[cluster_no] += 1
+
+        best_no, best_score = None, 0.0
+        for cluster_no, shared in overlap.items():
+            seed = clusters[cluster_no]['signature']
+            score = shared / (len(signature) + len(seed) - shared)
+            if score > best_score:
+                best_no, best_score = cluster_no, score
+
+        if best_no is not None and best_score >= threshold:
+            clusters[best_no]['items'].append(item)
+        else:
+            clusters.append({'signature': signature, 'items': [item]})
+            for gram in signature:
+                index[gram].append(len(clusters) - 1)
+
+    result = []
+    for cluster in clusters:
+        items = cluster['items']
+        result.append({
+            'key': cluster_key(items),
+            'items': items,
+            'latest': items[0].get('fetched_at', ''),
+        })
+
+    result.sort(key=lambda c: (len(c['items']), c['latest']), reverse=True)
+    return result
+
+
+def cluster_key(items):
+    """클러스터 구성 기사(링크) 기준의 고유 키"""
+    links = sorted(item.get('link', item.get('title', '')) for item in items)
+    return hashlib.sha1('\n'.join(links).encode('utf-8')).hexdigest()[:16]
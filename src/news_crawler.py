@@ -9,7 +9,290 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import time
-import re
+from urllib.parse import parse_qs, urlparse
+
+from src.crawl_pipeline import get_crawl_pipeline
+from src.source_health import get_source_health
+
+
+def canonical_link(link):
+    """
+    중복 판정용 링크 키
+
+    네이버 금융 기사는 같은 기사라도 목록(mode/date/page)에 따라 링크가 달라지므로
+    article_id와 office_id만 남깁니다. 그 외 링크는 그대로 반환합니다.
+    """
+    if 'finance.naver.com/news/news_read' not in link:
+        return link
+    query = parse_qs(urlparse(link).query)
+    if 'article_id' not in query or 'office_id' not in query:
+        return link
+    return f"naver:{query['office_id'][0]}:{query['article_id'][0]}"
+
+
+def _absolute_naver_link(href):
+    """네이버 금융 상대 경로를 절대 경로로 변환 (변환할 수 없으면 None)"""
+    if href.startswith('/'):
+        return f"https://finance.naver.com{href}"
+    if href.startswith('http'):
+        return href
+    return None
+
+
+def parse_naver_list(html, source, max_items):
+    """
+    네이버 금융 뉴스 목록(시장/종목/공시) 페이지를 파싱합니다.
+    
+    Args:
+        html: 페이지 HTML
+        source: SOURCES 항목 (category 사용)
+        max_items: 최대 수집할 뉴스 개수
+        
+    Returns:
+        뉴스 항목 리스트 [{title, link, summary, published, source, category, fetched_at}, ...]
+    """
+    news_items = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 뉴스 리스트 파싱
+    news_list = soup.select('li.newsList, ul.newsList li, dd')
+    
+    for item in news_list:
+        if len(news_items) >= max_items:
+            break
+            
+        # 제목과 링크 추출
+        link_tag = item.select_one('a')
+        if not link_tag:
+            continue
+        
+        title = link_tag.get_text(strip=True)
+        if not title or len(title) < 5:  # 너무 짧은 제목은 건너뜀
+            continue
+        
+        link = _absolute_naver_link(link_tag.get('href', ''))
+        if not link:
+            continue
+        
+        # 날짜 추출 (있는 경우)
+        date_tag = item.select_one('.wdate, .date, span.gray03')
+        published = date_tag.get_text(strip=True) if date_tag else datetime.now().strftime('%Y-%m-%d %H:%M')
+        
+        # 요약 추출 (있는 경우)
+        summary_tag = item.select_one('.lead, p')
+        summary = summary_tag.get_text(strip=True) if summary_tag else ''
+        
+        news_items.append({
+            'title': title,
+            'link': link,
+            'summary': summary[:200] if summary else '',
+            'published': published,
+            'source': '네이버 금융',
+            'category': source['category'],
+            'fetched_at': datetime.now().isoformat()
+        })
+    
+    return news_items
+
+
+def parse_naver_main(html, source, max_items):
+    """네이버 금융 메인 뉴스 (시황/전망) 페이지를 파싱합니다."""
+    news_items = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 메인 뉴스 영역 파싱
+    articles = soup.select('.mainNewsList li, .news_list li')
+    
+    for article in articles[:max_items]:
+        link_tag = article.select_one('a')
+        if not link_tag:
+            continue
+        
+        title = link_tag.get_text(strip=True)
+        link = _absolute_naver_link(link_tag.get('href', ''))
+        if not link:
+            continue
+        
+        if not title or len(title) < 5:
+            continue
+        
+        # 날짜 추출
+        date_tag = article.select_one('.wdate, .date')
+        published = date_tag.get_text(strip=True) if date_tag else datetime.now().strftime('%Y-%m-%d %H:%M')
+        
+        news_items.append({
+            'title': title,
+            'link': link,
+            'summary': '',
+            'published': published,
+            'source': '네이버 금융',
+            'category': source['category'],
+            'fetched_at': datetime.now().isoformat()
+        })
+    
+    return news_items
+
+
+def parse_daum(html, source, max_items):
+    """다음 금융 뉴스 페이지를 파싱합니다."""
+    news_items = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 뉴스 리스트 파싱
+    articles = soup.select('.newsWrap li, article')
+    
+    for article in articles[:max_items]:
+        link_tag = article.select_one('a')
+        if not link_tag:
+            continue
+        
+        title = link_tag.get_text(strip=True)
+        link = link_tag.get('href', '')
+        
+        if not link.startswith('http'):
+            link = f"https://finance.daum.net{link}"
+        
+        if not title or len(title) < 5:
+            continue
+        
+        news_items.append({
+            'title': title,
+            'link': link,
+            'summary': '',
+            'published': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'source': '다음 금융',
+            'category': source['category'],
+            'fetched_at': datetime.now().isoformat()
+        })
+    
+    return news_items
+
+
+def parse_hankyung(html, source, max_items):
+    """한국경제 증권 뉴스 페이지를 파싱합니다."""
+    news_items = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 뉴스 리스트 파싱
+    articles = soup.select('.news-list li, article.news-item, .article-list li')
+    
+    for article in articles[:max_items]:
+        link_tag = article.select_one('a')
+        if not link_tag:
+            continue
+        
+        title_tag = article.select_one('h3, .news-tit, .tit')
+        title = title_tag.get_text(strip=True) if title_tag else link_tag.get_text(strip=True)
+        link = link_tag.get('href', '')
+        
+        if not link.startswith('http'):
+            link = f"https://www.hankyung.com{link}"
+        
+        if not title or len(title) < 5:
+            continue
+        
+        news_items.append({
+            'title': title,
+            'link': link,
+            'summary': '',
+            'published': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'source': '한국경제',
+            'category': source['category'],
+            'fetched_at': datetime.now().isoformat()
+        })
+    
+    return news_items
+
+
+# 파서 이름 -> 파싱 함수 (모듈 수준 함수이므로 다른 프로세스로도 넘길 수 있음)
+PARSERS = {
+    "naver_list": parse_naver_list,
+    "naver_main": parse_naver_main,
+    "daum": parse_daum,
+    "hankyung": parse_hankyung,
+}
+
+
+def parse_html(parser_name, html, source, max_items):
+    """파서 이름으로 파싱합니다. (프로세스 풀에서 실행할 수 있는 진입점)"""
+    return PARSERS[parser_name](html, source, max_items)
+
+
+def parse_payload(parser_name, content, encoding, source, max_items):
+    """원본 바이트를 디코딩하여 파싱합니다. (fetch 단계가 넘긴 응답을 파싱 프로세스에서 처리)"""
+    html = content.decode(encoding or 'utf-8', errors='replace')
+    return parse_html(parser_name, html, source, max_items)
+
+
+# 뉴스 소스 목록: 소스 ID -> {label, url, encoding, parser, category, max_items, enabled, [backfill_url]}
+SOURCES = {
+    "naver_market": {
+        "label": "네이버 금융 - 시장",
+        "url": 'https://finance.naver.com/news/mainnews.naver',
+        "encoding": 'euc-kr',  # 네이버 금융은 EUC-KR 인코딩 사용
+        "parser": "naver_list",
+        "category": '시장',
+        "max_items": 20,
+        "enabled": True,
+        # 과거 뉴스 수집용 목록 URL ({date}: YYYY-MM-DD, {compact_date}: YYYYMMDD)
+        "backfill_url": 'https://finance.naver.com/news/mainnews.naver?date={date}&page={page}',
+    },
+    "naver_stock": {
+        "label": "네이버 금융 - 종목",
+        "url": 'https://finance.naver.com/news/news_list.naver?mode=LSS2D&section_id=101&section_id2=258',
+        "encoding": 'euc-kr',
+        "parser": "naver_list",
+        "category": '종목',
+        "max_items": 20,
+        "enabled": True,
+        "backfill_url": 'https://finance.naver.com/news/news_list.naver?mode=LSS2D&section_id=101&section_id2=258&date={compact_date}&page={page}',
+    },
+    "naver_disclosure": {
+        "label": "네이버 금융 - 공시",
+        "url": 'https://finance.naver.com/news/news_list.naver?mode=LSS2D&section_id=101&section_id2=259',
+        "encoding": 'euc-kr',
+        "parser": "naver_list",
+        "category": '공시',
+        "max_items": 20,
+        "enabled": True,
+        "backfill_url": 'https://finance.naver.com/news/news_list.naver?mode=LSS2D&section_id=101&section_id2=259&date={compact_date}&page={page}',
+    },
+    "naver_main": {
+        "label": "네이버 금융 - 메인 시황",
+        "url": 'https://finance.naver.com/news/mainnews.naver',
+        "encoding": 'euc-kr',
+        "parser": "naver_main",
+        "category": '시황',
+        "max_items": 15,
+        "enabled": True,
+    },
+    "hankyung": {
+        "label": "한국경제 - 증권",
+        "url": 'https://www.hankyung.com/finance/stock',
+        "encoding": None,
+        "parser": "hankyung",
+        "category": '증권',
+        "max_items": 15,
+        "enabled": True,
+    },
+    "daum": {
+        "label": "다음 금융 - 경제",
+        "url": 'https://finance.daum.net/news/category/economic',
+        "encoding": None,
+        "parser": "daum",
+        "category": '경제',
+        "max_items": 20,
+        "enabled": False,  # 페이지가 스크립트로 렌더링되어 현재 수집되지 않음
+    },
+}
+
+
+class SourceFetchError(Exception):
+    """소스 페이지 요청 실패"""
+
+
+def enabled_sources():
+    return [source_id for source_id, source in SOURCES.items() if source["enabled"]]
 
 
 class NewsCrawler:
@@ -25,293 +308,165 @@ class NewsCrawler:
         # 요청 간 딜레이 (서버 부하 방지)
         self.request_delay = 1
     
-    def fetch_naver_finance_news(self, max_items=30):
+    def _download(self, source_id, max_items):
         """
-        네이버 금융 뉴스를 크롤링합니다.
-        
-        Args:
-            max_items: 최대 수집할 뉴스 개수
-            
+        fetch 단계: 소스 페이지를 요청합니다. (실패 시 예외)
+
         Returns:
-            뉴스 항목 리스트 [{title, link, summary, published, source, category}, ...]
+            parse_payload 인자 튜플 (파서 이름, 원본 바이트, 인코딩, 소스 설정, 최대 개수)
         """
-        news_items = []
-        
-        # 네이버 금융 뉴스 카테고리별 URL
-        categories = {
-            '시장': 'https://finance.naver.com/news/mainnews.naver',
-            '종목': 'https://finance.naver.com/news/news_list.naver?mode=LSS2D&section_id=101&section_id2=258',
-            '공시': 'https://finance.naver.com/news/news_list.naver?mode=LSS2D&section_id=101&section_id2=259',
-        }
+        source = SOURCES[source_id]
+        get_crawl_pipeline().pace(source["url"])
+        response = requests.get(source["url"], headers=self.headers, timeout=10)
         
-        for category_name, url in categories.items():
-            try:
-                response = requests.get(url, headers=self.headers, timeout=10)
-                response.encoding = 'euc-kr'  # 네이버 금융은 EUC-KR 인코딩 사용
-                
-                if response.status_code != 200:
-                    print(f"Warning: {category_name} 페이지 요청 실패 (status: {response.status_code})")
-                    continue
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 뉴스 리스트 파싱
-                news_list = soup.select('li.newsList, ul.newsList li, dd')
-                
-                for item in news_list:
-                    if len(news_items) >= max_items:
-                        break
-                        
-                    # 제목과 링크 추출
-                    link_tag = item.select_one('a')
-                    if not link_tag:
-                        continue
-                    
-                    title = link_tag.get_text(strip=True)
-                    if not title or len(title) < 5:  # 너무 짧은 제목은 건너뜀
-                        continue
-                    
-                    href = link_tag.get('href', '')
-                    
-                    # 상대 경로를 절대 경로로 변환
-                    if href.startswith('/'):
-                        link = f"https://finance.naver.com{href}"
-                    elif href.startswith('http'):
-                        link = href
-                    else:
-                        continue
-                    
-                    # 날짜 추출 (있는 경우)
-                    date_tag = item.select_one('.wdate, .date, span.gray03')
-                    published = date_tag.get_text(strip=True) if date_tag else datetime.now().strftime('%Y-%m-%d %H:%M')
-                    
-                    # 요약 추출 (있는 경우)
-                    summary_tag = item.select_one('.lead, p')
-                    summary = summary_tag.get_text(strip=True) if summary_tag else ''
-                    
-                    news_items.append({
-                        'title': title,
-                        'link': link,
-                        'summary': summary[:200] if summary else '',
-                        'published': published,
-                        'source': '네이버 금융',
-                        'category': category_name,
-                        'fetched_at': datetime.now().isoformat()
-                    })
-                
-                time.sleep(self.request_delay)  # 서버 부하 방지
-                
-            except Exception as e:
-                print(f"Error crawling {category_name}: {e}")
-                continue
+        if response.status_code != 200:
+            raise SourceFetchError(f"HTTP {response.status_code}")
         
-        return news_items
+        # 소스에 지정한 인코딩이 없으면 응답 헤더의 인코딩 사용 (response.text와 같은 기준)
+        encoding = source["encoding"] or response.encoding
+        return source["parser"], response.content, encoding, source, max_items
     
-    def fetch_naver_main_news(self, max_items=20):
+    def _fetch(self, source_id, max_items):
+        """소스 하나를 요청/파싱합니다. (실패 시 예외)"""
+        return parse_payload(*self._download(source_id, max_items))
+    
+    def fetch_source(self, source_id, max_items=None):
         """
-        네이버 금융 메인 뉴스 (시황/전망)를 크롤링합니다.
+        등록된 소스 하나를 크롤링합니다.
         
         Args:
-            max_items: 최대 수집할 뉴스 개수
+            source_id: SOURCES의 소스 ID
+            max_items: 최대 수집할 뉴스 개수 (기본값: 소스 설정)
             
         Returns:
-            뉴스 항목 리스트
+            뉴스 항목 리스트 (실패 시 빈 리스트)
         """
-        news_items = []
-        url = 'https://finance.naver.com/news/mainnews.naver'
-        
+        source = SOURCES[source_id]
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.encoding = 'euc-kr'
-            
-            if response.status_code != 200:
-                print(f"Warning: 메인 뉴스 페이지 요청 실패")
-                return news_items
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 메인 뉴스 영역 파싱
-            articles = soup.select('.mainNewsList li, .news_list li')
-            
-            for article in articles[:max_items]:
-                link_tag = article.select_one('a')
-                if not link_tag:
-                    continue
-                
-                title = link_tag.get_text(strip=True)
-                href = link_tag.get('href', '')
-                
-                if href.startswith('/'):
-                    link = f"https://finance.naver.com{href}"
-                elif href.startswith('http'):
-                    link = href
-                else:
-                    continue
-                
-                if not title or len(title) < 5:
-                    continue
-                
-                # 날짜 추출
-                date_tag = article.select_one('.wdate, .date')
-                published = date_tag.get_text(strip=True) if date_tag else datetime.now().strftime('%Y-%m-%d %H:%M')
-                
-                news_items.append({
-                    'title': title,
-                    'link': link,
-                    'summary': '',
-                    'published': published,
-                    'source': '네이버 금융',
-                    'category': '시황',
-                    'fetched_at': datetime.now().isoformat()
-                })
-            
+            return self._fetch(source_id, max_items or source["max_items"])
         except Exception as e:
-            print(f"Error crawling main news: {e}")
-        
-        return news_items
+            print(f"Error crawling {source['label']}: {e}")
+            return []
     
-    def fetch_daum_finance_news(self, max_items=20):
+    def fetch_sources(self, source_ids=None, max_per_source=None):
         """
-        다음 금융 뉴스를 크롤링합니다.
+        여러 소스를 수집 파이프라인(동시 요청 -> 파싱 프로세스 풀)으로 크롤링합니다.
+        
+        서킷 브레이커가 열린(연속 실패 중인) 소스는 요청하지 않으며,
+        요청 오류나 0건 파싱은 실패로 기록합니다.
         
         Args:
-            max_items: 최대 수집할 뉴스 개수
+            source_ids: 수집할 소스 ID 리스트 (기본값: 활성화된 전체 소스)
+            max_per_source: 소스별 최대 수집 개수 상한 (기본값: 소스 설정)
             
         Returns:
-            뉴스 항목 리스트
+            {소스 ID: 뉴스 항목 리스트} (성공한 소스만, 요청한 순서대로)
         """
-        news_items = []
-        url = 'https://finance.daum.net/news/category/economic'
+        health = get_source_health()
+        limits = {}
+        for source_id in source_ids or enabled_sources():
+            source = SOURCES[source_id]
+            if not health.allow(source_id):
+                print(f"{source['label']}: 연속 실패로 수집 보류 중")
+                continue
+            limit = source["max_items"]
+            if max_per_source:
+                limit = min(limit, max_per_source)
+            limits[source_id] = limit
         
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            
-            if response.status_code != 200:
-                print(f"Warning: 다음 금융 뉴스 요청 실패")
-                return news_items
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 뉴스 리스트 파싱
-            articles = soup.select('.newsWrap li, article')
+        if not limits:
+            return {}
+        
+        print(f"뉴스 수집 중: {', '.join(SOURCES[source_id]['label'] for source_id in limits)}")
+        pipeline = get_crawl_pipeline()
+        crawled, errors = pipeline.run(
+            list(limits), lambda source_id: self._download(source_id, limits[source_id]), parse_payload,
+        )
+        
+        results = {}
+        for source_id in limits:
+            if source_id in errors:
+                print(f"Error crawling {SOURCES[source_id]['label']}: {errors[source_id]}")
+                health.record_failure(source_id, str(errors[source_id])[:200])
+                continue
             
-            for article in articles[:max_items]:
-                link_tag = article.select_one('a')
-                if not link_tag:
-                    continue
-                
-                title = link_tag.get_text(strip=True)
-                link = link_tag.get('href', '')
-                
-                if not link.startswith('http'):
-                    link = f"https://finance.daum.net{link}"
-                
-                if not title or len(title) < 5:
-                    continue
-                
-                news_items.append({
-                    'title': title,
-                    'link': link,
-                    'summary': '',
-                    'published': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                    'source': '다음 금융',
-                    'category': '경제',
-                    'fetched_at': datetime.now().isoformat()
-                })
+            items = crawled[source_id]
+            if not items:
+                # 목록 페이지가 비어 있으면 선택자가 더 이상 맞지 않는 것으로 봄
+                health.record_failure(source_id, "0건 파싱 (선택자 불일치 의심)")
+                continue
             
-        except Exception as e:
-            print(f"Error crawling Daum finance news: {e}")
+            health.record_success(source_id)
+            results[source_id] = items
         
-        return news_items
+        stats = pipeline.last_stats
+        if stats["parse_items_per_sec"] is not None:
+            print(f"파싱 {stats['items']}건 / {stats['elapsed_sec']}초 "
+                  f"(파싱 처리량 {stats['parse_items_per_sec']}건/초, 큐 대기 {stats['blocked']}회)")
+        return results
     
-    def fetch_hankyung_news(self, max_items=15):
+    def fetch_naver_finance_news(self, max_items=30):
         """
-        한국경제 증권 뉴스를 크롤링합니다.
+        네이버 금융 뉴스(시장/종목/공시)를 크롤링합니다.
         
         Args:
             max_items: 최대 수집할 뉴스 개수
             
         Returns:
-            뉴스 항목 리스트
+            뉴스 항목 리스트 [{title, link, summary, published, source, category}, ...]
         """
         news_items = []
-        url = 'https://www.hankyung.com/finance/stock'
-        
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            
-            if response.status_code != 200:
-                print(f"Warning: 한경 뉴스 요청 실패")
-                return news_items
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 뉴스 리스트 파싱
-            articles = soup.select('.news-list li, article.news-item, .article-list li')
-            
-            for article in articles[:max_items]:
-                link_tag = article.select_one('a')
-                if not link_tag:
-                    continue
-                
-                title_tag = article.select_one('h3, .news-tit, .tit')
-                title = title_tag.get_text(strip=True) if title_tag else link_tag.get_text(strip=True)
-                link = link_tag.get('href', '')
-                
-                if not link.startswith('http'):
-                    link = f"https://www.hankyung.com{link}"
-                
-                if not title or len(title) < 5:
-                    continue
-                
-                news_items.append({
-                    'title': title,
-                    'link': link,
-                    'summary': '',
-                    'published': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                    'source': '한국경제',
-                    'category': '증권',
-                    'fetched_at': datetime.now().isoformat()
-                })
-            
-        except Exception as e:
-            print(f"Error crawling Hankyung news: {e}")
-        
+        for source_id in ("naver_market", "naver_stock", "naver_disclosure"):
+            if len(news_items) >= max_items:
+                break
+            news_items.extend(self.fetch_source(source_id, max_items - len(news_items)))
+            time.sleep(self.request_delay)  # 서버 부하 방지
         return news_items
     
-    def fetch_all_news(self, max_per_source=20):
+    def fetch_naver_main_news(self, max_items=20):
+        """네이버 금융 메인 뉴스 (시황/전망)를 크롤링합니다."""
+        return self.fetch_source("naver_main", max_items)
+    
+    def fetch_daum_finance_news(self, max_items=20):
+        """다음 금융 뉴스를 크롤링합니다."""
+        return self.fetch_source("daum", max_items)
+    
+    def fetch_hankyung_news(self, max_items=15):
+        """한국경제 증권 뉴스를 크롤링합니다."""
+        return self.fetch_source("hankyung", max_items)
+    
+    def fetch_all_news(self, max_per_source=None, source_ids=None):
         """
         모든 소스에서 뉴스를 수집합니다.
         
         Args:
-            max_per_source: 소스별 최대 수집 개수
+            max_per_source: 소스별 최대 수집 개수 상한 (기본값: 소스 설정)
+            source_ids: 수집할 소스 ID 리스트 (기본값: 활성화된 전체 소스)
             
         Returns:
             전체 뉴스 항목 리스트
         """
         all_news = []
+        for items in self.fetch_sources(source_ids, max_per_source).values():
+            all_news.extend(items)
         
-        print("네이버 금융 뉴스 수집 중...")
-        all_news.extend(self.fetch_naver_finance_news(max_per_source))
-        
-        print("네이버 금융 메인 뉴스 수집 중...")
-        all_news.extend(self.fetch_naver_main_news(max_per_source // 2))
-        
-        print("한국경제 뉴스 수집 중...")
-        all_news.extend(self.fetch_hankyung_news(max_per_source // 2))
-        
-        # 중복 제거 (링크 기준)
-        seen_links = set()
-        unique_news = []
-        for item in all_news:
-            if item['link'] not in seen_links:
-                seen_links.add(item['link'])
-                unique_news.append(item)
-        
+        unique_news = dedupe_by_link(all_news)
         print(f"총 {len(unique_news)}개 뉴스 수집 완료")
         return unique_news
 
 
+def dedupe_by_link(news_items):
+    """중복 제거 (canonical_link 기준, 먼저 나온 항목 유지)"""
+    seen_links = set()
+    unique_news = []
+    for item in news_items:
+        key = canonical_link(item['link'])
+        if key not in seen_links:
+            seen_links.add(key)
+            unique_news.append(item)
+    return unique_news
+
+
 # 테스트용 코드
 if __name__ == "__main__":
     crawler = NewsCrawler()
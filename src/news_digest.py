@@ -0,0 +1,220 @@
+"""
+뉴스 다이제스트 모듈 (Map-Reduce)
+
+뉴스가 많을 때 최신 50건만 자르는 대신,
+0) 가장 최근 기사 기준 WINDOW_HOURS시간 안의 기사만 봅니다. (이 안의 기사가 direct_limit건보다
+   적으면 최신 direct_limit건) 보관 중인 며칠 치 뉴스가 오늘 리포트를 덮지 않도록 합니다.
+1) 사진/포토 기사(제목뿐인 화보)를 빼고 로컬 클러스터링으로 주제를 묶고 (news_clustering)
+2) 기사가 2건 이상인 클러스터를 최근 기사 시각(시간 단위), 크기 순으로 골라 병렬로 요약(Map)한 뒤
+3) 남은 자리를 단독 기사 헤드라인으로 최신순(카테고리별로 번갈아) 채워
+   고정 크기의 텍스트로 합쳐(Reduce) 페르소나/CIO 프롬프트에 전달합니다.
+뉴스가 수천 건이어도 최종 프롬프트 크기는 max_headlines줄로 고정됩니다.
+"""
+
+import re
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from src.llm_limiter import get_llm_limiter
+from src.news_clustering import cluster_news
+
+
+# 이 개수 이하면 기존처럼 헤드라인 목록을 그대로 사용
+DIRECT_LIMIT = 50
+# 다이제스트에 넣을 기사 범위 (가장 최근 기사 기준 시간)
+WINDOW_HOURS = 24
+# 프롬프트에 포함할 최대 줄 수 (토픽 요약 1줄도 헤드라인 1건으로 셈)
+MAX_HEADLINES = 80
+# 그중 토픽(기사 2건 이상 클러스터) 요약에 쓸 최대 줄 수
+MAX_CLUSTERS = 25
+# 이 크기 이상인 클러스터를 토픽으로 묶어 LLM으로 요약 (단독 기사는 헤드라인 그대로 사용)
+MIN_SUMMARY_SIZE = 2
+# 토픽 요약 최대 길이 (문자)
+MAX_DIGEST_CHARS = 200
+# 요약 프롬프트에 넣을 클러스터당 최대 제목 수
+MAX_TITLES_PER_CLUSTER = 30
+
+# 클러스터 키 -> 요약 (같은 클러스터는 다시 요약하지 않음)
+_summary_cache = {}
+_cache_lock = threading.Lock()
+_CACHE_LIMIT = 500
+
+# 제목이 "[사진]", "[포토]" 등으로 시작하는 사진 기사 (시장 정보가 없어 다이제스트에서 제외)
+_PHOTO_PATTERN = re.compile(r'^\s*[\[【(<]\s*(사진|포토|포토뉴스|화보|photo)\s*[\]】)>]', re.IGNORECASE)
+
+
+def clear_summary_cache():
+    """클러스터 요약 캐시 비우기 (벤치마크 등에서 실행마다 같은 조건으로 측정할 때)"""
+    with _cache_lock:
+        _summary_cache.clear()
+
+
+def is_photo_item(item):
+    """제목만 있는 사진/화보 기사인지"""
+    return bool(_PHOTO_PATTERN.match(item.get('title', '')))
+
+
+def _fetched_at(item):
+    try:
+        return datetime.fromisoformat(item.get('fetched_at', '')[:19])
+    except ValueError:
+        return None
+
+
+def recent_window(sorted_news, window_hours=WINDOW_HOURS, min_items=DIRECT_LIMIT):
+    """
+    최신순 뉴스 중 가장 최근 기사 기준 window_hours시간 안의 기사 (적어도 최신 min_items건)
+    """
+    newest = next((t for t in map(_fetched_at, sorted_news) if t is not None), None)
+    if newest is None:
+        return sorted_news[:min_items]
+    cutoff = newest - timedelta(hours=window_hours)
+    in_window = sum(1 for item in sorted_news if (_fetched_at(item) or cutoff) > cutoff)
+    return sorted_news[:max(min_items, in_window)]
+
+
+def _interleave_by_category(items):
+    """최신순 기사를 카테고리별로 번갈아 나열 (한 카테고리가 남은 자리를 독차지하지 않도록)"""
+    by_category = {}
+    for item in items:
+        by_category.setdefault(item.get('category', ''), []).append(item)
+    queues = list(by_category.values())
+    result = []
+    for rank in range(max((len(q) for q in queues), default=0)):
+        result.extend(q[rank] for q in queues if rank < len(q))
+    return result
+
+
+def format_headlines(news_items):
+    """뉴스 항목을 번호 붙은 헤드라인 목록으로 변환"""
+    text = ""
+    for i, item in enumerate(news_items, 1):
+        text += f"{i}. [{item.get('source', '출처없음')}] {item.get('title', '제목없음')}\n"
+    return text
+
+
+def cluster_summary_prompt(cluster):
+    """토픽 클러스터 요약(Map) 프롬프트"""
+    titles = "\n".join(
+        f"- {item.get('title', '')}" for item in cluster['items'][:MAX_TITLES_PER_CLUSTER]
+    )
+    return f"""다음은 같은 주제로 묶인 주식/경제 뉴스 제목 {len(cluster['items'])}건입니다.
+핵심 사실(무엇이, 왜, 어떤 섹터/종목에 영향)을 한국어 한두 문장, {MAX_DIGEST_CHARS}자 이내로 요약하세요.
+언급된 종목명은 그대로 포함하세요. 요약문만 출력하세요.
+
+{titles}"""
+
+
+def summarize_clusters(clusters, llm_fn):
+    """
+    클러스터 요약(Map 단계)을 공유 동시성 한도 안에서 병렬 실행합니다.
+
+    Args:
+        clusters: cluster_news() 결과 중 요약할 클러스터
+        llm_fn: 프롬프트를 받아 텍스트를 반환하는 함수 (실패 시 예외 또는 "Error" 문자열)
+
+    Returns:
+        {클러스터 키: 요약} (실패한 클러스터는 제외)
+    """
+    summaries = {}
+    pending = []
+    with _cache_lock:
+        for cluster in clusters:
+            if cluster['key'] in _summary_cache:
+                summaries[cluster['key']] = _summary_cache[cluster['key']]
+            else:
+                pending.append(cluster)
+
+    def summarize(cluster):
+        try:
+            text = llm_fn(cluster_summary_prompt(cluster))
+        except Exception as e:
+            print(f"Cluster summary failed: {e}")
+            return cluster['key'], None
+        if not text or text.startswith("Error"):
+            return cluster['key'], None
+        return cluster['key'], text.strip()[:MAX_DIGEST_CHARS]
+
+    if pending:
+        workers = min(len(pending), get_llm_limiter().max_concurrent)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for key, summary in executor.map(summarize, pending):
+                if summary:
+                    summaries[key] = summary
+
+        with _cache_lock:
+            for cluster in pending:
+                if cluster['key'] in summaries:
+                    _summary_cache[cluster['key']] = summaries[cluster['key']]
+            while len(_summary_cache) > _CACHE_LIMIT:
+                _summary_cache.pop(next(iter(_summary_cache)))
+
+    return summaries
+
+
+def build_news_digest(news_items, llm_fn, direct_limit=DIRECT_LIMIT, max_clusters=MAX_CLUSTERS,
+                      max_headlines=MAX_HEADLINES, window_hours=WINDOW_HOURS):
+    """
+    프롬프트용 뉴스 텍스트를 생성합니다.
+
+    Args:
+        news_items: 뉴스 항목 리스트
+        llm_fn: 클러스터 요약에 사용할 LLM 호출 함수
+        direct_limit: 이 개수 이하면 헤드라인 목록을 그대로 사용
+        max_clusters: 다이제스트에 포함할 최대 토픽 수
+        max_headlines: 다이제스트의 최대 줄 수 (토픽 요약 + 단독 기사 헤드라인)
+        window_hours: 가장 최근 기사 기준으로 다이제스트에 넣을 기간 (시간)
+
+    Returns:
+        (뉴스 텍스트, 통계 딕셔너리 {mode, items, clusters, summarized, photos, headlines})
+        items는 기간(window_hours) 안의 기사 수입니다.
+    """
+    sorted_news = recent_window(
+        sorted(news_items, key=lambda x: x.get('fetched_at', ''), reverse=True), window_hours, direct_limit
+    )
+    if len(sorted_news) <= direct_limit:
+        return format_headlines(sorted_news), {
+            "mode": "direct", "items": len(sorted_news), "clusters": 0, "summarized": 0
+        }
+
+    news = [item for item in sorted_news if not is_photo_item(item)]
+    photos = len(sorted_news) - len(news)
+
+    clusters = cluster_news(news)
+    # 새 소식이 먼저 자리를 얻도록 최근 기사 시각(시간 단위)이 늦은 순, 같은 시간대는 큰 순
+    topics = sorted(
+        (c for c in clusters if len(c['items']) >= MIN_SUMMARY_SIZE),
+        key=lambda c: (c['latest'][:13], len(c['items'])), reverse=True
+    )[:min(max_clusters, max_headlines)]
+    summaries = summarize_clusters(topics, llm_fn)
+
+    text = ""
+    for i, cluster in enumerate(topics, 1):
+        lead = cluster['items'][0]
+        digest = summaries.get(cluster['key']) or lead.get('title', '')
+        sources = sorted({item.get('source', '출처없음') for item in cluster['items']})
+        text += f"{i}. [토픽, 기사 {len(cluster['items'])}건, {', '.join(sources)}] {digest}\n"
+
+    # 남은 자리는 토픽에 들지 않은 클러스터(대부분 단독 기사)의 대표 기사로 채움
+    topic_keys = {c['key'] for c in topics}
+    leads = sorted(
+        (c['items'][0] for c in clusters if c['key'] not in topic_keys),
+        key=lambda x: x.get('fetched_at', ''), reverse=True
+    )
+    headlines = _interleave_by_category(leads)[:max_headlines - len(topics)]
+    for i, item in enumerate(headlines, len(topics) + 1):
+        text += f"{i}. [{item.get('source', '출처없음')}] {item.get('title', '제목없음')}\n"
+
+    covered = sum(len(c['items']) for c in topics) + len(headlines)
+    text += f"\n(최근 {window_hours}시간 {len(sorted_news)}건 중 {covered}건: {len(topics)}개 토픽 요약 + 개별 헤드라인 {len(headlines)}건"
+    text += f", 사진 기사 {photos}건 제외)\n" if photos else ")\n"
+
+    return text, {
+        "mode": "clustered",
+        "items": len(sorted_news),
+        "clusters": len(clusters),
+        "summarized": len(summaries),
+        "photos": photos,
+        "headlines": len(headlines),
+    }
@@ -0,0 +1,82 @@
+"""
+뉴스 이벤트 모듈
+
+프로세스 내 발행/구독(pub/sub) 버스입니다.
+뉴스 수집 단계가 새 기사 목록을 발행하면, 구독자(분석 트리거 등)는
+각자의 큐에서 이벤트를 꺼내 처리합니다. 구독자가 느려도 발행자는 막히지 않으며,
+큐가 가득 차면 가장 오래된 이벤트를 버립니다.
+"""
+
+import queue
+import threading
+import time
+
+
+# 새 기사 수집 이벤트 (payload: 새 뉴스 항목 리스트)
+NEW_ITEMS = "news.new_items"
+
+# 구독자별 큐에 보관할 최대 이벤트 수
+MAX_QUEUE_SIZE = 1000
+
+
+class NewsEventBus:
+    """프로세스 전역 이벤트 버스 (싱글톤)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(NewsEventBus, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._subscribers = {}
+        self._subs_lock = threading.Lock()
+
+    def subscribe(self, topic, maxsize=MAX_QUEUE_SIZE):
+        """
+        토픽을 구독합니다.
+
+        Returns:
+            이벤트 큐 (항목: {"topic", "payload", "published_at"})
+        """
+        subscriber = queue.Queue(maxsize=maxsize)
+        with self._subs_lock:
+            self._subscribers.setdefault(topic, []).append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, topic, subscriber):
+        with self._subs_lock:
+            subscribers = self._subscribers.get(topic, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+
+    def publish(self, topic, payload):
+        """이벤트를 모든 구독자 큐에 넣습니다. (구독자가 없으면 버려짐)"""
+        event = {"topic": topic, "payload": payload, "published_at": time.time()}
+        with self._subs_lock:
+            subscribers = list(self._subscribers.get(topic, []))
+
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+        return len(subscribers)
+
+
+def get_event_bus():
+    return NewsEventBus()
@@ -1,9 +1,117 @@
+import json
+import os
+import random
 import threading
 import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-from src.data_manager import DataManager
+from src.data_manager import DATA_DIR, DataManager
 from src.ai_analyst import AIAnalyst
+from src.single_flight import get_single_flight
+from src.llm_limiter import get_llm_limiter
+from src.news_digest import DIRECT_LIMIT, build_news_digest
+from src.debate_checkpoint import prune_checkpoints
+from src.entry_store import get_debate_store, get_report_store
+from src.leader_lease import LeaderLease
+from src.analysis_trigger import AnalysisTrigger
+from src import market_calendar
+from src.source_polling import get_source_poller
+from src.source_health import get_source_health
+from src.crawl_pipeline import get_crawl_pipeline
+from src.view_model import invalidate_view_model
+from src.snapshots import refresh_snapshots
+
+METRICS_FILE = os.path.join(DATA_DIR, 'scheduler_metrics.json')
+# Scheduler status written by the leader so every replica's admin page can show it
+STATUS_FILE = os.path.join(DATA_DIR, 'scheduler_status.json')
+
+# Missed-run policies: what to do when a job's planned run time has already passed
+# by more than one interval (slow previous run, process suspended, ...)
+MISSED_SKIP = "skip"          # drop the missed slots, next run one interval from now
+MISSED_RUN_ONCE = "run_once"  # run once immediately, then continue on the interval
+
+
+class ScheduledJob:
+    """One periodic job with its own interval, jitter, timeout and missed-run policy"""
+
+    def __init__(self, name, label, func, interval, jitter=0, timeout=None,
+                 missed_policy=MISSED_SKIP, initial_delay=0, condition=None, interval_fn=None,
+                 cadence_label=None):
+        self.name = name
+        self.label = label
+        # Shown instead of the interval when the job is not purely periodic
+        self.cadence_label = cadence_label
+        self.func = func
+        # Optional gate checked when the job is due; the run is skipped (not counted) if it returns False
+        self.condition = condition
+        self.interval = interval
+        # Optional dynamic interval (e.g. market-session aware), overrides `interval`
+        self.interval_fn = interval_fn
+        self.jitter = jitter
+        self.timeout = timeout or interval
+        self.missed_policy = missed_policy
+        self.initial_delay = initial_delay
+
+        self.state = "idle"  # idle | running | timeout | error
+        self.next_run = None
+        self.planned_run = None
+        self.started_at = None
+        self.last_run = None
+        self.last_duration = None
+        self.last_result = None
+        self.last_error = None
+        self.runs = 0
+        self.failures = 0
+        self.overlaps = 0
+        self.timeouts = 0
+
+    def schedule_first(self, now):
+        self.planned_run = now + datetime.timedelta(seconds=self.initial_delay)
+        self.next_run = self.planned_run + self._jitter()
+
+    def current_interval(self):
+        return self.interval_fn() if self.interval_fn else self.interval
+
+    def schedule_next(self, now):
+        interval = self.current_interval()
+        planned = self.planned_run + datetime.timedelta(seconds=interval)
+        if planned <= now:
+            # At least one slot was missed while the job was running / the process was busy
+            if self.missed_policy == MISSED_RUN_ONCE:
+                planned = now
+            else:
+                planned = now + datetime.timedelta(seconds=interval)
+        self.planned_run = planned
+        self.next_run = planned + self._jitter()
+
+    def _jitter(self):
+        return datetime.timedelta(seconds=random.uniform(0, self.jitter)) if self.jitter else datetime.timedelta()
+
+    def snapshot(self):
+        def fmt(value):
+            return value.isoformat() if value else None
+
+        return {
+            "name": self.name,
+            "label": self.label,
+            "state": self.state,
+            "interval": self.current_interval(),
+            "jitter": self.jitter,
+            "timeout": self.timeout,
+            "missed_policy": self.missed_policy,
+            "cadence": self.cadence_label,
+            "last_run": fmt(self.last_run),
+            "last_duration": self.last_duration,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "next_run": fmt(self.next_run),
+            "runs": self.runs,
+            "failures": self.failures,
+            "overlaps": self.overlaps,
+            "timeouts": self.timeouts,
+        }
+
 
 class BackgroundScheduler:
     _instance = None
@@ -20,15 +128,22 @@ class BackgroundScheduler:
     def __init__(self):
         if self._initialized:
             return
-            
+
         self._initialized = True
-        self.interval = 600  # 10 minutes (600 seconds)
+        self.tick = 1  # dispatcher resolution (seconds)
         self.is_running = False
         self.thread = None
-        self.last_run = None
-        self.next_run = None
         self.status = "Stopped"
-        
+        self._jobs_lock = threading.Lock()
+        # Only the process holding the lease in data/ runs jobs; the others stay on standby
+        self.lease = LeaderLease()
+        # New-item events from the crawl decide when analysis runs; burst detection spreads
+        # each crawl batch over the session's crawl interval
+        self.trigger = AnalysisTrigger(interval_fn=market_calendar.crawl_interval)
+        self._trigger_reason = None
+        self.poller = get_source_poller()
+        self._due_sources = []
+
         # Initialize managers
         self.dm = DataManager()
         # API Key might be loaded later or passed, but for bg task we need it from secrets
@@ -36,72 +151,313 @@ class BackgroundScheduler:
             api_key = st.secrets.get("GOOGLE_API_KEY")
         except:
             api_key = None
-            
+
         self.ai = AIAnalyst(api_key=api_key) if api_key else None
 
+        # Persona generation mode for full analyses ("separate" or "combined")
+        try:
+            self.persona_mode = st.secrets.get("ANALYSIS_PERSONA_MODE", "separate")
+        except:
+            self.persona_mode = "separate"
+
+        # Each job runs on its own worker so a slow analysis never delays the crawl
+        self.jobs = [
+            # Checked every minute; each source is polled on its own adaptive interval derived from
+            # its recent yield and the KRX session base interval (see source_polling)
+            ScheduledJob("crawl", "뉴스 수집", self._crawl_job,
+                         interval=60, timeout=300, missed_policy=MISSED_RUN_ONCE,
+                         condition=self._crawl_due, cadence_label="소스별 적응"),
+            ScheduledJob("enrichment", "다이제스트 준비", self._enrichment_job,
+                         interval=600, jitter=30, timeout=600, initial_delay=120,
+                         condition=lambda: market_calendar.analysis_policy() == "event"),
+            # Event-driven: checked every 30 s, runs only when the trigger fires
+            ScheduledJob("analysis", "AI 리포트 분석", self._analysis_job,
+                         interval=30, timeout=900, initial_delay=60, condition=self._analysis_due,
+                         cadence_label="이벤트"),
+            ScheduledJob("retention", "보관 정리", self._retention_job,
+                         interval=3600, jitter=300, timeout=300, initial_delay=300),
+            ScheduledJob("metrics", "지표 기록", self._metrics_job,
+                         interval=300, jitter=10, timeout=60, initial_delay=30),
+        ]
+        self.executor = ThreadPoolExecutor(max_workers=len(self.jobs), thread_name_prefix="scheduler-job")
+
+    def get_job(self, name):
+        return next(job for job in self.jobs if job.name == name)
+
+    def job_states(self):
+        with self._jobs_lock:
+            return [job.snapshot() for job in self.jobs]
+
+    @property
+    def is_leader(self):
+        return self.lease.is_leader
+
     def start(self):
         if self.is_running:
             return
-        
+
         self.is_running = True
-        self.status = "Running"
+        self.status = "Standby"
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
-        print(f"[{datetime.datetime.now()}] Background Scheduler Started")
+        print(f"[{datetime.datetime.now()}] Background Scheduler Started ({self.lease.owner})")
 
     def stop(self):
         self.is_running = False
         self.status = "Stopped"
         if self.thread:
             self.thread.join(timeout=1)
+        self.lease.release()
 
     def _run_loop(self):
+        # Dispatcher: only decides what is due, the jobs themselves run on the executor
         while self.is_running:
-            self.status = "Processing..."
-            try:
-                self._execute_job()
-                self.last_run = datetime.datetime.now()
-                self.next_run = self.last_run + datetime.timedelta(seconds=self.interval)
-                self.status = f"Waiting (Next run: {self.next_run.strftime('%H:%M:%S')})"
-            except Exception as e:
-                print(f"Scheduler Error: {e}")
-                self.status = f"Error: {str(e)}"
-            
-            # Sleep in small chunks to allow stopping
-            for _ in range(self.interval):
-                if not self.is_running:
-                    break
-                time.sleep(1)
-            
-            # Initial run might have just finished, loop again
-
-    def _execute_job(self):
-        print(f"[{datetime.datetime.now()}] Executing Background Job...")
-        
-        # 1. Fetch News
-        new_count = self.dm.fetch_and_update_news()
-        print(f"  - Fetched {new_count} new items")
-        
-        # 2. Analyze if there are news and AI is available
-        if self.ai:
-            news = self.dm.load_news()
-            if news:
-                print("  - analyzing news...")
-                # Simple check to avoid re-analyzing if nothing changed? 
-                # For now, just analyze periodically as requested.
-                # Maybe optimization: check if latest news is newer than last report?
-                # User asked for "periodic", so we just do it.
-                
-                analysis_text = self.ai.analyze_news(news, verbose=False)
-                if "오류" not in analysis_text and "Error" not in analysis_text:
-                    self.ai.save_report(analysis_text)
-                    print("  - Report saved successfully")
-                else:
-                    print(f"  - Analysis failed: {analysis_text}")
+            if self.lease.heartbeat_due():
+                self._heartbeat()
+
+            if self.lease.is_leader:
+                now = datetime.datetime.now()
+                with self._jobs_lock:
+                    for job in self.jobs:
+                        self._check_job(job, now)
+            time.sleep(self.tick)
+
+    def _heartbeat(self):
+        was_leader = self.lease.is_leader
+        try:
+            leader = self.lease.heartbeat()
+        except OSError as e:
+            print(f"Scheduler lease error: {e}")
+            return
+
+        if leader and not was_leader:
+            # Became leader (first start or failover): schedule every job from now
+            now = datetime.datetime.now()
+            with self._jobs_lock:
+                for job in self.jobs:
+                    if job.state not in ("running", "timeout"):
+                        job.schedule_first(now)
+            # Continue from the previous leader's polling and circuit-breaker state,
+            # not this process's start-up copy
+            self.poller.reload()
+            get_source_health().reload()
+            self._seed_trigger()
+            refresh_snapshots(["latest_debate", "sectors", "today_news"])
+            self.status = "Running (leader)"
+        elif not leader:
+            self.status = "Standby (follower)"
+
+        if leader:
+            self._write_status()
+
+    def _write_status(self):
+        status = {
+            "leader": self.lease.owner,
+            "updated_at": datetime.datetime.now().isoformat(),
+            "jobs": self.job_states(),
+            "trigger": self.trigger.status(),
+            "session": self.session_info(),
+            "crawl_pipeline": get_crawl_pipeline().stats(),
+        }
+        tmp_path = f"{STATUS_FILE}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(status, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, STATUS_FILE)
+        except OSError as e:
+            print(f"Scheduler status write error: {e}")
+        # Rewritten only when job state actually changed (content-hashed)
+        refresh_snapshots(["status"], status=status)
+
+    def session_info(self):
+        now = market_calendar.now_kst()
+        session, boundary = market_calendar.session_at(now)
+        return {
+            "session": session,
+            "label": market_calendar.SESSION_LABELS[session],
+            "until": boundary.isoformat(),
+            "crawl_interval": market_calendar.crawl_interval(now),
+            "analysis": market_calendar.analysis_policy(now),
+        }
+
+    def shared_status(self):
+        """Status written by the current leader (None if no leader has written yet)"""
+        try:
+            with open(STATUS_FILE, 'r', encoding='utf-8') as f:
+                status = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        lease = self.lease.read() or {}
+        status["lease_alive"] = lease.get("owner") == status.get("leader") and \
+            lease.get("expires_at", 0) > time.time()
+        return status
+
+    def _check_job(self, job, now):
+        if job.state in ("running", "timeout"):
+            elapsed = (now - job.started_at).total_seconds()
+            if job.state == "running" and elapsed > job.timeout:
+                # Threads cannot be killed: flag it and keep blocking new runs until it returns
+                job.state = "timeout"
+                job.timeouts += 1
+                print(f"Scheduler: job '{job.name}' exceeded its {job.timeout}s timeout")
+            if now >= job.next_run:
+                # Overlap prevention: never start a second instance of the same job.
+                # The missed slot is handled by the missed-run policy once the run returns.
+                job.overlaps += 1
+                job.next_run += datetime.timedelta(seconds=job.current_interval())
+            return
+
+        if now >= job.next_run:
+            if job.condition is not None and not job.condition():
+                job.schedule_next(now)
+                return
+            job.state = "running"
+            job.started_at = now
+            self.executor.submit(self._run_job, job)
+
+    def _run_job(self, job):
+        started = time.monotonic()
+        result, error = None, None
+        try:
+            # The lease may have been lost while this run waited on the executor
+            result = job.func() if self.lease.is_leader else "리더가 아니므로 건너뜀"
+        except Exception as e:
+            print(f"Scheduler Error ({job.name}): {e}")
+            error = str(e)
+
+        finished = datetime.datetime.now()
+        with self._jobs_lock:
+            job.last_run = finished
+            job.last_duration = round(time.monotonic() - started, 2)
+            job.runs += 1
+            if error is None:
+                job.state = "idle"
+                job.last_result = result
+                job.last_error = None
             else:
-                print("  - No news to analyze")
+                job.state = "error"
+                job.failures += 1
+                job.last_error = error
+            job.schedule_next(finished)
+
+    # --- Jobs ---
+
+    def _crawl_due(self):
+        self._due_sources = self.poller.due_sources(market_calendar.crawl_interval())
+        return bool(self._due_sources)
+
+    def _crawl_job(self):
+        base_interval = market_calendar.crawl_interval()
+        sources = self._due_sources
+        started = time.time()
+        yields = self.dm.fetch_and_update_sources(sources)
+        self.poller.record(yields, base_interval)
+        new_count = sum(result["new"] for result in yields.values())
+        if new_count:
+            # Drop the cached dashboard view model so sessions pick up the new items
+            invalidate_view_model()
+        # Also rolls today's news over at midnight; unchanged content is not rewritten
+        refresh_snapshots(["today_news"])
+        print(f"[{datetime.datetime.now()}] Crawl: fetched {new_count} new items from {len(sources)} sources")
+        result = f"{new_count}건 추가 ({len(sources)}개 소스)"
+        # Parse-stage throughput of this crawl (absent when every source was skipped)
+        stats = get_crawl_pipeline().last_stats
+        if stats and stats["parse_items_per_sec"] is not None and stats["at"] >= started:
+            result += f", 파싱 {stats['parse_items_per_sec']:.0f}건/초"
+        return result
+
+    def _plan(self):
+        news = self.dm.load_news()
+        if not news:
+            return None, "skip", []
+        previous = self.ai.get_latest_report()
+        mode, items = self.ai.plan_analysis(news, previous)
+        return previous, mode, items
+
+    def _enrichment_job(self):
+        # Warm the cluster-summary cache so the next full analysis only pays for the CIO call
+        if not self.ai:
+            return "AI 미설정"
+        _, mode, items = self._plan()
+        if mode != "full" or len(items) <= DIRECT_LIMIT:
+            return "준비할 다이제스트 없음"
+        _, stats = build_news_digest(items, self.ai._generate)
+        return f"토픽 {stats['clusters']}개 중 {stats['summarized']}개 요약"
+
+    def _seed_trigger(self):
+        # News that arrived before this process became leader has no events: queue it directly
+        if not self.ai:
+            return
+        try:
+            _, mode, items = self._plan()
+        except Exception as e:
+            print(f"Scheduler: could not seed analysis trigger: {e}")
+            return
+        if mode != "skip":
+            self.trigger.seed(items)
+
+    def _analysis_due(self):
+        if not self.ai:
+            return False
+        # Closed days: no LLM analysis unless breaking news / a burst arrives
+        burst_only = market_calendar.analysis_policy() == "burst_only"
+        self._trigger_reason = self.trigger.should_fire(burst_only=burst_only)
+        return self._trigger_reason is not None
+
+    def _analysis_job(self):
+        reason = self._trigger_reason
+        taken = self.trigger.take(reason)
+        try:
+            return self._run_analysis(reason)
+        except Exception:
+            # Keep the events pending so the next check retries
+            self.trigger.requeue(taken)
+            raise
+
+    def _run_analysis(self, reason):
+        # Incremental mode: only news since the last report is sent,
+        # with a periodic (or large-delta) full rebuild.
+        previous, mode, items = self._plan()
+        if mode == "skip":
+            print("  - No new news since last report, skipping analysis")
+            return "새 뉴스 없음"
+
+        print(f"[{datetime.datetime.now()}] Analysis ({reason}): analyzing news ({mode}, {len(items)} items)...")
+
+        # Only the leader runs this job, one run at a time, so no single-flight here
+        if mode == "delta":
+            report = self.ai.analyze_news_delta(items, previous, verbose=False)
         else:
-            print("  - AI not initialized (No Key)")
+            report = self.ai.analyze_news(items, verbose=False, persona_mode=self.persona_mode)
+        if "error" in report:
+            raise RuntimeError(report["error"])
+        if not self.lease.is_leader:
+            # Lost the lease during the LLM calls; the new leader analyzes the same news
+            print("  - Lease lost during analysis, report not saved")
+            return "리더가 바뀌어 저장하지 않음"
+        self.ai.save_report(report)
+        print("  - Report saved successfully")
+        return f"{mode} 리포트 저장 ({len(items)}건, {reason})"
+
+    def _retention_job(self):
+        removed = prune_checkpoints()
+        removed += get_debate_store().compact()
+        removed += get_report_store().compact()
+        return f"{removed}개 파일 정리"
+
+    def _metrics_job(self):
+        metrics = {
+            "updated_at": datetime.datetime.now().isoformat(),
+            "jobs": self.job_states(),
+            "llm_usage": get_llm_limiter().usage.snapshot(),
+            "single_flight": dict(get_single_flight().stats),
+            "crawl_pipeline": get_crawl_pipeline().stats(),
+        }
+        tmp_path = f"{METRICS_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(metrics, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, METRICS_FILE)
+        return "기록 완료"
 
 def get_scheduler():
     return BackgroundScheduler()
@@ -0,0 +1,167 @@
+"""
+섹터 데이터 모듈
+
+리포트/토론 결과의 '섹터별 기상도' 데이터를 정의하고 검증합니다.
+모델의 구조화 출력(JSON 스키마) 모드로 받은 섹터 목록을 한 번만 검증하여
+리포트 본문(final_report/content) 옆에 `sectors` 필드로 저장합니다.
+"""
+
+import json
+import re
+from google.genai import types
+
+
+SENTIMENTS = ("맑음", "흐림")
+
+# 섹터 한 건의 스키마 (sector, sentiment, score, reason, tickers)
+SECTOR_ITEM_SCHEMA = types.Schema(
+    type=types.Type.OBJECT,
+    properties={
+        "sector": types.Schema(type=types.Type.STRING, description="섹터/테마 이름"),
+        "sentiment": types.Schema(type=types.Type.STRING, enum=list(SENTIMENTS)),
+        "score": types.Schema(type=types.Type.INTEGER, description="맑음이면 6~10, 흐림이면 1~5 (영향력 크기)"),
+        "reason": types.Schema(type=types.Type.STRING),
+        "tickers": types.Schema(
+            type=types.Type.ARRAY,
+            items=types.Schema(type=types.Type.STRING),
+            description="뉴스에 언급된 실제 종목명",
+        ),
+    },
+    required=["sector", "sentiment", "score", "tickers"],
+)
+
+# 최종 리포트 응답 스키마: Markdown 리포트 + 섹터 목록
+REPORT_RESPONSE_SCHEMA = types.Schema(
+    type=types.Type.OBJECT,
+    properties={
+        "report": types.Schema(type=types.Type.STRING, description="Markdown 형식의 최종 리포트"),
+        "sectors": types.Schema(type=types.Type.ARRAY, items=SECTOR_ITEM_SCHEMA),
+    },
+    required=["report", "sectors"],
+)
+
+# 구조화 출력 안내 문구 (프롬프트 끝에 붙임)
+STRUCTURED_OUTPUT_GUIDE = """
+**[응답 형식]**
+응답은 반드시 JSON 객체 하나로만 작성하세요.
+- "report": 위 형식의 Markdown 리포트 전문 (JSON 코드 블록은 포함하지 마세요)
+- "sectors": 섹터별 기상도에 언급한 섹터 목록. 각 항목은
+  {"sector": "반도체", "sentiment": "맑음" 또는 "흐림", "score": 맑음이면 6~10 / 흐림이면 1~5,
+   "reason": "이유 요약", "tickers": ["뉴스에 언급된 실제 종목명"]}
+"""
+
+
+def report_generation_config():
+    """최종 리포트용 구조화 출력 설정"""
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=REPORT_RESPONSE_SCHEMA,
+    )
+
+
+def normalize_sectors(records):
+    """
+    섹터 레코드를 검증/정규화합니다.
+
+    Args:
+        records: 모델이 반환한 섹터 리스트
+
+    Returns:
+        [{sector, sentiment, score, reason, tickers}, ...] (잘못된 항목은 제외)
+    """
+    if not isinstance(records, list):
+        return []
+
+    sectors = []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+
+        sector = str(record.get('sector') or '').strip()
+        if not sector:
+            continue
+
+        try:
+            score = int(round(float(record.get('score', 5))))
+        except (TypeError, ValueError):
+            score = 5
+        score = max(1, min(10, score))
+
+        sentiment = record.get('sentiment')
+        if sentiment not in SENTIMENTS:
+            sentiment = "맑음" if score >= 6 else "흐림"
+
+        tickers = record.get('tickers') or []
+        if isinstance(tickers, str):
+            tickers = [t.strip() for t in tickers.split(',')]
+        tickers = [str(t).strip() for t in tickers if str(t).strip()]
+
+        sectors.append({
+            "sector": sector,
+            "sentiment": sentiment,
+            "score": score,
+            "reason": str(record.get('reason') or ''),
+            "tickers": tickers,
+        })
+    return sectors
+
+
+def parse_structured_report(response_text):
+    """
+    구조화 출력 응답을 (Markdown 리포트, 섹터 리스트)로 분리합니다.
+
+    JSON 파싱에 실패하면 응답 전체를 리포트로 보고,
+    본문에 포함된 ```json 블록에서 섹터를 한 번 추출합니다.
+    """
+    try:
+        payload = json.loads(response_text)
+    except (TypeError, ValueError):
+        payload = None
+
+    if isinstance(payload, dict) and isinstance(payload.get('report'), str):
+        return payload['report'], normalize_sectors(payload.get('sectors'))
+
+    return response_text, extract_sectors_from_markdown(response_text)
+
+
+def extract_sectors_from_markdown(text):
+    """(구버전 호환) Markdown 본문의 ```json 블록에서 섹터 데이터를 추출합니다."""
+    try:
+        match = re.search(r'```json\s*([\s\S]*?)\s*```', text or '')
+        if match:
+            return normalize_sectors(json.loads(match.group(1)))
+    except Exception:
+        pass
+    return []
+
+
+def ensure_sectors(entry, text_key):
+    """
+    저장된 리포트/토론 항목에 `sectors` 필드를 보장합니다.
+
+    구버전 항목(필드 없음)은 본문에서 추출하여 채웁니다.
+    (EntryStore는 채운 결과를 항목 파일에 다시 저장하므로 항목마다 한 번만 추출됨)
+    """
+    if entry is not None and 'sectors' not in entry:
+        entry['sectors'] = extract_sectors_from_markdown(entry.get(text_key, ''))
+    return entry
+
+
+def sector_keywords(record):
+    """섹터 레코드의 검색 키워드 (섹터명을 '/' 등으로 나눈 부분 + 관련 종목명)"""
+    keywords = {part.strip() for part in re.split(r'[/,·]', record.get('sector', '')) if len(part.strip()) >= 2}
+    keywords.update(t for t in record.get('tickers', []) if t)
+    return keywords
+
+
+def select_sector_news(news_items, record, limit=15):
+    """섹터와 관련된 뉴스를 최신순으로 선택합니다."""
+    keywords = [k.lower() for k in sector_keywords(record)]
+    related = []
+    for item in sorted(news_items, key=lambda x: x.get('fetched_at', ''), reverse=True):
+        text = (item.get('title', '') + " " + item.get('summary', '')).lower()
+        if any(k in text for k in keywords):
+            related.append(item)
+            if len(related) >= limit:
+                break
+    return related
@@ -0,0 +1,321 @@
+"""
+섹터 기상도 시계열 모듈
+
+리포트/토론이 저장될 때마다 섹터별 (시각, 섹터, 점수, 기상, 관련주)를 추가 전용 파일에 기록하여,
+기록 보관 개수(REPORT_RETENTION 등)와 관계없이 섹터 흐름을 볼 수 있게 합니다.
+- data/sector_history/points.csv: 원본 관측값 (추가만 함)
+- data/sector_history/daily.json: 섹터별 일별 집계 {개수, 합, 제곱합} - 저장할 때 해당 날짜만 갱신
+  (기록하는 프로세스만 잠금 파일을 잡고 쓰며, 처음 기록할 때 보관 중인 리포트/토론으로 채움)
+이동 평균/추세 기울기/변동성은 일별 집계 행렬(날짜 x 섹터)에서 pandas rolling으로 한 번에 계산하므로
+관측값이 수만 건으로 늘어도 계산량은 '일수 x 섹터 수'에만 비례합니다.
+최신 통계(summary)는 읽을 때 오늘 기준 구간으로 계산하므로 저장이 없던 날에도 구간이 함께 이동합니다.
+점수는 1~10 (맑음 6~10, 흐림 1~5)으로, 높을수록 긍정적입니다.
+"""
+
+import csv
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.entry_store import get_debate_store, get_report_store
+from src.file_lock import MUTEX_STALE, file_lock
+
+
+HISTORY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'sector_history')
+POINTS_FILE = os.path.join(HISTORY_DIR, 'points.csv')
+DAILY_FILE = os.path.join(HISTORY_DIR, 'daily.json')
+LOCK_FILE = os.path.join(HISTORY_DIR, 'history.lock')
+
+# 잠금 대기 시간 (초) - 종료된 프로세스가 남긴 잠금도 해제될 만큼 기다림
+LOCK_WAIT = MUTEX_STALE + 5
+
+POINT_FIELDS = ["timestamp", "kind", "entry_id", "sector", "sentiment", "score", "tickers"]
+
+# 이동 평균 기간 (일) / 추세 기울기 계산 기간 (일) / 변동성 계산 기간 (일)
+SHORT_WINDOW = 7
+LONG_WINDOW = 28
+SLOPE_WINDOW = 14
+
+
+def _rolling_slope(values, window):
+    """
+    일별 평균 행렬(날짜 x 섹터)의 이동 선형회귀 기울기 (점수/일, 관측 없는 날은 제외)
+
+    Σx, Σy, Σxy, Σx² 를 rolling 합으로 구해 모든 섹터를 한 번에 계산합니다.
+    """
+    observed = values.notna()
+    x = pd.DataFrame(
+        np.broadcast_to(np.arange(len(values), dtype=float)[:, None], values.shape),
+        index=values.index, columns=values.columns,
+    ).where(observed, 0.0)
+    y = values.fillna(0.0)
+
+    def rolling_sum(frame):
+        return frame.rolling(window, min_periods=1).sum()
+
+    n = rolling_sum(observed.astype(float))
+    sx, sy = rolling_sum(x), rolling_sum(y)
+    sxy, sxx = rolling_sum(x * y), rolling_sum(x * x)
+    denominator = n * sxx - sx * sx
+    slope = (n * sxy - sx * sy) / denominator.where(denominator > 0)
+    return slope.where(n >= 2)
+
+
+def rolling_aggregates(daily, since=None):
+    """
+    일별 집계에서 이동 통계 계산
+
+    Args:
+        daily: {섹터: {날짜: [개수, 합, 제곱합]}}
+        since: 이 날짜(YYYY-MM-DD)부터의 집계만 사용 (None이면 전체)
+
+    Returns:
+        {"mean": 일별 평균, "mean_short", "mean_long", "slope", "volatility", "count"}
+        각 값은 날짜(오늘까지 빈 날 포함) x 섹터 DataFrame
+    """
+    rows = [
+        (sector, day, count, total, total_sq)
+        for sector, days in daily.items()
+        for day, (count, total, total_sq) in days.items()
+        if since is None or day >= since
+    ]
+    if not rows:
+        return None
+
+    frame = pd.DataFrame(rows, columns=["sector", "date", "count", "sum", "sumsq"])
+    frame["date"] = pd.to_datetime(frame["date"])
+    dates = pd.date_range(frame["date"].min(), max(frame["date"].max(), pd.Timestamp(datetime.now().date())))
+
+    def wide(column):
+        return frame.pivot(index="date", columns="sector", values=column).reindex(dates).fillna(0.0)
+
+    count, total, total_sq = wide("count"), wide("sum"), wide("sumsq")
+
+    def window_stats(window):
+        n = count.rolling(window, min_periods=1).sum()
+        s = total.rolling(window, min_periods=1).sum()
+        sq = total_sq.rolling(window, min_periods=1).sum()
+        mean = s / n.where(n > 0)
+        variance = (sq / n.where(n > 0) - mean * mean).clip(lower=0)
+        return mean, np.sqrt(variance)
+
+    daily_mean = total / count.where(count > 0)
+    mean_short, _ = window_stats(SHORT_WINDOW)
+    mean_long, volatility = window_stats(LONG_WINDOW)
+    return {
+        "mean": daily_mean,
+        "mean_short": mean_short,
+        "mean_long": mean_long,
+        "slope": _rolling_slope(daily_mean, SLOPE_WINDOW),
+        "volatility": volatility,
+        "count": count,
+    }
+
+
+def summarize(daily, latest=None):
+    """
+    섹터별 최신 통계 (오늘 기준 이동 구간으로 계산 - 저장이 없던 날에도 구간이 함께 이동)
+
+    최신 값에는 가장 긴 기간만 필요하므로 그 구간의 일별 집계만 사용합니다.
+
+    Args:
+        daily: {섹터: {날짜: [개수, 합, 제곱합]}}
+        latest: {섹터: 마지막 관측 {timestamp, sentiment, score}}
+
+    Returns:
+        [{sector, observations, mean_short, mean_long, slope, volatility, as_of, latest}, ...] (관측 수 많은 순)
+    """
+    today = datetime.now().date()
+    since = (today - timedelta(days=max(LONG_WINDOW, SLOPE_WINDOW) - 1)).isoformat()
+    aggregates = rolling_aggregates(daily, since)
+
+    def value(name, sector, digits):
+        if aggregates is None or sector not in aggregates[name].columns:
+            return None
+        number = aggregates[name][sector].iloc[-1]
+        return None if pd.isna(number) else round(float(number), digits)
+
+    latest = latest or {}
+    rows = [
+        {
+            "sector": sector,
+            "observations": int(sum(bucket[0] for bucket in days.values())),
+            "mean_short": value("mean_short", sector, 2),
+            "mean_long": value("mean_long", sector, 2),
+            "slope": value("slope", sector, 3),
+            "volatility": value("volatility", sector, 2),
+            "as_of": today.isoformat(),
+            "latest": latest.get(sector),
+        }
+        for sector, days in daily.items()
+    ]
+    return sorted(rows, key=lambda row: row["observations"], reverse=True)
+
+
+class SectorHistory:
+    """섹터 점수 시계열 저장소 (싱글톤)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(SectorHistory, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._state_lock = threading.Lock()
+
+    def _load(self):
+        """집계 파일 (없으면 빈 집계)"""
+        try:
+            with open(DAILY_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"daily": {}, "latest": {}, "points": 0}
+
+    def _save(self, state):
+        tmp_path = f"{DAILY_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, DAILY_FILE)
+
+    def _seed(self, state, skip_id):
+        """
+        처음 기록할 때 보관 중인 리포트/토론 목록으로 채움 (record에서 잠금을 잡은 상태로만 호출)
+
+        Args:
+            skip_id: 방금 저장되어 목록에 이미 들어 있는, 이어서 기록할 기록 ID (중복 방지)
+        """
+        seeded = 0
+        for kind, store in (("report", get_report_store()), ("debate", get_debate_store())):
+            # 목록 파일에 섹터 요약(관련주 제외)이 있으므로 본문은 읽지 않음
+            for row in reversed(store.list(0, store.retention)):
+                if row["id"] != skip_id:
+                    seeded += self._append_points(state, kind, row["id"], row)
+        if seeded:
+            print(f"Sector history seeded with {seeded} points from stored reports/debates")
+
+    def _append_points(self, state, kind, entry_id, entry):
+        """관측값을 기록하고 일별 집계를 갱신 (record에서 잠금을 잡은 상태로만 호출). 기록한 개수 반환"""
+        timestamp = entry.get("timestamp") or datetime.now().isoformat()
+        points = [
+            {
+                "timestamp": timestamp,
+                "kind": kind,
+                "entry_id": entry_id or "",
+                "sector": str(record["sector"]).strip(),
+                "sentiment": record.get("sentiment", ""),
+                "score": int(record["score"]),
+                "tickers": "|".join(record.get("tickers") or []),
+            }
+            for record in entry.get("sectors", [])
+            if record.get("sector") and record.get("score") is not None
+        ]
+        if not points:
+            return 0
+
+        new_file = not os.path.exists(POINTS_FILE)
+        with open(POINTS_FILE, 'a', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=POINT_FIELDS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(points)
+
+        day = timestamp[:10]
+        for point in points:
+            bucket = state["daily"].setdefault(point["sector"], {}).setdefault(day, [0, 0.0, 0.0])
+            bucket[0] += 1
+            bucket[1] += point["score"]
+            bucket[2] += point["score"] ** 2
+        state["points"] += len(points)
+        state.setdefault("latest", {}).update({
+            point["sector"]: {"timestamp": timestamp, "sentiment": point["sentiment"], "score": point["score"]}
+            for point in points
+        })
+        return len(points)
+
+    def record(self, kind, entry, entry_id=None):
+        """
+        저장된 리포트/토론의 섹터 점수를 기록합니다. (save_report / save_debate_log 직후 호출)
+
+        기록하는 쪽만 집계 파일을 쓰며, 여러 프로세스가 동시에 저장해도 잠금 파일로 순서대로 갱신합니다.
+
+        Args:
+            kind: "report" 또는 "debate"
+            entry: 저장한 기록 (timestamp, sectors 사용)
+            entry_id: 기록 저장소 ID
+        """
+        try:
+            os.makedirs(HISTORY_DIR, exist_ok=True)
+            with self._state_lock, file_lock(LOCK_FILE, wait=LOCK_WAIT) as locked:
+                if not locked:
+                    print("Sector history record skipped: lock not acquired")
+                    return
+                # 다른 프로세스가 기록한 최신 집계 위에 더함
+                state = self._load()
+                if not state["daily"] and not os.path.exists(POINTS_FILE):
+                    self._seed(state, entry_id)
+                self._append_points(state, kind, entry_id, entry)
+                self._save(state)
+        except Exception as e:
+            print(f"Sector history record error: {e}")
+
+    def summary(self):
+        """
+        섹터별 최신 통계 (관측 수 많은 순, 읽을 때마다 오늘 기준으로 계산)
+
+        Returns:
+            [{sector, observations, mean_short, mean_long, slope, volatility, as_of, latest}, ...]
+        """
+        state = self._load()
+        return summarize(state["daily"], state.get("latest"))
+
+    def trend_frame(self, days=30, sectors=None):
+        """
+        차트용 일별 추세 (최근 days일)
+
+        Returns:
+            DataFrame [date, sector, daily_mean, mean_short, mean_long] (관측이 없는 섹터/날은 NaN)
+        """
+        daily = {
+            sector: buckets for sector, buckets in self._load()["daily"].items()
+            if sectors is None or sector in sectors
+        }
+        aggregates = rolling_aggregates(daily)
+        if aggregates is None:
+            return pd.DataFrame(columns=["date", "sector", "daily_mean", "mean_short", "mean_long"])
+
+        columns = {"daily_mean": "mean", "mean_short": "mean_short", "mean_long": "mean_long"}
+        frames = []
+        for name, key in columns.items():
+            frame = aggregates[key].iloc[-days:]
+            frames.append(frame.rename_axis("date").reset_index().melt(
+                id_vars="date", var_name="sector", value_name=name,
+            ))
+        trend = frames[0]
+        for frame in frames[1:]:
+            trend = trend.merge(frame, on=["date", "sector"])
+        return trend
+
+    def points(self, sector=None):
+        """원본 관측값 (분석/내보내기용)"""
+        if not os.path.exists(POINTS_FILE):
+            return pd.DataFrame(columns=POINT_FIELDS)
+        points = pd.read_csv(POINTS_FILE, dtype={"entry_id": str, "tickers": str}, keep_default_na=False)
+        return points[points["sector"] == sector] if sector else points
+
+
+def get_sector_history():
+    return SectorHistory()
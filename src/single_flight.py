@@ -0,0 +1,103 @@
+"""
+Single-flight 요청 병합 모듈
+
+같은 토론 작업(심층 토론 섹터 수 + 뉴스 윈도우 지문)이 동시에 여러 번 요청되면
+첫 요청만 실제로 실행하고 나머지는 진행 중인 작업에 합류합니다. (debate_jobs)
+완료 후에도 짧은 재사용 기간 동안은 같은 작업을 돌려주며, 실패한 작업은 재사용하지 않습니다.
+한 프로세스 안의 요청만 병합합니다. (다른 프로세스/레플리카의 같은 요청은 따로 실행됨)
+"""
+
+import threading
+import time
+
+
+# 완료된 결과를 재사용하는 기간 (초)
+REUSE_WINDOW = 120
+
+
+class _Flight:
+    def __init__(self, future):
+        self.future = future
+        self.finished_at = None
+
+
+class SingleFlight:
+    """키별 진행 중/최근 완료 실행 테이블 (싱글톤)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(SingleFlight, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.reuse_window = REUSE_WINDOW
+        self._flights = {}
+        self._table_lock = threading.Lock()
+        self.stats = {"started": 0, "attached": 0}
+
+    def _usable(self, key):
+        """합류/재사용 가능한 실행 (호출 전 _table_lock 필요)"""
+        flight = self._flights.get(key)
+        if flight is None:
+            return None
+        if not flight.future.done():
+            return flight
+        if flight.finished_at is None:
+            # 결과는 나왔지만 완료 콜백이 아직 실행되지 않음 (방금 끝난 실행)
+            flight.finished_at = time.monotonic()
+        if flight.future.exception() is None and time.monotonic() - flight.finished_at < self.reuse_window:
+            return flight
+        del self._flights[key]
+        return None
+
+    def _track(self, key, future):
+        # 재사용 기간이 지난 완료 항목 정리
+        now = time.monotonic()
+        for old_key in [k for k, f in self._flights.items()
+                        if f.finished_at is not None and now - f.finished_at >= self.reuse_window]:
+            del self._flights[old_key]
+
+        flight = _Flight(future)
+
+        def on_done(f):
+            if flight.finished_at is None:
+                flight.finished_at = time.monotonic()
+
+        future.add_done_callback(on_done)
+        self._flights[key] = flight
+        self.stats["started"] += 1
+        return flight
+
+    def submit(self, key, start):
+        """
+        비동기 실행 병합
+
+        Args:
+            key: (작업 종류, 지문) 튜플
+            start: 실행을 시작하고 concurrent.futures.Future를 반환하는 함수
+
+        Returns:
+            (Future, 합류 여부)
+        """
+        with self._table_lock:
+            flight = self._usable(key)
+            if flight is not None:
+                self.stats["attached"] += 1
+                return flight.future, True
+            future = start()
+            self._track(key, future)
+            return future, False
+
+
+def get_single_flight():
+    return SingleFlight()
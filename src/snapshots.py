@@ -0,0 +1,166 @@
+"""
+JSON 스냅샷 모듈
+
+모바일 등 가벼운 클라이언트가 Streamlit 앱을 띄우지 않고도 최신 결과를 볼 수 있도록,
+조회용 JSON을 미리 만들어 data/snapshots/에 저장합니다. (snapshot_server.py가 그대로 전송)
+- latest_debate: 최신 토론 요약 / sectors: 섹터 기상도 / today_news: 금일 뉴스 / status: 스케줄러 상태
+- 스냅샷마다 원본(.json)과 gzip 압축본(.json.gz)을 함께 저장하고, 내용 해시를 ETag로 씁니다.
+- 스케줄러(수집/상태 기록)와 토론 작업이 데이터를 저장할 때만 다시 만들며,
+  내용이 같으면 파일을 다시 쓰지 않으므로 ETag도 그대로 유지됩니다.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from src.data_manager import DATA_DIR, DataManager, filter_today_news
+from src.entry_store import get_debate_store
+
+
+SNAPSHOT_DIR = os.path.join(DATA_DIR, 'snapshots')
+MANIFEST_FILE = os.path.join(SNAPSHOT_DIR, 'manifest.json')
+
+SNAPSHOT_NAMES = ("latest_debate", "sectors", "today_news", "status")
+
+# 금일 뉴스 스냅샷 최대 개수
+TODAY_NEWS_LIMIT = 100
+# 공개하는 뉴스 항목 필드
+NEWS_FIELDS = ("title", "link", "source", "category", "published", "tickers")
+
+_write_lock = threading.Lock()
+
+
+def snapshot_paths(name):
+    """(원본 경로, gzip 경로)"""
+    return os.path.join(SNAPSHOT_DIR, f"{name}.json"), os.path.join(SNAPSHOT_DIR, f"{name}.json.gz")
+
+
+def load_manifest():
+    """{스냅샷 이름: {etag, updated_at, size, gzip_size}}"""
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _atomic_write(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(name, payload):
+    """
+    스냅샷 하나를 저장합니다. 내용이 이전과 같으면 아무것도 쓰지 않습니다.
+
+    Returns:
+        내용이 바뀌어 새로 저장했으면 True
+    """
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    etag = hashlib.sha256(body).hexdigest()[:32]
+
+    with _write_lock:
+        manifest = load_manifest()
+        if manifest.get(name, {}).get("etag") == etag:
+            return False
+
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        # 압축 결과가 항상 같도록 mtime을 고정 (같은 내용이면 같은 바이트)
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        json_path, gzip_path = snapshot_paths(name)
+        _atomic_write(json_path, body)
+        _atomic_write(gzip_path, compressed)
+
+        manifest[name] = {
+            "etag": etag,
+            "updated_at": datetime.now().isoformat(),
+            "size": len(body),
+            "gzip_size": len(compressed),
+        }
+        _atomic_write(MANIFEST_FILE, json.dumps(manifest, indent=4, ensure_ascii=False).encode('utf-8'))
+        return True
+
+
+def _debate_snapshots():
+    debate = get_debate_store().latest()
+    if not debate:
+        return {"latest_debate": None, "sectors": {"timestamp": None, "sectors": []}}
+
+    convergence = debate.get("convergence") or {}
+    summary = {
+        "debate_id": debate.get("debate_id"),
+        "timestamp": debate.get("timestamp"),
+        "news_count": debate.get("news_count"),
+        "final_report": debate.get("final_report", ""),
+        "rounds": len(debate.get("rounds", [])),
+        "convergence": convergence.get("verdict"),
+        "sector_debates": [item.get("sector") for item in debate.get("sector_debates", [])],
+    }
+    sectors = {"timestamp": debate.get("timestamp"), "sectors": debate.get("sectors", [])}
+    return {"latest_debate": summary, "sectors": sectors}
+
+
+def _today_news_snapshot():
+    today_news = filter_today_news(DataManager().load_news())
+    return {
+        "date": datetime.now().date().isoformat(),
+        "count": len(today_news),
+        "items": [{field: item.get(field) for field in NEWS_FIELDS} for item in today_news[:TODAY_NEWS_LIMIT]],
+    }
+
+
+def status_snapshot(status):
+    """
+    스케줄러 상태 스냅샷 (하트비트마다 바뀌는 갱신 시각은 빼서 작업 상태가 바뀔 때만 ETag가 바뀜)
+
+    Args:
+        status: 스케줄러가 기록한 상태 (BackgroundScheduler._write_status)
+    """
+    return {
+        "leader": status["leader"].rsplit(':', 1)[0],
+        "session": status["session"],
+        "jobs": [{
+            "name": job["name"],
+            "label": job["label"],
+            "state": job["state"],
+            "last_run": job["last_run"],
+            "next_run": job["next_run"],
+            "last_result": job["last_result"],
+        } for job in status["jobs"]],
+        "trigger": {
+            "pending": status["trigger"]["pending"],
+            "last_fired": status["trigger"]["last_fired"],
+        },
+    }
+
+
+def refresh_snapshots(names=None, status=None):
+    """
+    스냅샷을 다시 만듭니다. (데이터를 저장한 쪽에서 호출)
+
+    Args:
+        names: 다시 만들 스냅샷 이름 (기본값: 전체, status는 status 인자가 있을 때만)
+        status: 스케줄러 상태 (status 스냅샷용)
+
+    Returns:
+        내용이 바뀐 스냅샷 이름 리스트
+    """
+    names = names or SNAPSHOT_NAMES
+    payloads = {}
+    try:
+        if "latest_debate" in names or "sectors" in names:
+            payloads.update(_debate_snapshots())
+        if "today_news" in names:
+            payloads["today_news"] = _today_news_snapshot()
+        if "status" in names and status is not None:
+            payloads["status"] = status_snapshot(status)
+
+        return [name for name in names if name in payloads and write_snapshot(name, payloads[name])]
+    except Exception as e:
+        print(f"Snapshot refresh error: {e}")
+        return []
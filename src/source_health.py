@@ -0,0 +1,149 @@
+"""
+소스별 서킷 브레이커 모듈
+
+사이트 장애나 선택자 불일치로 계속 실패하는 소스를 잠시 수집 대상에서 제외합니다.
+- closed: 정상. 연속 FAILURE_THRESHOLD번 실패(요청 오류 또는 0건 파싱)하면 open
+- open: 수집하지 않음. 대기 시간은 차단될 때마다 두 배 (BASE_BACKOFF ~ MAX_BACKOFF)
+- half_open: 대기 시간이 지나면 한 번만 시험 수집. 성공하면 closed, 실패하면 다시 open
+상태는 data/source_health.json에 저장되어 재시작 후에도 유지되고 관리자 화면에서 조회됩니다.
+리더 프로세스만 수집하므로, 새로 리더가 된 프로세스는 이전 리더의 상태를 다시 읽고 시작합니다.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+
+STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'source_health.json')
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 연속 실패 몇 번에 차단할지
+FAILURE_THRESHOLD = 3
+# 첫 차단 대기 시간 / 최대 대기 시간 (초)
+BASE_BACKOFF = 300
+MAX_BACKOFF = 6 * 3600
+
+
+class SourceHealth:
+    """소스별 서킷 브레이커 상태 (싱글톤)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(SourceHealth, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._state_lock = threading.Lock()
+        self.state = self._load()
+
+    def _load(self):
+        try:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def reload(self):
+        """다른 프로세스(이전 리더)가 기록한 최신 상태를 다시 읽음 (리더가 되었을 때)"""
+        with self._state_lock:
+            self.state = self._load()
+
+    def _save(self):
+        tmp_path = f"{STATE_FILE}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, STATE_FILE)
+        except OSError as e:
+            print(f"Error saving source health state: {e}")
+
+    def _entry(self, source_id):
+        return self.state.setdefault(source_id, {
+            "state": CLOSED, "failures": 0, "trips": 0, "open_until": None, "last_error": None,
+        })
+
+    def available(self, source_id, now=None):
+        """수집 가능 여부 (상태를 바꾸지 않음)"""
+        now = now or datetime.now()
+        entry = self.state.get(source_id)
+        if not entry or entry["state"] != OPEN:
+            return True
+        return now >= datetime.fromisoformat(entry["open_until"])
+
+    def allow(self, source_id, now=None):
+        """
+        지금 요청해도 되는지 확인합니다.
+
+        open 상태에서 대기 시간이 지났으면 half_open으로 바꾸고 시험 요청 한 번을 허용합니다.
+        """
+        now = now or datetime.now()
+        with self._state_lock:
+            entry = self._entry(source_id)
+            if entry["state"] == OPEN:
+                if now < datetime.fromisoformat(entry["open_until"]):
+                    return False
+                entry["state"] = HALF_OPEN
+                print(f"Circuit half-open, probing {source_id}")
+                self._save()
+            return True
+
+    def record_success(self, source_id, now=None):
+        now = now or datetime.now()
+        with self._state_lock:
+            entry = self._entry(source_id)
+            if entry["state"] != CLOSED:
+                print(f"Circuit closed for {source_id}")
+            entry.update(state=CLOSED, failures=0, trips=0, open_until=None)
+            entry["last_success"] = now.isoformat()
+            self._save()
+
+    def record_failure(self, source_id, error, now=None):
+        """
+        실패를 기록합니다. 시험 요청이 실패했거나 연속 실패가 한도에 이르면 차단합니다.
+
+        Args:
+            source_id: 소스 ID
+            error: 실패 사유 (요청 오류 메시지 또는 '0건 파싱')
+        """
+        now = now or datetime.now()
+        with self._state_lock:
+            entry = self._entry(source_id)
+            entry["failures"] += 1
+            entry["last_error"] = error
+            entry["last_failure"] = now.isoformat()
+
+            if entry["state"] == HALF_OPEN or entry["failures"] >= FAILURE_THRESHOLD:
+                entry["trips"] += 1
+                backoff = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (entry["trips"] - 1))
+                entry["state"] = OPEN
+                entry["open_until"] = (now + timedelta(seconds=backoff)).isoformat()
+                print(f"Circuit open for {source_id} ({error}), retry in {backoff}s")
+            self._save()
+
+    def states(self, source_ids):
+        """관리자 화면용 소스별 상태 (다른 프로세스가 기록한 최신 상태를 읽음)"""
+        with self._state_lock:
+            if os.path.exists(STATE_FILE):
+                self.state = self._load()
+            return {
+                source_id: dict(self.state.get(source_id) or {"state": CLOSED, "failures": 0, "trips": 0})
+                for source_id in source_ids
+            }
+
+
+def get_source_health():
+    return SourceHealth()
@@ -0,0 +1,185 @@
+"""
+소스별 적응형 수집 주기 모듈
+
+소스마다 최근 새 기사 수(수율)를 지수 평활(EMA)로 추적하여 다음 수집 주기를 정합니다.
+- 새 기사가 많은 소스는 자주, 적은 소스는 드물게 수집합니다.
+- 주기는 시장 세션별 기본 주기(market_calendar.crawl_interval)의 MIN_FACTOR~MAX_FACTOR배,
+  그리고 MIN_INTERVAL~MAX_INTERVAL초 범위로 제한됩니다.
+- 한 번에 새 기사가 급증하면(속보 폭주) 평활값과 관계없이 바로 최소 주기로 돌아갑니다.
+상태는 data/source_polling.json에 저장되어 재시작 후에도 유지되고 관리자 화면에서 조회됩니다.
+리더 프로세스만 기록하므로, 새로 리더가 된 프로세스는 이전 리더의 상태를 다시 읽고 시작합니다.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from src.news_crawler import SOURCES, enabled_sources
+from src.source_health import get_source_health
+
+
+STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'source_polling.json')
+
+# 수율 평활 계수 (클수록 최근 수집 결과를 크게 반영)
+ALPHA = 0.3
+# 수집 한 번에 기대하는 새 기사 수 (이보다 많으면 주기를 줄이고, 적으면 늘림)
+TARGET_NEW_PER_POLL = 3
+# 기본 주기 대비 배율 한도
+MIN_FACTOR = 0.25
+MAX_FACTOR = 6
+# 절대 한도 (초)
+MIN_INTERVAL = 60
+MAX_INTERVAL = 3600
+# 폭주 판정: 기대치의 BURST_RATIO배 이상이면서 BURST_MIN_NEW건 이상, 또는 페이지 전체가 새 기사
+BURST_RATIO = 3
+BURST_MIN_NEW = 5
+
+
+class SourcePoller:
+    """소스별 수율 추적 및 수집 시점 결정 (싱글톤)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(SourcePoller, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._state_lock = threading.Lock()
+        self.state = self._load()
+
+    def _load(self):
+        try:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def reload(self):
+        """다른 프로세스(이전 리더)가 기록한 최신 상태를 다시 읽음 (리더가 되었을 때)"""
+        with self._state_lock:
+            self.state = self._load()
+
+    def _save(self):
+        tmp_path = f"{STATE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, STATE_FILE)
+
+    def interval_for(self, source_id, base_interval):
+        """
+        소스의 현재 수집 주기 (초)
+
+        Args:
+            source_id: 소스 ID
+            base_interval: 현재 세션의 기본 수집 주기 (초)
+        """
+        lower = int(max(MIN_INTERVAL, base_interval * MIN_FACTOR))
+        upper = int(min(MAX_INTERVAL, max(lower, base_interval * MAX_FACTOR)))
+
+        entry = self.state.get(source_id)
+        if not entry or entry.get("ema_rate") is None:
+            return base_interval
+        if entry.get("burst"):
+            return lower
+
+        # ema_rate: 분당 새 기사 수 -> 기대 수율(TARGET_NEW_PER_POLL)을 채우는 데 걸리는 시간
+        rate = entry["ema_rate"]
+        interval = TARGET_NEW_PER_POLL * 60 / rate if rate > 0 else upper
+        return int(min(upper, max(lower, interval)))
+
+    def due_sources(self, base_interval, now=None):
+        """지금 수집할 차례인 소스 ID 목록 (서킷이 열린 소스 제외)"""
+        now = now or datetime.now()
+        health = get_source_health()
+        due = []
+        with self._state_lock:
+            for source_id in enabled_sources():
+                # 서킷이 열린 소스는 재시도 시각 전까지 제외
+                if not health.available(source_id, now):
+                    continue
+                entry = self.state.get(source_id)
+                if not entry or not entry.get("last_polled"):
+                    due.append(source_id)
+                    continue
+                elapsed = (now - datetime.fromisoformat(entry["last_polled"])).total_seconds()
+                if elapsed >= self.interval_for(source_id, base_interval):
+                    due.append(source_id)
+        return due
+
+    def record(self, yields, base_interval, now=None):
+        """
+        수집 결과를 반영합니다.
+
+        Args:
+            yields: {소스 ID: {"fetched": 수집 수, "new": 새 뉴스 수}}
+            base_interval: 현재 세션의 기본 수집 주기 (초)
+        """
+        now = now or datetime.now()
+        with self._state_lock:
+            for source_id, result in yields.items():
+                entry = self.state.setdefault(source_id, {"ema_rate": None, "polls": 0, "bursts": 0})
+                new = result["new"]
+
+                if entry.get("last_polled"):
+                    elapsed = (now - datetime.fromisoformat(entry["last_polled"])).total_seconds()
+                else:
+                    elapsed = base_interval
+                rate = new * 60 / max(elapsed, 1)
+
+                expected = (entry["ema_rate"] or 0) * elapsed / 60
+                page_full = result["fetched"] > 0 and new >= SOURCES[source_id]["max_items"]
+                burst = page_full or (new >= BURST_MIN_NEW and new >= BURST_RATIO * max(expected, 1))
+
+                if entry["ema_rate"] is None or burst:
+                    # 첫 수집이거나 폭주: 평활 없이 현재 수율로 재설정
+                    entry["ema_rate"] = rate
+                else:
+                    entry["ema_rate"] = ALPHA * rate + (1 - ALPHA) * entry["ema_rate"]
+
+                entry["burst"] = burst
+                entry["bursts"] += int(burst)
+                entry["polls"] += 1
+                entry["last_polled"] = now.isoformat()
+                entry["last_new"] = new
+                entry["last_fetched"] = result["fetched"]
+
+            try:
+                self._save()
+            except OSError as e:
+                print(f"Error saving source polling state: {e}")
+
+    def states(self, base_interval):
+        """관리자 화면용 소스별 상태 (다른 프로세스가 기록한 최신 상태를 읽음)"""
+        with self._state_lock:
+            if os.path.exists(STATE_FILE):
+                self.state = self._load()
+            rows = []
+            for source_id in enabled_sources():
+                entry = self.state.get(source_id, {})
+                rows.append({
+                    "source_id": source_id,
+                    "label": SOURCES[source_id]["label"],
+                    "ema_rate": entry.get("ema_rate"),
+                    "interval": self.interval_for(source_id, base_interval),
+                    "last_polled": entry.get("last_polled"),
+                    "last_new": entry.get("last_new"),
+                    "polls": entry.get("polls", 0),
+                    "bursts": entry.get("bursts", 0),
+                    "burst": entry.get("burst", False),
+                })
+            return rows
+
+
+def get_source_poller():
+    return SourcePoller()
@@ -0,0 +1,271 @@
+"""
+정적 HTML 내보내기 모듈
+
+리포트/토론이 저장될 때마다 최신 리포트, 토론 라운드, 섹터 차트를 정적 HTML로 만들어
+data/site/에 저장합니다. 아무 정적 파일 서버로나 제공할 수 있어 조회가 많아도 비용이 거의 들지 않습니다.
+- data/site/reports/<버전>/index.html: 저장 시각으로 구분한 버전별 페이지 (SITE_RETENTION개 보관)
+- data/site/index.html: 최신 버전과 같은 내용 + 지난 버전 목록
+- data/site/assets/plotly-<버전>.min.js: plotly.js (처음 한 번만 복사)
+차트는 plotly 그림 JSON을 페이지에 그대로 넣어 브라우저에서 그립니다.
+"""
+
+import html
+import json
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+
+from src.charts import build_sector_figure, sector_dataframe
+from src.data_manager import DATA_DIR
+from src.entry_store import get_debate_store, get_report_store
+
+
+SITE_DIR = os.path.join(DATA_DIR, 'site')
+REPORTS_DIR = os.path.join(SITE_DIR, 'reports')
+ASSETS_DIR = os.path.join(SITE_DIR, 'assets')
+
+# 보관할 버전 수
+SITE_RETENTION = 30
+
+# 라운드별 의견 표시 순서: (키, 제목)
+ROUND_OPINIONS = {
+    1: [("bull", "🐂 Bull AI"), ("bear", "🐻 Bear AI"), ("analyst", "📊 Analyst AI")],
+    2: [("bull_rebuttal", "🐂 Bull의 반박"), ("bear_rebuttal", "🐻 Bear의 반박"), ("analyst_verdict", "📊 Analyst의 검증")],
+    3: [("bull_final", "🐂 Bull의 재반박"), ("bear_final", "🐻 Bear의 재반박")],
+}
+VERDICT_LABELS = {"converged": "🤝 의견 수렴", "mixed": "↔️ 일부 엇갈림", "divergent": "⚡ 의견 대립"}
+
+PAGE_STYLE = """
+body { font-family: -apple-system, 'Malgun Gothic', sans-serif; max-width: 960px; margin: 0 auto; padding: 16px; color: #31333F; line-height: 1.6; }
+h1 { font-size: 26px; } h2 { font-size: 21px; border-bottom: 1px solid #eee; padding-bottom: 4px; margin-top: 32px; }
+details { background: #f0f2f6; border-radius: 8px; padding: 8px 14px; margin: 8px 0; }
+summary { cursor: pointer; font-weight: bold; }
+.caption { color: #888; font-size: 13px; }
+.chart { width: 100%; height: 450px; }
+@media only screen and (max-width: 600px) { h1 { font-size: 22px; } h2 { font-size: 18px; } }
+"""
+
+_export_lock = threading.Lock()
+
+
+def _inline_markdown(text):
+    text = html.escape(text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    return re.sub(r'\[([^\]]+)\]\((https?://[^)\s]+)\)', r'<a href="\2" target="_blank">\1</a>', text)
+
+
+def markdown_to_html(text):
+    """리포트용 간단한 마크다운 변환 (제목, 목록, 굵게, 링크, 문단)"""
+    parts = []
+    paragraph = []
+    in_list = False
+
+    def flush_paragraph():
+        if paragraph:
+            parts.append(f"<p>{'<br>'.join(paragraph)}</p>")
+            paragraph.clear()
+
+    for line in (text or "").splitlines():
+        stripped = line.strip()
+        heading = re.match(r'^(#{1,6})\s+(.*)$', stripped)
+        item = re.match(r'^[-*]\s+(.*)$', stripped)
+        if item:
+            flush_paragraph()
+            if not in_list:
+                parts.append("<ul>")
+                in_list = True
+            parts.append(f"<li>{_inline_markdown(item.group(1))}</li>")
+            continue
+        if in_list:
+            parts.append("</ul>")
+            in_list = False
+        if heading:
+            flush_paragraph()
+            level = min(len(heading.group(1)) + 2, 6)  # 페이지 제목(h1/h2) 아래 단계로
+            parts.append(f"<h{level}>{_inline_markdown(heading.group(2))}</h{level}>")
+        elif stripped:
+            paragraph.append(_inline_markdown(stripped))
+        else:
+            flush_paragraph()
+    flush_paragraph()
+    if in_list:
+        parts.append("</ul>")
+    return "\n".join(parts)
+
+
+def _plotly_asset():
+    """plotly.js 파일 이름 (없으면 한 번 복사)"""
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    filename = f"plotly-{plotly.__version__}.min.js"
+    path = os.path.join(ASSETS_DIR, filename)
+    if not os.path.exists(path):
+        os.makedirs(ASSETS_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        os.replace(tmp_path, path)
+    return filename
+
+
+def _chart_html(sectors, asset_url):
+    if not sectors:
+        return "<p>섹터 데이터가 없습니다.</p>"
+    figure_json = build_sector_figure(sector_dataframe(sectors)).to_json()
+    # </script>가 JSON 안에 있어도 스크립트가 끊기지 않도록
+    figure_json = figure_json.replace("</", "<\\/")
+    return f"""<div id="sector-chart" class="chart"></div>
+<script type="application/json" id="sector-chart-data">{figure_json}</script>
+<script src="{asset_url}"></script>
+<script>
+  var fig = JSON.parse(document.getElementById('sector-chart-data').textContent);
+  Plotly.newPlot('sector-chart', fig.data, fig.layout, {{responsive: true, displayModeBar: false}});
+</script>"""
+
+
+def _debate_html(debate):
+    parts = []
+    convergence = debate.get("convergence")
+    if convergence:
+        caption = f"{VERDICT_LABELS.get(convergence['verdict'], convergence['verdict'])} (일치도 {convergence.get('agreement', 0):.0%})"
+        if convergence.get("contested"):
+            caption += f" · 쟁점 섹터: {', '.join(convergence['contested'])}"
+        parts.append(f'<p class="caption">{html.escape(caption)}</p>')
+
+    parts.append(markdown_to_html(debate.get("final_report", "")))
+
+    for round_ in sorted(debate.get("rounds", []), key=lambda r: r.get("round", 0)):
+        opinions = round_.get("opinions", {})
+        body = "".join(
+            f"<h4>{title}</h4>{markdown_to_html(opinions[key])}"
+            for key, title in ROUND_OPINIONS.get(round_.get("round"), []) if key in opinions
+        )
+        parts.append(f"<details><summary>Round {round_.get('round')}: {html.escape(round_.get('title', ''))}</summary>{body}</details>")
+
+    for entry in debate.get("sector_debates", []):
+        icon = "☀️" if entry.get("sentiment") == "맑음" else "☔"
+        body = "".join(
+            f"<h4>{title}</h4>{markdown_to_html(entry[key])}"
+            for key, title in (("bull", "🐂 Bull"), ("bear", "🐻 Bear"), ("verdict", "📊 Analyst 판정")) if key in entry
+        )
+        if entry.get("news"):
+            body += "<h4>📰 관련 뉴스</h4><ul>" + "".join(
+                f'<li><a href="{html.escape(item["link"])}" target="_blank">{html.escape(item["title"])}</a> '
+                f'<span class="caption">{html.escape(item["source"])}</span></li>'
+                for item in entry["news"]
+            ) + "</ul>"
+        summary = f"{icon} {entry['sector']} ({entry.get('score', '-')}/10, 관련 뉴스 {entry.get('news_count', 0)}건)"
+        parts.append(f"<details><summary>{html.escape(summary)}</summary>{body}</details>")
+    return "\n".join(parts)
+
+
+def render_page(report, debate, asset_url, generated_at, versions_html=""):
+    """
+    페이지 HTML
+
+    Args:
+        report: 최신 리포트 (없으면 None)
+        debate: 최신 토론 기록 (없으면 None)
+        asset_url: plotly.js 경로 (페이지 기준 상대 경로)
+        generated_at: 생성 시각 (datetime)
+        versions_html: 지난 버전 목록 HTML (최신 페이지에만)
+    """
+    sectors = (debate or {}).get("sectors") or (report or {}).get("sectors") or []
+    basis = (debate or report or {}).get("timestamp", "")[:16].replace("T", " ")
+
+    sections = [
+        "<h2>📊 섹터별 기상도</h2>",
+        _chart_html(sectors, asset_url),
+        f'<p class="caption">분석 기준: {html.escape(basis)}</p>',
+    ]
+    if debate:
+        sections += ["<h2>🤖 AI 토론 결과</h2>", _debate_html(debate)]
+    if report:
+        sections += [
+            "<h2>📝 AI 리포트</h2>",
+            f'<p class="caption">{html.escape(report.get("timestamp", "")[:16].replace("T", " "))}</p>',
+            markdown_to_html(report.get("content", "")),
+        ]
+    if versions_html:
+        sections += ["<h2>🗂 지난 버전</h2>", versions_html]
+
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>AI 주식 투자 가이드</title>
+<style>{PAGE_STYLE}</style>
+</head>
+<body>
+<h1>📈 AI 주식 투자 가이드</h1>
+<p class="caption">생성 시각: {generated_at.strftime('%Y-%m-%d %H:%M')}</p>
+{chr(10).join(sections)}
+</body>
+</html>
+"""
+
+
+def _write_text(path, text):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _prune_versions():
+    """보관 개수를 넘는 오래된 버전 삭제. 남은 버전 목록(최신순)을 반환"""
+    versions = sorted((name for name in os.listdir(REPORTS_DIR) if not name.endswith('.tmp')), reverse=True)
+    for name in versions[SITE_RETENTION:]:
+        shutil.rmtree(os.path.join(REPORTS_DIR, name), ignore_errors=True)
+    return versions[:SITE_RETENTION]
+
+
+def export_site():
+    """
+    최신 리포트/토론으로 정적 페이지를 만듭니다. (save_report / save_debate_log 직후 호출)
+
+    Returns:
+        생성한 버전 이름 (실패하거나 내보낼 내용이 없으면 None)
+    """
+    try:
+        with _export_lock:
+            report = get_report_store().latest()
+            debate = get_debate_store().latest()
+            if not report and not debate:
+                return None
+
+            generated_at = datetime.now()
+            asset = _plotly_asset()
+
+            os.makedirs(REPORTS_DIR, exist_ok=True)
+            version = generated_at.strftime('%Y%m%d-%H%M%S')
+            suffix = 1
+            while os.path.exists(os.path.join(REPORTS_DIR, version)):
+                version = f"{generated_at.strftime('%Y%m%d-%H%M%S')}-{suffix}"
+                suffix += 1
+
+            # 버전 디렉토리는 다 쓴 뒤 이름을 바꿔서, 쓰는 도중의 페이지가 제공되지 않도록 함
+            tmp_dir = os.path.join(REPORTS_DIR, f"{version}.tmp")
+            os.makedirs(tmp_dir, exist_ok=True)
+            _write_text(os.path.join(tmp_dir, 'index.html'),
+                        render_page(report, debate, f"../../assets/{asset}", generated_at))
+            os.replace(tmp_dir, os.path.join(REPORTS_DIR, version))
+
+            versions = _prune_versions()
+            versions_html = "<ul>" + "".join(
+                f'<li><a href="reports/{name}/index.html">{name}</a></li>' for name in versions
+            ) + "</ul>"
+            _write_text(os.path.join(SITE_DIR, 'index.html'),
+                        render_page(report, debate, f"assets/{asset}", generated_at, versions_html))
+            _write_text(os.path.join(SITE_DIR, 'versions.json'),
+                        json.dumps({"latest": version, "versions": versions}, indent=4, ensure_ascii=False))
+
+            print(f"Static site exported: data/site/reports/{version}/")
+            return version
+    except Exception as e:
+        print(f"Static site export error: {e}")
+        return None
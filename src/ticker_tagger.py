@@ -0,0 +1,249 @@
+"""
+뉴스 종목 태깅 모듈
+
+로컬 KRX 종목 사전(data/krx_tickers.json)의 종목명/별칭을 Aho-Corasick 오토마톤으로 만들어,
+뉴스 저장 시 제목과 요약을 한 번만 훑어(텍스트 길이에 비례) 언급된 종목 코드를 항목의 tickers에 기록합니다.
+- 겹치는 이름은 가장 왼쪽에서 시작하는 가장 긴 이름을 택합니다. ("SK하이닉스"는 SK가 아닌 SK하이닉스)
+- 영문/숫자로 시작하거나 끝나는 이름은 앞뒤가 영문/숫자이면 무시합니다. ("KTX"의 KT 등)
+- 이름 바로 뒤에 한글이 이어지면 조사/접미어(PARTICLES)일 때만 인정합니다.
+  ("한화가"는 한화, "한화에어로"/"CJ온스타일"처럼 사전에 없는 계열사 이름은 무시)
+- 종목 코드(6자리 숫자)도 찾으며, 이름 바로 뒤 괄호 안의 코드가 다른 종목이면 이름은 버립니다.
+  ("아모레퍼시픽홀딩스(002790)"는 아모레퍼시픽이 아님)
+- 요약의 HTML 태그(링크 주소 등)와 엔티티는 정리한 뒤 훑습니다.
+- 그 밖의 오탐은 사전의 exclude 단어로 막습니다. ("하이브리드"의 하이브 등)
+종목별 뉴스 조회를 위해 종목 코드 -> 기사 키(canonical_link) 역색인을 data/ticker_index.json에 함께 저장합니다.
+"""
+
+import html
+import json
+import os
+import re
+import threading
+from collections import deque
+
+from src.news_crawler import canonical_link
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+TICKER_FILE = os.path.join(DATA_DIR, 'krx_tickers.json')
+INDEX_FILE = os.path.join(DATA_DIR, 'ticker_index.json')
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_SPACE_PATTERN = re.compile(r'\s+')
+_HANGUL_RUN = re.compile(r'[가-힣]+')
+_CODE_SUFFIX = re.compile(r'\s?\((\d{6})\)')
+
+# 종목명 바로 뒤에 붙어도 같은 종목으로 보는 조사/접미어
+PARTICLES = frozenset([
+    "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "도", "로", "으로", "만", "나", "이나",
+    "에서", "에서는", "에서도", "에는", "에도", "에게", "으로는", "로는", "으로서", "로서", "과의", "와의",
+    "과는", "와는", "까지", "부터", "보다", "처럼", "마저", "조차", "뿐", "이다", "였다", "이며", "이고",
+    "측", "측은", "측이", "측의", "측에", "등", "등은", "등이", "등의", "주", "주가", "주는", "주들",
+    "그룹", "그룹은", "그룹이", "그룹의", "그룹에", "그룹과",
+])
+
+
+def _is_word_char(ch):
+    return ch.isascii() and ch.isalnum()
+
+
+def _valid_boundary(text, start, end, pattern):
+    """이름 앞뒤가 다른 단어에 붙어 있지 않은지"""
+    if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if _is_word_char(pattern[-1]) and end < len(text) and _is_word_char(text[end]):
+        return False
+    following = _HANGUL_RUN.match(text, end)
+    return following is None or following.group() in PARTICLES
+
+
+class AhoCorasick:
+    """여러 패턴을 한 번의 텍스트 순회로 찾는 오토마톤"""
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns: {패턴 문자열: 값} (값이 None인 패턴은 찾되 결과에서 제외 - 오탐 방지용)
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # 노드에서 끝나는 (패턴 길이, 패턴, 값) - 실패 링크를 따라 모은 것 포함
+
+        for pattern, value in patterns.items():
+            key = pattern.casefold()
+            if not key:
+                continue
+            node = 0
+            for ch in key:
+                if ch not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][ch] = len(self.goto) - 1
+                node = self.goto[node][ch]
+            self.output[node].append((len(key), pattern, value))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def search(self, text):
+        """
+        텍스트에서 패턴 찾기 (겹치면 가장 왼쪽, 같은 위치면 가장 긴 패턴)
+
+        Returns:
+            [(시작, 끝, 값), ...] (시작 위치순)
+        """
+        folded = text.casefold()
+        if len(folded) != len(text):
+            folded = text.lower()  # 위치가 어긋나지 않도록 (ß 등 길이가 바뀌는 문자)
+
+        matches = []
+        node = 0
+        for index, ch in enumerate(folded):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, pattern, value in self.output[node]:
+                start = index + 1 - length
+                end = index + 1
+                # 제외 단어는 경계와 관계없이 항상 우선
+                if value is not None and not _valid_boundary(text, start, end, pattern):
+                    continue
+                matches.append((start, end, value))
+
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        results = []
+        covered = 0
+        for start, end, value in matches:
+            if start < covered:
+                continue
+            covered = end
+            if value is not None:
+                results.append((start, end, value))
+        return results
+
+
+class TickerTagger:
+    """종목 사전과 오토마톤 (싱글톤, 처음 사용할 때 한 번만 만듦)"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(TickerTagger, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.companies = {}
+        self.names = {}
+        patterns = {}
+        try:
+            with open(TICKER_FILE, 'r', encoding='utf-8') as f:
+                companies = json.load(f).get("companies", [])
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"KRX ticker dictionary not loaded ({e}), news will not be tagged")
+            companies = []
+
+        for company in companies:
+            code = company["code"]
+            self.companies[code] = {"code": code, "name": company["name"], "market": company.get("market", "")}
+            for name in [company["name"]] + company.get("aliases", []):
+                patterns[name] = code
+                self.names[name.casefold()] = code
+            patterns[code] = code
+            for word in company.get("exclude", []):
+                patterns.setdefault(word, None)
+
+        self.automaton = AhoCorasick(patterns)
+
+    def tag_text(self, text):
+        """텍스트에 언급된 종목 코드 (처음 언급된 순서, 중복 제거)"""
+        text = text or ""
+        codes = []
+        for _, end, code in self.automaton.search(text):
+            explicit = _CODE_SUFFIX.match(text, end)
+            if explicit and explicit.group(1) != code:
+                continue  # "이름(다른 코드)": 괄호 안 코드가 가리키는 종목 (사전에 있으면 코드로 태깅됨)
+            if code not in codes:
+                codes.append(code)
+        return codes
+
+    def tag_items(self, news_items):
+        """
+        뉴스 항목의 제목과 요약에서 종목을 찾아 item['tickers']에 기록합니다.
+
+        Returns:
+            종목이 하나 이상 태깅된 항목 수
+        """
+        tagged = 0
+        for item in news_items:
+            summary = html.unescape(_TAG_PATTERN.sub(' ', item.get('summary', '')))
+            text = _SPACE_PATTERN.sub(' ', f"{item.get('title', '')}\n{summary}")
+            item['tickers'] = self.tag_text(text)
+            tagged += bool(item['tickers'])
+        return tagged
+
+    def resolve(self, names):
+        """
+        종목명 리스트(AI 분석 결과의 tickers 등)를 종목 코드로 변환 (사전에 없는 이름은 제외)
+        """
+        codes = []
+        for name in names or []:
+            name = str(name).strip()
+            found = [self.names[name.casefold()]] if name.casefold() in self.names else self.tag_text(name)
+            codes.extend(code for code in found if code not in codes)
+        return codes
+
+    def company(self, code):
+        """{code, name, market} (사전에 없으면 코드만)"""
+        return self.companies.get(code, {"code": code, "name": code, "market": ""})
+
+
+def get_ticker_tagger():
+    return TickerTagger()
+
+
+def build_ticker_index(news_items):
+    """
+    종목 코드 -> 기사 키(canonical_link) 역색인 (뉴스 목록 순서 유지)
+
+    Args:
+        news_items: 저장된 뉴스 목록 (tickers가 태깅된 항목)
+    """
+    index = {}
+    for item in news_items:
+        for code in item.get('tickers', []):
+            index.setdefault(code, []).append(canonical_link(item['link']))
+    return index
+
+
+def save_ticker_index(index):
+    tmp_path = f"{INDEX_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, INDEX_FILE)
+
+
+def load_ticker_index():
+    """{종목 코드: [기사 키, ...]} (파일이 없으면 빈 딕셔너리)"""
+    try:
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
@@ -0,0 +1,176 @@
+"""
+대시보드 화면 데이터 모듈
+
+메인 대시보드가 매번 다시 계산하던 값(금일 뉴스, 섹터 차트 데이터/그림, 관련 뉴스, 종목별 뉴스)을
+데이터 버전마다 한 번만 만들어 모든 세션이 공유합니다.
+- 데이터 버전: 뉴스 파일, 종목 역색인 파일, 토론 목록 파일의 수정 시각/크기, 오늘 날짜, 무효화 세대
+  (파일 상태만 확인하므로 데이터가 바뀌지 않은 재실행은 거의 비용이 없음)
+- 섹터 추세(sector_trend)는 섹터 시계열 집계 파일 상태와 기간/섹터 선택을 키로 따로 캐시합니다.
+- 스케줄러/토론 작업이 데이터를 저장하면 invalidate_view_model()로 바로 무효화합니다.
+  다른 프로세스(리더)가 저장한 경우에도 파일 상태가 바뀌므로 다음 재실행에서 다시 만듭니다.
+반환하는 화면 데이터는 세션 간에 공유되는 객체이므로 읽기 전용으로 사용해야 합니다.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+import streamlit as st
+
+from src.charts import build_sector_figure, build_sector_trend_figure, sector_dataframe
+from src.data_manager import NEWS_FILE, DataManager, filter_today_news
+from src.news_crawler import canonical_link
+from src.entry_store import get_debate_store
+from src.sector_history import DAILY_FILE, get_sector_history
+from src.ticker_tagger import INDEX_FILE, get_ticker_tagger, load_ticker_index
+
+
+# 관련 뉴스 최대 표시 개수
+RELATED_NEWS_LIMIT = 20
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _file_state(path):
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+
+def data_version():
+    """현재 데이터 버전 (값이 같으면 화면 데이터도 같음)"""
+    return (
+        _generation,
+        datetime.now().date().isoformat(),
+        _file_state(NEWS_FILE),
+        _file_state(INDEX_FILE),
+        _file_state(get_debate_store().index_file),
+    )
+
+
+def invalidate_view_model():
+    """저장 직후 호출: 캐시된 화면 데이터를 버리고 다음 요청에서 다시 만듭니다."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+    _build_view_model.clear()
+    _build_sector_trend.clear()
+
+
+def _related_news(news_items, chart_data):
+    """관련주가 태깅되었거나, 섹터 이름(또는 사전에 없는 관련주 이름)이 제목이나 요약에 들어간 뉴스"""
+    tagger = get_ticker_tagger()
+    codes = set()
+    keywords = set()
+    for item in chart_data:
+        keywords.add(item['sector'])
+        for name in item.get('tickers', []):
+            found = tagger.resolve([name])
+            if found:
+                codes.update(found)
+            else:
+                keywords.add(name)
+    keywords = [k.lower() for k in keywords if k]
+
+    related_news = []
+    for n in news_items:
+        if codes.intersection(n.get('tickers', [])):
+            related_news.append(n)
+            if len(related_news) >= RELATED_NEWS_LIMIT:
+                break
+            continue
+        text = (n['title'] + " " + n.get('summary', '')).lower()
+        if any(k in text for k in keywords):
+            related_news.append(n)
+            if len(related_news) >= RELATED_NEWS_LIMIT:
+                break
+    return related_news
+
+
+def _ticker_news(news_items):
+    """
+    종목별 뉴스 (저장 시 만든 역색인 사용, 기사 수 많은 순)
+
+    Returns:
+        [{code, name, market, news: [뉴스 항목, ...]}, ...]
+    """
+    by_key = {canonical_link(item['link']): item for item in news_items}
+    tagger = get_ticker_tagger()
+    ticker_news = []
+    for code, keys in load_ticker_index().items():
+        items = [by_key[key] for key in keys if key in by_key]
+        if items:
+            ticker_news.append(dict(tagger.company(code), news=items))
+    ticker_news.sort(key=lambda entry: len(entry['news']), reverse=True)
+    return ticker_news
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _build_view_model(version):
+    """데이터 버전 하나에 대한 화면 데이터 (version은 캐시 키로만 사용)"""
+    today = datetime.fromisoformat(version[1]).date()
+    news_items = DataManager().load_news()
+    # 종목 태깅 도입 전에 저장되어 아직 태깅되지 않은 뉴스 (다음 수집 때 저장됨)
+    get_ticker_tagger().tag_items([item for item in news_items if 'tickers' not in item])
+
+    try:
+        latest_debate = get_debate_store().latest()
+    except Exception as e:
+        print(f"Error loading debate: {e}")
+        latest_debate = None
+
+    chart_data = latest_debate.get('sectors', []) if latest_debate else []
+    chart_df = sector_dataframe(chart_data) if chart_data else None
+
+    return {
+        "version": version,
+        "built_at": datetime.now().isoformat(),
+        "today_news": filter_today_news(news_items, today),
+        "latest_debate": latest_debate,
+        "chart_data": chart_data,
+        "chart_df": chart_df,
+        "figure": build_sector_figure(chart_df) if chart_df is not None else None,
+        "related_news": _related_news(news_items, chart_data) if chart_data else [],
+        "ticker_news": _ticker_news(news_items),
+    }
+
+
+def get_view_model():
+    """
+    메인 대시보드 화면 데이터
+
+    Returns:
+        {version, built_at, today_news, latest_debate, chart_data, chart_df, figure, related_news, ticker_news}
+    """
+    return _build_view_model(data_version())
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _build_sector_trend(version, days, sectors):
+    """섹터 추세 화면 데이터 (version은 캐시 키로만 사용)"""
+    history = get_sector_history()
+    trend_df = history.trend_frame(days, set(sectors) if sectors else None)
+    trend_df = trend_df.dropna(subset=["mean_short"])
+    return {
+        "summary": history.summary(),
+        "trend_df": trend_df,
+        "figure": build_sector_trend_figure(trend_df) if not trend_df.empty else None,
+    }
+
+
+def get_sector_trend(days=30, sectors=None):
+    """
+    섹터 추세 화면 데이터
+
+    Args:
+        days: 표시 기간 (일)
+        sectors: 표시할 섹터 (None이면 전체)
+
+    Returns:
+        {summary, trend_df, figure}
+    """
+    version = (_generation, datetime.now().date().isoformat(), _file_state(DAILY_FILE))
+    return _build_sector_trend(version, days, tuple(sorted(sectors)) if sectors else None)